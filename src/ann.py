@@ -0,0 +1,218 @@
+"""
+Approximate Nearest Neighbours Module
+
+Προσεγγιστικό ευρετήριο γειτόνων με δάσος τυχαίων προβολών (random
+projection forest), για πολύ μεγάλα ιστορικά σύνολα όπου η ακριβής αναζήτηση
+του KNeighborsClassifier γίνεται το σημείο συμφόρησης της πρόβλεψης.
+
+Κάθε δέντρο χωρίζει αναδρομικά τα σημεία στη διάμεσο της προβολής τους σε
+ένα τυχαίο υπερεπίπεδο, μέχρι τα φύλλα να έχουν το πολύ leaf_size σημεία.
+Ένα ερώτημα κατεβαίνει σε ένα φύλλο ανά δέντρο και οι γείτονες αναζητούνται
+ακριβώς μόνο ανάμεσα στα σημεία αυτών των φύλλων.
+
+Παράμετροι:
+    - Κατασκευής: n_trees (περισσότερα δέντρα = καλύτερο recall, περισσότερη
+      μνήμη), leaf_size (μεγαλύτερα φύλλα = καλύτερο recall, αργότερα ερωτήματα).
+    - Αναζήτησης: search_trees (πόσα από τα δέντρα χρησιμοποιούνται ανά ερώτημα).
+
+Usage:
+    from ann import ApproximateKNeighborsClassifier
+    clf = ApproximateKNeighborsClassifier(n_neighbors=5, n_trees=10).fit(X, y)
+    print(clf.recall_)
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.neighbors import NearestNeighbors
+
+QUERY_BATCH_SIZE = 512  # Πλήθος ερωτημάτων για τα οποία υπολογίζονται μαζί οι αποστάσεις των υποψηφίων
+RECALL_SAMPLE = 200  # Πλήθος σημείων στα οποία μετράται το recall μετά από κάθε fit
+
+
+class RandomProjectionTree:
+    """
+    Ένα δέντρο τυχαίων προβολών, αποθηκευμένο σε πίνακες NumPy.
+
+    Attributes:
+        normals (np.ndarray): Το κάθετο διάνυσμα του υπερεπιπέδου κάθε εσωτερικού κόμβου.
+        thresholds (np.ndarray): Το κατώφλι της προβολής κάθε εσωτερικού κόμβου.
+        children (np.ndarray): (εσωτερικοί κόμβοι x 2) παιδιά· οι αρνητικές τιμές -(φύλλο + 1) δείχνουν φύλλα.
+        leaves (np.ndarray): (φύλλα x leaf_size) οι δείκτες των σημείων κάθε φύλλου, με -1 ως συμπλήρωμα.
+    """
+
+    def __init__(self, X, leaf_size, rng):
+        normals, thresholds, children, leaves = [], [], [], []
+        order = np.arange(X.shape[0])
+
+        def add_leaf(start, end):
+            leaves.append(order[start:end])
+            return -len(leaves)
+
+        # Κάθε στοιχείο της στοίβας: (εύρος στο order, γονικός κόμβος, πλευρά του γονέα)
+        stack = [(0, X.shape[0], -1, 0)]
+        while stack:
+            start, end, parent, side = stack.pop()
+            if end - start <= leaf_size:
+                node = add_leaf(start, end)
+            else:
+                points = order[start:end]
+                a, b = rng.choice(points, size=2, replace=False)
+                normal = X[a] - X[b]
+                if not normal.any():  # Διπλότυπα σημεία: τυχαία κατεύθυνση
+                    normal = rng.standard_normal(X.shape[1])
+                projection = X[points] @ normal
+                mid = (end - start) // 2
+                partition = np.argpartition(projection, mid)
+                order[start:end] = points[partition]
+                threshold = projection[partition[mid]]
+
+                node = len(normals)
+                normals.append(normal)
+                thresholds.append(threshold)
+                children.append([0, 0])
+                stack.append((start, start + mid, node, 0))
+                stack.append((start + mid, end, node, 1))
+            if parent >= 0:
+                children[parent][side] = node
+
+        self.normals = np.array(normals, dtype=np.float64).reshape(-1, X.shape[1])
+        self.thresholds = np.array(thresholds, dtype=np.float64)
+        self.children = np.array(children, dtype=np.int64).reshape(-1, 2)
+        self.leaves = np.full((len(leaves), leaf_size), -1, dtype=np.int64)
+        for i, leaf in enumerate(leaves):
+            self.leaves[i, :len(leaf)] = leaf
+        self._root_is_leaf = len(normals) == 0
+
+    def leaf_members(self, X_query):
+        """
+        Οι δείκτες των σημείων του φύλλου στο οποίο καταλήγει κάθε ερώτημα.
+
+        Returns:
+            np.ndarray: (ερωτήματα x leaf_size), με -1 ως συμπλήρωμα.
+        """
+        if self._root_is_leaf:
+            return np.broadcast_to(self.leaves[0], (X_query.shape[0], self.leaves.shape[1]))
+        node = np.zeros(X_query.shape[0], dtype=np.int64)
+        active = np.ones(X_query.shape[0], dtype=bool)
+        while active.any():
+            rows = np.flatnonzero(active)
+            current = node[rows]
+            projection = np.einsum("ij,ij->i", X_query[rows], self.normals[current])
+            node[rows] = self.children[current, (projection >= self.thresholds[current]).astype(np.int64)]
+            active[rows] = node[rows] >= 0
+        return self.leaves[-node - 1]
+
+
+class ApproximateKNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Classifier K-NN με προσεγγιστικό ευρετήριο γειτόνων (random projection forest).
+
+    Μπορεί να χρησιμοποιηθεί στη θέση του KNeighborsClassifier μέσα σε Pipeline. Μετά από κάθε fit, το recall_
+    δίνει το ποσοστό των ακριβών k γειτόνων ενός δείγματος σημείων που βρίσκει το ευρετήριο.
+
+    Attributes:
+        classes_ (np.ndarray): Οι κλάσεις της ανταπόκρισης.
+        recall_ (float): Το recall των γειτόνων σε σχέση με την ακριβή αναζήτηση.
+    """
+
+    def __init__(self, n_neighbors=5, n_trees=10, leaf_size=30, search_trees=None, random_state=None):
+        """
+        Parameters:
+            n_neighbors (int): Ο αριθμός των γειτόνων.
+            n_trees (int): Ο αριθμός των δέντρων του δάσους (παράμετρος κατασκευής).
+            leaf_size (int): Το μέγιστο πλήθος σημείων ανά φύλλο (παράμετρος κατασκευής).
+            search_trees (int, optional): Πόσα δέντρα χρησιμοποιούνται ανά ερώτημα (παράμετρος αναζήτησης). Αν δεν δοθεί, όλα.
+            random_state (int, optional): Το seed για αναπαραγωγιμότητα.
+        """
+        self.n_neighbors = n_neighbors
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.search_trees = search_trees
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        self._fit_X = X
+        self.n_samples_fit_ = X.shape[0]
+
+        # Τα φύλλα πρέπει να χωράνε αρκετούς υποψήφιους γείτονες (και για το μέτρημα του recall με k + 1)
+        leaf_size = max(self.leaf_size, 2 * (self.n_neighbors + 1))
+        rng = np.random.default_rng(self.random_state)
+        self.trees_ = [RandomProjectionTree(X, leaf_size, rng) for _ in range(self.n_trees)]
+        self.recall_ = self._measure_recall(rng)
+        return self
+
+    def _measure_recall(self, rng):
+        """
+        Μετρά το recall των γειτόνων σε δείγμα σημείων αναφοράς, εξαιρώντας το ίδιο το σημείο από τους γείτονες.
+        """
+        k = min(self.n_neighbors, self.n_samples_fit_ - 1)
+        if k < 1:
+            return 1.0
+        sample = rng.choice(self.n_samples_fit_, size=min(RECALL_SAMPLE, self.n_samples_fit_), replace=False)
+        exact = NearestNeighbors(n_neighbors=k + 1).fit(self._fit_X)
+        exact_indices = exact.kneighbors(self._fit_X[sample], return_distance=False)
+        approx_indices = self.kneighbors(self._fit_X[sample], n_neighbors=k + 1, return_distance=False)
+
+        found = 0
+        for i, point in enumerate(sample):
+            exact_set = [j for j in exact_indices[i] if j != point][:k]
+            approx_set = {j for j in approx_indices[i] if j != point}
+            found += len(approx_set.intersection(exact_set))
+        return found / (k * len(sample))
+
+    def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+        """
+        Οι (προσεγγιστικά) k πλησιέστεροι γείτονες κάθε ερωτήματος, ταξινομημένοι κατά απόσταση.
+        """
+        k = min(n_neighbors or self.n_neighbors, self.n_samples_fit_)
+        X_query = self._fit_X if X is None else np.ascontiguousarray(X, dtype=np.float64)
+        trees = self.trees_[:self.search_trees] if self.search_trees else self.trees_
+
+        distances = np.empty((X_query.shape[0], k))
+        indices = np.empty((X_query.shape[0], k), dtype=np.int64)
+        for start in range(0, X_query.shape[0], QUERY_BATCH_SIZE):
+            batch = X_query[start:start + QUERY_BATCH_SIZE]
+            candidates = np.hstack([tree.leaf_members(batch) for tree in trees])
+
+            # Αφαίρεση διπλότυπων υποψηφίων (το ίδιο σημείο σε φύλλα πολλών δέντρων)
+            candidates = np.sort(candidates, axis=1)
+            candidates[:, 1:][candidates[:, 1:] == candidates[:, :-1]] = -1
+
+            valid = candidates >= 0
+            diff = self._fit_X[np.where(valid, candidates, 0)] - batch[:, None, :]
+            candidate_distances = np.where(valid, np.sqrt(np.einsum("ijk,ijk->ij", diff, diff)), np.inf)
+
+            # Τα φύλλα έχουν τουλάχιστον 2k θέσεις, οπότε υπάρχουν πάντα k στήλες υποψηφίων
+            top = np.argpartition(candidate_distances, k - 1, axis=1)[:, :k]
+            top_distances = np.take_along_axis(candidate_distances, top, axis=1)
+            order = np.argsort(top_distances, axis=1, kind="stable")
+            batch_distances = np.take_along_axis(top_distances, order, axis=1)
+            batch_indices = np.take_along_axis(np.take_along_axis(candidates, top, axis=1), order, axis=1)
+
+            # Ερωτήματα με λιγότερους από k διαφορετικούς υποψήφιους απαντώνται με ακριβή αναζήτηση
+            short = np.flatnonzero(~np.isfinite(batch_distances[:, -1]))
+            if len(short):
+                exact = NearestNeighbors(n_neighbors=k).fit(self._fit_X)
+                batch_distances[short], batch_indices[short] = exact.kneighbors(batch[short])
+
+            distances[start:start + len(batch)] = batch_distances
+            indices[start:start + len(batch)] = batch_indices
+
+        return (distances, indices) if return_distance else indices
+
+    def predict_proba(self, X):
+        """
+        Το ποσοστό των k γειτόνων κάθε ερωτήματος που ανήκει σε κάθε κλάση.
+        """
+        neighbor_codes = self._y[self.kneighbors(X, return_distance=False)]
+        proba = np.zeros((neighbor_codes.shape[0], len(self.classes_)))
+        for code in range(len(self.classes_)):
+            proba[:, code] = (neighbor_codes == code).mean(axis=1)
+        return proba
+
+    def predict(self, X):
+        """
+        Η κλάση πλειοψηφίας των k γειτόνων (σε ισοψηφία η πρώτη κλάση, όπως στο KNeighborsClassifier).
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,158 @@
+"""
+Command Line Interface
+
+Εκπαίδευση του μοντέλου K-NN και πρόβλεψη/κατάταξη νέων πελατών χωρίς
+γραφικό περιβάλλον.
+
+Usage:
+    python cli.py --past ../data/Project40PastCampaignData.xlsx \
+                  --new ../data/Project40NewCampaignData.xlsx \
+                  --output predictions.xlsx
+    python cli.py --past ... --new ... --k 7 --top-n 100 --output targets.csv
+    python cli.py --past ... --new ... --k 7 --shards 4 --output predictions.csv
+    python cli.py --past ... --new ... --time-budget 60 --output predictions.csv
+    python cli.py --past ... --new ... --select-features forward --output predictions.csv
+    python cli.py --past ... --new ... --n-jobs 4 --threads 2 --working-memory 256 --output predictions.csv
+    python cli.py --past ... --new ... --benchmark-resources --output predictions.csv
+    python cli.py --past ... --new ... --k 7 --prediction-cache ../cache/predictions.sqlite --output predictions.csv
+    python cli.py --past ... --new ... --search-workers 4 --output predictions.csv
+    python cli.py --past ... --new ... --search-address 0.0.0.0:6100 --authkey secret --output predictions.csv
+"""
+import argparse
+import sys
+
+from data_loader import load_campaign_file
+from exporter import export_predictions
+from cost_model import budgeted_search
+from distributed import DistributedSearch
+from model import INDEX_TYPES, KNN, SELECTION_DIRECTIONS
+from prediction_cache import PredictionCache
+from resources import ResourceConfig, benchmark_resources, candidate_configs
+from sharded import ShardedPredictor
+
+
+def build_parser():
+    """
+    Δημιουργεί τον parser των ορισμάτων της γραμμής εντολών.
+    """
+    parser = argparse.ArgumentParser(description="Πρόβλεψη ανταπόκρισης νέας καμπάνιας με K-NN.")
+    parser.add_argument("--past", required=True, help="Αρχείο Excel με τα δεδομένα προηγούμενης καμπάνιας.")
+    parser.add_argument("--new", required=True, help="Αρχείο Excel με τα δεδομένα νέας καμπάνιας.")
+    parser.add_argument("--output", required=True, help="Αρχείο εξόδου (.xlsx, .csv ή .parquet).")
+    parser.add_argument("--k", type=int, default=None, help="Αριθμός γειτόνων. Αν δεν δοθεί, βρίσκεται αυτόματα.")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Ποσοστό δεδομένων επικύρωσης.")
+    parser.add_argument("--random-state", type=int, default=42, help="Seed για αναπαραγωγιμότητα.")
+    parser.add_argument("--select-features", choices=SELECTION_DIRECTIONS, default=None,
+                        help="Άπληστη επιλογή των χαρακτηριστικών της απόστασης πριν την εκπαίδευση.")
+    parser.add_argument("--time-budget", type=float, default=None, help="Χρονικό όριο (s) της αυτόματης αναζήτησης του k.")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Διεργασίες της αναζήτησης του k (-1 για όλους τους πυρήνες).")
+    parser.add_argument("--threads", type=int, default=None, help="Νήματα BLAS/OpenMP ανά διεργασία (προεπιλογή: οι πυρήνες μοιρασμένοι στις διεργασίες).")
+    parser.add_argument("--working-memory", type=int, default=None, help="Όριο μνήμης (MiB) των τμηματικών υπολογισμών αποστάσεων.")
+    parser.add_argument("--benchmark-resources", action="store_true",
+                        help="Μέτρηση των συνδυασμών διεργασιών/νημάτων και εκπαίδευση με τον γρηγορότερο.")
+    parser.add_argument("--search-workers", type=int, default=None,
+                        help="Κατανεμημένη αναζήτηση του k με N τοπικούς workers.")
+    parser.add_argument("--search-address", default=None,
+                        help="Διεύθυνση host:port στην οποία ο συντονιστής δέχεται απομακρυσμένους workers (distributed.py).")
+    parser.add_argument("--prediction-cache", default=None,
+                        help="Αρχείο SQLite με cache προβλέψεων ανά πελάτη (υπολογίζονται μόνο οι νέοι πελάτες).")
+
+    parser.add_argument("--index", choices=INDEX_TYPES, default="exact", help="Ευρετήριο γειτόνων του τελικού μοντέλου.")
+    parser.add_argument("--n-trees", type=int, default=10, help="Αριθμός δέντρων του προσεγγιστικού ευρετηρίου.")
+    parser.add_argument("--leaf-size", type=int, default=30, help="Μέγιστο πλήθος σημείων ανά φύλλο του προσεγγιστικού ευρετηρίου.")
+    parser.add_argument("--search-trees", type=int, default=None, help="Πόσα δέντρα χρησιμοποιούνται ανά ερώτημα.")
+    parser.add_argument("--shards", type=int, default=None, help="Πρόβλεψη με το σύνολο αναφοράς μοιρασμένο σε N τοπικές διεργασίες.")
+    parser.add_argument("--shard-hosts", default=None, help="Απομακρυσμένα shards (host:port,host:port,...) που εκτελούν το sharded.py.")
+    parser.add_argument("--authkey", default="", help="Κλειδί πιστοποίησης των απομακρυσμένων shards και workers.")
+
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--top-n", type=int, default=None, help="Εξαγωγή μόνο των N πελατών με το μεγαλύτερο σκορ.")
+    target.add_argument("--top-percent", type=float, default=None, help="Εξαγωγή μόνο του P%% των πελατών με το μεγαλύτερο σκορ.")
+    return parser
+
+
+def train(args):
+    """
+    Φορτώνει τα ιστορικά δεδομένα και εκπαιδεύει το μοντέλο, όπως η εκπαίδευση του γραφικού περιβάλλοντος.
+    """
+    past_data = load_campaign_file(args.past)
+    resources = ResourceConfig(n_jobs=args.n_jobs, threads=args.threads, working_memory=args.working_memory)
+    if args.benchmark_resources:
+        table = benchmark_resources(past_data, configs=candidate_configs(working_memory=args.working_memory),
+                                    test_size=args.test_size, random_state=args.random_state)
+        print(table.to_string(index=False, float_format=lambda seconds: f"{seconds:.3f}"))
+        resources = ResourceConfig.from_row(table.iloc[0])
+        print(f"Γρηγορότερη ρύθμιση: {resources.n_jobs} διεργασίες x {resources.threads} νήματα")
+    index_params = {"n_trees": args.n_trees, "leaf_size": args.leaf_size, "search_trees": args.search_trees}
+    knn_model = KNN(neighbors=args.k, test_size=args.test_size, random_state=args.random_state,
+                    index=args.index, index_params=index_params if args.index != "exact" else None,
+                    resources=resources,
+                    prediction_cache=PredictionCache(args.prediction_cache) if args.prediction_cache else None)
+    knn_model.feed_data(past_data)
+    if args.select_features:
+        features = knn_model.select_features(args.select_features)
+        print(f"Χαρακτηριστικά ({len(features)}/{knn_model.X.shape[1]}): {', '.join(features)}")
+    if args.k is None and args.time_budget is not None:
+        report = budgeted_search(knn_model, args.time_budget)
+        print(
+            f"Πλάνο αναζήτησης: folds {list(report['fold_range'])}, k {list(report['k_range'])}, "
+            f"δείγμα {report['sample_fraction']:.0%}"
+        )
+        print(f"Χρόνος αναζήτησης: εκτίμηση {report['predicted_seconds']:.1f} s, πραγματικός {report['actual_seconds']:.1f} s")
+    elif args.k is None and (args.search_workers is not None or args.search_address):
+        address = ("127.0.0.1", 0)
+        if args.search_address:
+            host, port = args.search_address.rsplit(":", 1)
+            address = (host, int(port))
+        with DistributedSearch(n_workers=args.search_workers or 0, address=address,
+                               authkey=args.authkey.encode()) as search:
+            knn_model.find_best_neighbors(k_range=range(2, 16), fold_range=range(2, 8), executor=search)
+        if search.lost_workers:
+            print(f"Χάθηκαν {search.lost_workers} workers· {search.requeued_jobs} εργασίες εκτελέστηκαν ξανά.")
+    elif args.k is None:
+        knn_model.find_best_neighbors(k_range=range(2, 16), fold_range=range(2, 8))
+    knn_model.fit()
+    print(f"Αριθμός γειτόνων (k): {knn_model.best_n_neighbors}")
+    if knn_model.index_recall is not None:
+        print(f"Recall προσεγγιστικού ευρετηρίου: {knn_model.index_recall:.4f}")
+    return knn_model
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.time_budget is not None and (args.search_workers is not None or args.search_address):
+        parser.error("το --time-budget δεν συνδυάζεται με την κατανεμημένη αναζήτηση (--search-workers/--search-address)")
+    if args.search_address and not args.authkey:
+        parser.error("το --search-address απαιτεί --authkey, το ίδιο με αυτό των απομακρυσμένων workers")
+    try:
+        knn_model = train(args)
+        new_data = load_campaign_file(args.new)
+        if args.top_n is not None or args.top_percent is not None:
+            ranked_df = knn_model.rank_customers(
+                new_data, top_n=args.top_n, top_percent=args.top_percent, output_path=args.output
+            )
+            print(f"Η λίστα στόχευσης ({len(ranked_df)} πελάτες) αποθηκεύτηκε στο {args.output}")
+        elif args.shards or args.shard_hosts:
+            addresses = None
+            if args.shard_hosts:
+                addresses = [(host, int(port)) for host, port in
+                             (address.rsplit(":", 1) for address in args.shard_hosts.split(","))]
+            with ShardedPredictor(knn_model, n_shards=args.shards, addresses=addresses,
+                                  authkey=args.authkey.encode()) as predictor:
+                result_df = predictor.predict(new_data)
+            export_predictions(result_df, args.output, index=False)
+            print(f"Οι προβλέψεις αποθηκεύτηκαν στο {args.output}")
+        else:
+            knn_model.predict(new_data, output_path=args.output)
+            if knn_model.cache_stats:
+                print(f"Cache προβλέψεων: {knn_model.cache_stats['hits']} επιτυχίες, {knn_model.cache_stats['misses']} αποτυχίες")
+            print(f"Οι προβλέψεις αποθηκεύτηκαν στο {args.output}")
+    except ValueError as ve:
+        print(f"Σφάλμα: {ve}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
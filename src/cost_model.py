@@ -0,0 +1,254 @@
+"""
+Cost Model Module
+
+Αυτόματη εκπαίδευση μέσα σε χρονικό όριο:
+    - Πριν από την αναζήτηση, λίγες δοκιμαστικές εκπαιδεύσεις σε δείγματα
+      δύο μεγεθών των πραγματικών δεδομένων δίνουν το κόστος μιας
+      αξιολόγησης (εκπαίδευση και πρόβλεψη ενός split) ως σταθερό κόστος
+      συν κόστος ανά γραμμή.
+    - Με αυτό εκτιμάται ο χρόνος κάθε υποψήφιου πλάνου (αριθμοί folds,
+      τιμές του K, ποσοστό δείγματος) και επιλέγεται το πληρέστερο πλάνο
+      που χωράει στο όριο.
+    - Μετά την αναζήτηση, ο πραγματικός χρόνος συγκρίνεται με τον εκτιμώμενο
+      και ένας διορθωτικός συντελεστής (π.χ. για το κόστος του
+      παραλληλισμού) αποθηκεύεται στο COST_MODEL_FILE, ώστε η εκτίμηση να
+      βελτιώνεται από εκτέλεση σε εκτέλεση.
+
+Usage:
+    from cost_model import budgeted_search
+    knn_model.feed_data(past_data)
+    report = budgeted_search(knn_model, budget=60)
+    print(report["predicted_seconds"], report["actual_seconds"])
+"""
+import json
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+from joblib import effective_n_jobs
+from sklearn.base import clone
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+
+COST_MODEL_FILE = "../cache/cost_model.json"  # Ο διορθωτικός συντελεστής και το ιστορικό εκτελέσεων
+PROBE_SIZES = (250, 1000)  # Τα μεγέθη δείγματος των δοκιμαστικών εκπαιδεύσεων
+PROBE_REPEATS = 3  # Επαναλήψεις κάθε δοκιμής (κρατείται ο μικρότερος χρόνος)
+PROBE_NEIGHBORS = 15  # Ο αριθμός γειτόνων των δοκιμών (ο μέγιστος των υποψήφιων πλάνων)
+LEARNING_RATE = 0.5  # Το βάρος της τελευταίας εκτέλεσης στον διορθωτικό συντελεστή
+HISTORY_SIZE = 20  # Πόσες εκτελέσεις κρατούνται στο ιστορικό
+MIN_SEARCH_ROWS = 200  # Το ελάχιστο μέγεθος δείγματος του cross-validation
+
+# Τα υποψήφια πλάνα, από το πληρέστερο στο φθηνότερο: πρώτα λιγότερα folds, μετά αραιότερο K, μετά μικρότερο δείγμα
+FOLD_OPTIONS = (range(2, 8), (3, 5, 7), (5,), (3,))
+K_OPTIONS = (range(2, 16), range(3, 16, 2), range(3, 10, 2))
+SAMPLE_FRACTIONS = (1.0, 0.5, 0.25, 0.1)
+
+
+class CostModel:
+    """
+    Εκτίμηση του χρόνου της find_best_neighbors() (grid search) για δεδομένο πλάνο.
+
+    Attributes:
+        overhead (float): Το σταθερό κόστος (s) μιας αξιολόγησης, από τις δοκιμές.
+        per_row (float): Το κόστος (s) ανά γραμμή μιας αξιολόγησης, από τις δοκιμές.
+        correction (float): Ο διορθωτικός συντελεστής (πραγματικός / εκτιμώμενος χρόνος) από προηγούμενες εκτελέσεις.
+        history (list): Οι τελευταίες εκτελέσεις (πλάνο, εκτιμώμενος και πραγματικός χρόνος).
+    """
+
+    def __init__(self, correction=1.0, history=None):
+        self.overhead = None
+        self.per_row = None
+        self.correction = correction
+        self.history = history or []
+
+    @classmethod
+    def load(cls, path=COST_MODEL_FILE):
+        """
+        Φορτώνει τον διορθωτικό συντελεστή και το ιστορικό. Χωρίς (έγκυρο) αρχείο επιστρέφει νέο μοντέλο κόστους.
+        """
+        try:
+            state = json.loads(Path(path).read_text(encoding="utf-8"))
+            return cls(correction=float(state["correction"]), history=list(state.get("history", [])))
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls()
+
+    def save(self, path=COST_MODEL_FILE):
+        """
+        Αποθηκεύει τον διορθωτικό συντελεστή και το ιστορικό.
+        """
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(
+                json.dumps({"correction": self.correction, "history": self.history}, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+        except OSError:
+            pass  # Χωρίς δικαίωμα εγγραφής η διόρθωση απλώς δεν διατηρείται για την επόμενη εκτέλεση
+
+    def calibrate(self, X, y, preprocessor, random_state=None):
+        """
+        Μετρά το κόστος μιας αξιολόγησης με δοκιμαστικές εκπαιδεύσεις στα πραγματικά δεδομένα.
+
+        Σε κάθε δοκιμή ένα τυχαίο δείγμα χωρίζεται 80/20, ο preprocessor και ο KNeighborsClassifier εκπαιδεύονται
+        στο 80% και γίνεται πρόβλεψη και στα δύο τμήματα, όπως σε ένα split του grid search (που υπολογίζει και τα
+        σκορ εκπαίδευσης). Από τους χρόνους των δύο μεγεθών προκύπτουν το σταθερό κόστος και το κόστος ανά γραμμή.
+
+        Parameters:
+            X (pd.DataFrame): Τα χαρακτηριστικά των δεδομένων εκπαίδευσης.
+            y (pd.Series): Η ανταπόκριση των δεδομένων εκπαίδευσης.
+            preprocessor (ColumnTransformer): Ο (μη εκπαιδευμένος) preprocessor του μοντέλου.
+            random_state (int, optional): Το seed της δειγματοληψίας.
+        """
+        rng = np.random.default_rng(random_state)
+        sizes = sorted({min(size, len(X)) for size in PROBE_SIZES})
+        timings = []
+        for size in sizes:
+            rows = rng.choice(len(X), size=size, replace=False)
+            train_rows, test_rows = rows[:int(size * 0.8)], rows[int(size * 0.8):]
+            best = math.inf
+            for _ in range(PROBE_REPEATS):
+                start = time.perf_counter()
+                pipeline = Pipeline(
+                    [
+                        ("preprocessor", clone(preprocessor)),
+                        ("classifier", KNeighborsClassifier(n_neighbors=min(PROBE_NEIGHBORS, len(train_rows)))),
+                    ]
+                )
+                pipeline.fit(X.iloc[train_rows], y.iloc[train_rows])
+                pipeline.predict(X.iloc[test_rows])
+                pipeline.predict(X.iloc[train_rows])
+                best = min(best, time.perf_counter() - start)
+            timings.append(best)
+
+        if len(sizes) > 1:
+            per_row, overhead = np.polyfit(sizes, timings, 1)
+        else:
+            per_row, overhead = timings[0] / sizes[0], 0.0
+        self.per_row = max(float(per_row), 0.0)
+        self.overhead = max(float(overhead), 0.0)
+
+    def estimate(self, n_rows, n_valid, fold_range, k_range, n_workers=1):
+        """
+        Ο εκτιμώμενος χρόνος (s) της αναζήτησης για ένα πλάνο.
+
+        Κάθε (αριθμός folds c, αριθμός γειτόνων) δίνει c αξιολογήσεις στις n_rows γραμμές του δείγματος, που
+        εκτελούνται σε κύματα των n_workers. Προστίθεται μία αξιολόγηση στα δεδομένα επικύρωσης.
+
+        Parameters:
+            n_rows (int): Οι γραμμές του cross-validation.
+            n_valid (int): Οι γραμμές εκπαίδευσης και επικύρωσης των μετρικών επικύρωσης.
+            fold_range (iterable): Οι αριθμοί folds.
+            k_range (iterable): Οι αριθμοί γειτόνων.
+            n_workers (int): Οι παράλληλες εργασίες του grid search.
+
+        Returns:
+            float: Ο εκτιμώμενος χρόνος σε δευτερόλεπτα.
+
+        Raises:
+            ValueError: Αν δεν έχει προηγηθεί η calibrate().
+        """
+        if self.per_row is None:
+            raise ValueError("Το μοντέλο κόστους δεν έχει βαθμονομηθεί. Καλέστε πρώτα τη μέθοδο calibrate().")
+        evaluation = self.overhead + self.per_row * n_rows
+        waves = sum(math.ceil(c * len(k_range) / n_workers) for c in fold_range)
+        return (waves * evaluation + self.overhead + self.per_row * n_valid) * self.correction
+
+    def plan(self, budget, n_rows, n_valid, n_workers=1):
+        """
+        Επιλέγει το πληρέστερο πλάνο αναζήτησης με εκτιμώμενο χρόνο εντός του ορίου.
+
+        Parameters:
+            budget (float): Ο διαθέσιμος χρόνος σε δευτερόλεπτα.
+            n_rows (int): Οι γραμμές των δεδομένων εκπαίδευσης.
+            n_valid (int): Οι γραμμές εκπαίδευσης και επικύρωσης των μετρικών επικύρωσης.
+            n_workers (int): Οι παράλληλες εργασίες του grid search.
+
+        Returns:
+            dict: Τα fold_range, k_range, sample_fraction, predicted_seconds και within_budget (False αν ούτε το
+            φθηνότερο πλάνο χωράει στο όριο, οπότε επιλέγεται αυτό).
+        """
+        candidates = []
+        for fraction in SAMPLE_FRACTIONS:
+            sample_rows = int(n_rows * fraction)
+            if fraction < 1 and sample_rows < MIN_SEARCH_ROWS:
+                break
+            for k_range in K_OPTIONS:
+                for fold_range in FOLD_OPTIONS:
+                    predicted = self.estimate(sample_rows, n_valid, fold_range, k_range, n_workers)
+                    candidates.append(
+                        {
+                            "fold_range": fold_range,
+                            "k_range": k_range,
+                            "sample_fraction": fraction,
+                            "predicted_seconds": predicted,
+                            "within_budget": predicted <= budget,
+                        }
+                    )
+        within_budget = [candidate for candidate in candidates if candidate["within_budget"]]
+        if within_budget:
+            return within_budget[0]
+        return min(candidates, key=lambda candidate: candidate["predicted_seconds"])
+
+    def record(self, plan, actual_seconds):
+        """
+        Ενημερώνει τον διορθωτικό συντελεστή με τον πραγματικό χρόνο μιας αναζήτησης (εκθετικός μέσος όρος σε
+        λογαριθμική κλίμακα) και την προσθέτει στο ιστορικό.
+        """
+        uncorrected = plan["predicted_seconds"] / self.correction
+        if uncorrected > 0 and actual_seconds > 0:
+            ratio = min(max(actual_seconds / uncorrected, 0.05), 20.0)
+            self.correction = math.exp((1 - LEARNING_RATE) * math.log(self.correction) + LEARNING_RATE * math.log(ratio))
+        self.history.append(
+            {
+                "folds": list(plan["fold_range"]),
+                "neighbors": list(plan["k_range"]),
+                "sample_fraction": plan["sample_fraction"],
+                "predicted_seconds": round(plan["predicted_seconds"], 3),
+                "actual_seconds": round(actual_seconds, 3),
+            }
+        )
+        self.history = self.history[-HISTORY_SIZE:]
+
+
+def budgeted_search(knn, budget, path=COST_MODEL_FILE):
+    """
+    Εκτελεί την find_best_neighbors() με το πλάνο που χωράει στο χρονικό όριο.
+
+    Ο χρόνος των δοκιμαστικών εκπαιδεύσεων αφαιρείται από το όριο. Μετά την αναζήτηση ο πραγματικός χρόνος
+    ενημερώνει τον διορθωτικό συντελεστή στο path.
+
+    Parameters:
+        knn (KNN): Το μοντέλο, με δεδομένα από την feed_data().
+        budget (float): Το χρονικό όριο της αναζήτησης σε δευτερόλεπτα.
+        path (str): Το αρχείο του διορθωτικού συντελεστή.
+
+    Returns:
+        dict: Το πλάνο (βλ. CostModel.plan()) με τα probe_seconds και actual_seconds.
+
+    Raises:
+        ValueError: Αν το όριο δεν είναι θετικό ή αν δεν έχουν τροφοδοτηθεί δεδομένα.
+    """
+    if budget <= 0:
+        raise ValueError("Το χρονικό όριο πρέπει να είναι θετικός αριθμός δευτερολέπτων.")
+    if knn.X_train is None:
+        raise ValueError("Τα δεδομένα εκπαίδευσης δεν έχουν τροφοδοτηθεί στο μοντέλο. Καλέστε πρώτα τη μέθοδο feed_data().")
+
+    start = time.perf_counter()
+    cost_model = CostModel.load(path)
+    with knn.resources.limits():  # Οι δοκιμές μετρώνται με τα ίδια νήματα που θα χρησιμοποιήσει η αναζήτηση
+        cost_model.calibrate(knn.X_train, knn.y_train, knn.preprocessor, knn.random_state)
+    probe_seconds = time.perf_counter() - start
+
+    plan = cost_model.plan(
+        budget - probe_seconds, len(knn.X_train), len(knn.X_train) + len(knn.X_valid), effective_n_jobs(knn.resources.n_jobs)
+    )
+    start = time.perf_counter()
+    knn.find_best_neighbors(
+        k_range=plan["k_range"], fold_range=plan["fold_range"], sample_fraction=plan["sample_fraction"]
+    )
+    actual_seconds = time.perf_counter() - start
+
+    cost_model.record(plan, actual_seconds)
+    cost_model.save(path)
+    return {**plan, "probe_seconds": probe_seconds, "actual_seconds": actual_seconds}
@@ -0,0 +1,280 @@
+"""
+Data Loader Module
+
+Φόρτωση αρχείων Excel καμπανιών σε δύο στάδια:
+    - Γρήγορη επικύρωση: διαβάζεται μόνο η γραμμή επικεφαλίδας, οι διαστάσεις
+      του φύλλου και ένα μικρό δείγμα γραμμών, ώστε ένα λάθος αρχείο να
+      απορρίπτεται χωρίς να γίνει πλήρης ανάγνωση.
+    - Πλήρης ανάγνωση: φορτώνονται μόνο οι απαιτούμενες στήλες με ρητούς
+      τύπους δεδομένων, χωρίς αυτόματη αναγνώριση τύπων από το pandas.
+
+Πολλά αρχεία (ή ένας φάκελος) διαβάζονται παράλληλα σε διεργασίες και
+ενώνονται σε ένα DataFrame με τη στήλη CAMPAIGN_COLUMN. Το αποτέλεσμα
+αποθηκεύεται στο CACHE_DIR, ώστε επόμενες φορτώσεις των ίδιων (αμετάβλητων)
+αρχείων να μη χρειάζονται ανάγνωση· κρατείται μόνο το τελευταίο αποτέλεσμα.
+
+Usage:
+    from data_loader import load_campaign_file, load_campaign_files
+    df = load_campaign_file("data/Project40PastCampaignData.xlsx")
+    history = load_campaign_files(["data/campaigns"])
+"""
+import hashlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Real
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+RESPONSE_COLUMN = "Ανταπόκριση"
+NUMERIC_COLUMNS = [
+    "Ηλικία",
+    "Logins τις τελευταίες 4 εβδομάδες",
+    "Logins τους τελευταίους 6 μήνες",
+    "Αγορές τις τελευταίες 4 εβδομάδες",
+    "Αγορές τους τελευταίους 6 μήνες",
+    "Σύνολο Αγορών",
+]
+CATEGORICAL_COLUMNS = ["Φύλο", "Περιοχή", "Email", "Χρήση Κινητού"]
+REQUIRED_COLUMNS = [
+    "Ηλικία", "Φύλο", "Περιοχή", "Email", "Χρήση Κινητού",
+    "Logins τις τελευταίες 4 εβδομάδες", "Logins τους τελευταίους 6 μήνες",
+    "Αγορές τις τελευταίες 4 εβδομάδες", "Αγορές τους τελευταίους 6 μήνες",
+    "Σύνολο Αγορών", RESPONSE_COLUMN,
+]
+# Η ανταπόκριση είναι κενή στα αρχεία νέας καμπάνιας, οπότε αφήνεται χωρίς ρητό τύπο.
+# Οι αριθμητικές στήλες διαβάζονται ως float64 και γίνονται int64 μόνο αφού ελεγχθεί
+# ότι όλες οι τιμές είναι ακέραιες (βλ. read_campaign_workbook), ώστε να μην περικόπτονται.
+COLUMN_DTYPES = {
+    **{col: "float64" for col in NUMERIC_COLUMNS},
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+}
+SAMPLE_ROWS = 50  # Πλήθος γραμμών που ελέγχονται κατά την επικύρωση
+CAMPAIGN_COLUMN = "Καμπάνια"  # Η στήλη με την καμπάνια (όνομα αρχείου) κάθε γραμμής· δεν είναι χαρακτηριστικό του μοντέλου
+CACHE_DIR = "../cache"  # Ο φάκελος με τα ενωμένα δεδομένα πολλών αρχείων
+
+
+class SchemaError(ValueError):
+    """
+    Το αρχείο δεν έχει τη μορφή που απαιτείται (στήλες ή τύποι δεδομένων).
+    """
+
+
+def validate_workbook(file_path, sample_rows=SAMPLE_ROWS):
+    """
+    Επικυρώνει ένα αρχείο Excel διαβάζοντας μόνο την επικεφαλίδα, τις διαστάσεις και ένα δείγμα γραμμών.
+
+    Parameters:
+        file_path (str | Path): Το path του αρχείου Excel.
+        sample_rows (int): Το πλήθος των γραμμών δεδομένων που θα ελεγχθούν για τον τύπο τους.
+
+    Returns:
+        int | None: Το πλήθος των γραμμών δεδομένων, όπως δηλώνεται στις διαστάσεις του φύλλου (None αν δεν δηλώνονται).
+
+    Raises:
+        SchemaError: Αν λείπουν στήλες, αν το αρχείο είναι άδειο ή αν οι τιμές του δείγματος δεν έχουν τον αναμενόμενο τύπο.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]  # Το pd.read_excel διαβάζει εξ ορισμού το πρώτο φύλλο
+        header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), None)
+        header = [str(value) if value is not None else "" for value in (header_row or ())]
+
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+        if missing_columns:
+            raise SchemaError(f"Το αρχείο δεν έχει τις στήλες: {', '.join(missing_columns)}")
+
+        # Το max_row προέρχεται από τη δήλωση διαστάσεων του φύλλου, χωρίς ανάγνωση των γραμμών
+        n_rows = sheet.max_row - 1 if sheet.max_row is not None else None
+        positions = {col: header.index(col) for col in REQUIRED_COLUMNS}
+
+        n_sampled = 0
+        for row_number, row in enumerate(
+            sheet.iter_rows(min_row=2, max_row=sample_rows + 1, values_only=True), start=2
+        ):
+            n_sampled += 1
+            for col in NUMERIC_COLUMNS:
+                value = row[positions[col]] if positions[col] < len(row) else None
+                if not isinstance(value, Real) or isinstance(value, bool):
+                    raise SchemaError(
+                        f"Μη αριθμητική τιμή '{value}' στη στήλη '{col}' (γραμμή {row_number})."
+                    )
+                if not float(value).is_integer():
+                    raise SchemaError(
+                        f"Μη ακέραια τιμή '{value}' στη στήλη '{col}' (γραμμή {row_number})."
+                    )
+            for col in CATEGORICAL_COLUMNS:
+                value = row[positions[col]] if positions[col] < len(row) else None
+                if not isinstance(value, str):
+                    raise SchemaError(
+                        f"Μη έγκυρη τιμή '{value}' στη στήλη '{col}' (γραμμή {row_number})."
+                    )
+
+        if n_sampled == 0 or n_rows == 0:
+            raise SchemaError("Το αρχείο δεν περιέχει γραμμές δεδομένων.")
+        return n_rows
+    finally:
+        workbook.close()
+
+
+def read_campaign_workbook(file_path):
+    """
+    Διαβάζει τις απαιτούμενες στήλες ενός αρχείου Excel με ρητούς τύπους δεδομένων.
+
+    Parameters:
+        file_path (str | Path): Το path του αρχείου Excel.
+
+    Returns:
+        pd.DataFrame: Τα δεδομένα του αρχείου, με τις στήλες στη σειρά του REQUIRED_COLUMNS.
+
+    Raises:
+        SchemaError: Αν μια αριθμητική στήλη έχει κενή ή μη ακέραια τιμή.
+    """
+    df = pd.read_excel(file_path, usecols=REQUIRED_COLUMNS, dtype=COLUMN_DTYPES, engine="openpyxl")
+    for col in NUMERIC_COLUMNS:
+        values = df[col].to_numpy()
+        invalid = np.flatnonzero(~np.isfinite(values) | (values != np.floor(values)))
+        if len(invalid):
+            row_number = invalid[0] + 2  # Η γραμμή του Excel (η 1η είναι η επικεφαλίδα)
+            raise SchemaError(
+                f"Μη ακέραια τιμή '{values[invalid[0]]}' στη στήλη '{col}' (γραμμή {row_number})."
+            )
+        df[col] = values.astype(np.int64)  # Χωρίς απώλεια, αφού όλες οι τιμές είναι ακέραιες
+    return df[REQUIRED_COLUMNS]
+
+
+def load_campaign_file(file_path):
+    """
+    Επικυρώνει και φορτώνει ένα αρχείο Excel καμπάνιας.
+
+    Αν το DataFrame έχει RangeIndex, αυτό αντικαθίσταται από index της μορφής 'Πελάτης Ν'.
+
+    Parameters:
+        file_path (str | Path): Το path του αρχείου Excel.
+
+    Returns:
+        pd.DataFrame: Τα δεδομένα του αρχείου με index 'Πελάτης Ν'.
+
+    Raises:
+        SchemaError: Αν το αρχείο δεν περάσει την επικύρωση.
+    """
+    validate_workbook(file_path)
+    df = read_campaign_workbook(file_path)
+    if df.empty:
+        raise SchemaError("Το αρχείο δεν περιέχει γραμμές δεδομένων.")
+    if isinstance(df.index, pd.RangeIndex):
+        df.index = pd.Index([f"Πελάτης {i+1}" for i in range(len(df))])
+    return df
+
+
+def expand_campaign_paths(paths):
+    """
+    Επιστρέφει τα αρχεία Excel των paths, με τους φακέλους να αντικαθίστανται από τα αρχεία .xlsx που περιέχουν.
+
+    Parameters:
+        paths (list): Αρχεία ή/και φάκελοι.
+
+    Returns:
+        list[Path]: Τα αρχεία, ταξινομημένα και χωρίς διπλότυπα.
+
+    Raises:
+        SchemaError: Αν δεν βρεθεί κανένα αρχείο Excel.
+    """
+    files = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            # Τα '~$...' είναι προσωρινά αρχεία κλειδώματος του Excel
+            files.update(p for p in path.glob("*.xlsx") if not p.name.startswith("~$"))
+        else:
+            files.add(path)
+    if not files:
+        raise SchemaError("Δεν βρέθηκαν αρχεία Excel.")
+    return sorted(files)
+
+
+def _load_named(file):
+    """
+    Η load_campaign_file() με το όνομα του αρχείου στο μήνυμα του SchemaError (εκτελείται σε διεργασία του pool).
+    """
+    try:
+        return load_campaign_file(file)
+    except SchemaError as se:
+        raise SchemaError(f"{Path(file).name}: {se}") from se
+
+
+def _cache_path(files, cache_dir):
+    """
+    Το αρχείο cache των files· το κλειδί αλλάζει όταν αλλάξει οποιοδήποτε αρχείο (path, μέγεθος, χρόνος τροποποίησης).
+    """
+    key = hashlib.sha256()
+    for file in files:
+        stat = file.stat()
+        key.update(f"{file.resolve()}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return Path(cache_dir) / f"campaigns_{key.hexdigest()[:16]}.pkl"
+
+
+def _write_cache(df, cache_file):
+    """
+    Αποθηκεύει το df στο cache_file και διαγράφει τα υπόλοιπα αρχεία cache καμπανιών του φακέλου.
+    """
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(cache_file)
+        # Κάθε διαφορετικό σύνολο αρχείων έχει δικό του κλειδί, οπότε τα παλιά θα συσσωρεύονταν
+        for stale in cache_file.parent.glob("campaigns_*.pkl"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass  # Χωρίς δικαίωμα εγγραφής τα δεδομένα απλώς δεν αποθηκεύονται
+
+
+def load_campaign_files(paths, max_workers=None, cache_dir=CACHE_DIR):
+    """
+    Επικυρώνει και φορτώνει παράλληλα πολλά αρχεία Excel καμπανιών και τα ενώνει σε ένα DataFrame.
+
+    Κάθε αρχείο διαβάζεται με τη load_campaign_file() σε ξεχωριστή διεργασία, οπότε ο συνολικός χρόνος είναι κοντά
+    σε αυτόν του μεγαλύτερου αρχείου. Οι κατηγορικές στήλες και η CAMPAIGN_COLUMN (το όνομα του αρχείου) έχουν τύπο
+    category.
+
+    Parameters:
+        paths (list): Αρχεία ή/και φάκελοι με αρχεία .xlsx.
+        max_workers (int, optional): Ο αριθμός των διεργασιών. Αν δεν δοθεί, ένα ανά αρχείο (έως τους πυρήνες).
+        cache_dir (str | Path, optional): Ο φάκελος του cache. Αν είναι None, δεν χρησιμοποιείται cache.
+
+    Returns:
+        pd.DataFrame: Οι γραμμές όλων των αρχείων με index 'Πελάτης Ν' και τη στήλη CAMPAIGN_COLUMN.
+
+    Raises:
+        SchemaError: Αν κάποιο αρχείο δεν περάσει την επικύρωση (το μήνυμα αναφέρει το αρχείο) ή αν δύο αρχεία
+            έχουν το ίδιο όνομα (η CAMPAIGN_COLUMN δεν θα τα ξεχώριζε).
+    """
+    files = expand_campaign_paths(paths)
+    stems = pd.Series([file.stem for file in files])
+    duplicates = sorted(set(stems[stems.duplicated()]))
+    if duplicates:
+        raise SchemaError(f"Αρχεία καμπανιών με το ίδιο όνομα σε διαφορετικούς φακέλους: {', '.join(duplicates)}")
+    cache_file = _cache_path(files, cache_dir) if cache_dir is not None else None
+    if cache_file is not None and cache_file.exists():
+        return pd.read_pickle(cache_file)
+
+    n_workers = max_workers or min(len(files), mp.cpu_count())
+    if n_workers == 1:  # Χωρίς παραλληλισμό: ανάγνωση εδώ, χωρίς το κόστος εκκίνησης των διεργασιών
+        frames = [_load_named(file) for file in files]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("spawn")) as executor:
+            frames = list(executor.map(_load_named, files))
+
+    df = pd.concat(frames, ignore_index=True)
+    # Το concat κατηγορικών με διαφορετικές κατηγορίες δίνει object: επαναφορά του τύπου category
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    df[CAMPAIGN_COLUMN] = pd.Categorical(
+        np.repeat([file.stem for file in files], [len(frame) for frame in frames])
+    )
+    df.index = pd.Index([f"Πελάτης {i+1}" for i in range(len(df))])
+
+    if cache_file is not None:
+        _write_cache(df, cache_file)
+    return df
@@ -0,0 +1,385 @@
+"""
+Distributed Search Module
+
+Κατανεμημένη αναζήτηση του αριθμού γειτόνων (K) σε workers, τοπικούς ή σε
+άλλους υπολογιστές:
+    - Ο συντονιστής (DistributedSearch) ακούει σε μια διεύθυνση socket και οι
+      workers συνδέονται σε αυτόν. Κάθε worker λαμβάνει τα δεδομένα της
+      αναζήτησης μία φορά, μαζί με το αποτύπωμά τους (fingerprint)· αν ήδη τα
+      έχει από προηγούμενη σύνδεση, δεν ξαναστέλνονται.
+    - Η αναζήτηση χωρίζεται σε εργασίες (αριθμός folds, split, παρτίδα τιμών
+      του K). Ο worker προεπεξεργάζεται κάθε split μία φορά (ο preprocessor
+      εκπαιδεύεται στο τμήμα εκπαίδευσης, όπως στο GridSearchCV) και
+      επιστρέφει τα σκορ κάθε K της παρτίδας.
+    - Τα σκορ επιστρέφουν καθώς ολοκληρώνονται οι εργασίες· μόλις
+      ολοκληρωθούν όλα τα splits ενός (folds, K), η find_best_neighbors() το
+      προσθέτει στα detailed_results.
+    - Αν ένας worker χαθεί (κλειστή σύνδεση ή εργασία πάνω από job_timeout),
+      η εργασία του επιστρέφει στην ουρά και εκτελείται από άλλον worker.
+
+Usage:
+    from distributed import DistributedSearch
+    with DistributedSearch(n_workers=4) as search:
+        knn_model.find_best_neighbors(range(2, 16), range(2, 8), executor=search)
+
+    # Συντονιστής για απομακρυσμένους workers:
+    with DistributedSearch(address=("0.0.0.0", 6100), authkey=b"secret") as search: ...
+    # Worker σε άλλο υπολογιστή:
+    python distributed.py --coordinator host:6100 --authkey secret
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from multiprocessing.connection import Client, Listener, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, precision_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+
+from prediction_cache import array_fingerprint
+
+K_BATCH_SIZE = 4  # Τιμές του K ανά εργασία
+JOB_TIMEOUT = 600  # Δευτερόλεπτα μετά τα οποία μια εργασία θεωρείται χαμένη και επιστρέφει στην ουρά
+WORKER_TIMEOUT = 60  # Δευτερόλεπτα αναμονής χωρίς κανέναν worker πριν η αναζήτηση εγκαταλειφθεί
+POLL_SECONDS = 0.1  # Κάθε πόσο ο συντονιστής ελέγχει για νέους workers και χαμένες εργασίες
+RECONNECT_SECONDS = 2  # Αναμονή του worker πριν από νέα σύνδεση με τον συντονιστή
+SPLIT_CACHE_SIZE = 4  # Πόσα προεπεξεργασμένα splits κρατά κάθε worker
+
+
+def dataset_fingerprint(X, y, preprocessor):
+    """
+    Το αποτύπωμα των δεδομένων μιας αναζήτησης (γραμμές, ανταπόκριση, στήλες και preprocessor).
+    """
+    return array_fingerprint(
+        pd.util.hash_pandas_object(X, index=True).to_numpy(),
+        pd.util.hash_pandas_object(pd.Series(np.asarray(y, dtype=str)), index=False).to_numpy(),
+        tuple(X.columns),
+        repr(preprocessor),
+    )
+
+
+def _run_job(data, splits, job):
+    """
+    Εκτελεί μια εργασία: τα σκορ (accuracy, precision macro) του split για κάθε K της παρτίδας.
+
+    Parameters:
+        data (tuple): (X, y, preprocessor) της αναζήτησης.
+        splits (OrderedDict): Τα προεπεξεργασμένα splits του worker ((folds, split) -> πίνακες), ενημερώνεται.
+        job (tuple): (αριθμός folds, αριθμός split, τιμές του K).
+
+    Returns:
+        dict: K -> (accuracy, precision).
+    """
+    X, y, preprocessor = data
+    n_splits, split, k_values = job
+    key = (n_splits, split)
+    if key not in splits:
+        train_idx, test_idx = list(StratifiedKFold(n_splits=n_splits).split(X, y))[split]
+        fold_preprocessor = clone(preprocessor)
+        splits[key] = (
+            fold_preprocessor.fit_transform(X.iloc[train_idx]), y.iloc[train_idx],
+            fold_preprocessor.transform(X.iloc[test_idx]), y.iloc[test_idx],
+        )
+        while len(splits) > SPLIT_CACHE_SIZE:
+            splits.popitem(last=False)
+    splits.move_to_end(key)
+    X_train, y_train, X_test, y_test = splits[key]
+
+    scores = {}
+    for k in k_values:
+        y_pred = KNeighborsClassifier(n_neighbors=k).fit(X_train, y_train).predict(X_test)
+        scores[k] = (
+            accuracy_score(y_test, y_pred),
+            precision_score(y_test, y_pred, average="macro", zero_division=0),
+        )
+    return scores
+
+
+def serve_coordinator(conn, cached=None):
+    """
+    Εξυπηρετεί τις εργασίες ενός συντονιστή μέχρι να λάβει "close".
+
+    Μηνύματα συντονιστή (tuples):
+        ("data", fingerprint, X, y, preprocessor): τα δεδομένα της αναζήτησης.
+        ("job", job): εκτέλεση εργασίας, απάντηση ("result", job, σκορ).
+        ("close",): τερματισμός.
+    Μόλις συνδεθεί, ο worker στέλνει ("hello", fingerprint) με το αποτύπωμα των δεδομένων που ήδη έχει.
+
+    Parameters:
+        conn (multiprocessing.connection.Connection): Η σύνδεση με τον συντονιστή.
+        cached (tuple, optional): (fingerprint, δεδομένα) από προηγούμενη σύνδεση.
+
+    Returns:
+        tuple: (fingerprint, δεδομένα) για την επόμενη σύνδεση.
+    """
+    fingerprint, data = cached or (None, None)
+    splits = OrderedDict()
+    try:
+        conn.send(("hello", fingerprint))
+        while True:
+            message = conn.recv()
+            kind = message[0]
+            if kind == "data":
+                _, fingerprint, X, y, preprocessor = message
+                data = (X, y, preprocessor)
+                splits.clear()
+            elif kind == "job":
+                _, job = message
+                conn.send(("result", job, _run_job(data, splits, job)))
+            elif kind == "close":
+                break
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+    return fingerprint, data
+
+
+def run_worker(address, authkey, reconnect=False):
+    """
+    Συνδέεται στον συντονιστή και εκτελεί εργασίες.
+
+    Parameters:
+        address (tuple): Η διεύθυνση (host, port) του συντονιστή.
+        authkey (bytes): Το κοινό κλειδί πιστοποίησης με τον συντονιστή.
+        reconnect (bool): Αν ο worker συνδέεται ξανά μετά το τέλος κάθε αναζήτησης (απομακρυσμένοι workers).
+            Τα δεδομένα κρατιούνται, ώστε να μην ξαναστέλνονται αν δεν αλλάξουν.
+    """
+    cached = None
+    while True:
+        try:
+            cached = serve_coordinator(Client(address, authkey=authkey), cached)
+        except (ConnectionError, OSError):
+            if not reconnect:
+                raise
+        if not reconnect:
+            return
+        time.sleep(RECONNECT_SECONDS)
+
+
+class DistributedSearch:
+    """
+    Συντονιστής της κατανεμημένης αναζήτησης του K (βλ. find_best_neighbors(executor=...)).
+
+    Attributes:
+        address (tuple): Η διεύθυνση (host, port) στην οποία ακούει ο συντονιστής (μετά τη start(), η πραγματική).
+        authkey (bytes): Το κλειδί πιστοποίησης των workers.
+        n_workers (int): Οι τοπικοί workers που ξεκινά ο συντονιστής (0: μόνο απομακρυσμένοι).
+        k_batch_size (int): Τιμές του K ανά εργασία.
+        job_timeout (float): Μέγιστη διάρκεια μιας εργασίας πριν επιστρέψει στην ουρά.
+        worker_timeout (float): Μέγιστη αναμονή χωρίς κανέναν worker.
+        lost_workers (int): Οι workers που χάθηκαν κατά τις αναζητήσεις.
+        requeued_jobs (int): Οι εργασίες που επέστρεψαν στην ουρά.
+    """
+
+    def __init__(self, n_workers=None, address=("127.0.0.1", 0), authkey=None, k_batch_size=K_BATCH_SIZE,
+                 job_timeout=JOB_TIMEOUT, worker_timeout=WORKER_TIMEOUT):
+        """
+        Parameters:
+            n_workers (int, optional): Οι τοπικοί workers. Αν δεν δοθεί, ένας ανά πυρήνα.
+            address (tuple): Η διεύθυνση (host, port) του συντονιστή (port 0: οποιαδήποτε ελεύθερη).
+            authkey (bytes, optional): Το κλειδί πιστοποίησης. Αν δεν δοθεί, τυχαίο (μόνο τοπικοί workers).
+            k_batch_size (int): Τιμές του K ανά εργασία.
+            job_timeout (float): Μέγιστη διάρκεια μιας εργασίας (s).
+            worker_timeout (float): Μέγιστη αναμονή χωρίς κανέναν worker (s).
+        """
+        self.n_workers = mp.cpu_count() if n_workers is None else n_workers
+        self.address = address
+        self.authkey = authkey or os.urandom(16)
+        self.k_batch_size = k_batch_size
+        self.job_timeout = job_timeout
+        self.worker_timeout = worker_timeout
+        self.lost_workers = 0
+        self.requeued_jobs = 0
+        self._listener = None
+        self._accept_thread = None
+        self._closing = threading.Event()
+        self._arrivals = queue.Queue()  # (σύνδεση, fingerprint) των workers που μόλις συνδέθηκαν
+        self._idle = {}  # σύνδεση -> fingerprint των δεδομένων που έχει ο worker
+        self._processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """
+        Ξεκινά τον συντονιστή και τους τοπικούς workers.
+        """
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._closing.clear()
+        self._accept_thread = threading.Thread(target=self._accept, args=(self._listener,), daemon=True)
+        self._accept_thread.start()
+        context = mp.get_context("spawn")
+        for _ in range(self.n_workers):
+            process = context.Process(target=run_worker, args=(self.address, self.authkey), daemon=True)
+            process.start()
+            self._processes.append(process)
+
+    def _accept(self, listener):
+        """
+        Δέχεται συνδέσεις workers (σε νήμα παρασκηνίου) μέχρι να τερματιστεί ο συντονιστής.
+        """
+        while True:
+            try:
+                conn = listener.accept()
+                if self._closing.is_set():
+                    conn.close()
+                    return
+                _, fingerprint = conn.recv()
+            except (mp.AuthenticationError, OSError, EOFError):
+                if self._closing.is_set():
+                    return
+                continue
+            self._arrivals.put((conn, fingerprint))
+
+    def _collect_arrivals(self):
+        while True:
+            try:
+                conn, fingerprint = self._arrivals.get_nowait()
+            except queue.Empty:
+                return
+            self._idle[conn] = fingerprint
+
+    def _lose(self, conn, job, pending):
+        """
+        Αφαιρεί έναν worker που χάθηκε και επιστρέφει την εργασία του στην αρχή της ουράς.
+        """
+        conn.close()
+        self._idle.pop(conn, None)
+        self.lost_workers += 1
+        if job is not None:
+            pending.appendleft(job)
+            self.requeued_jobs += 1
+
+    def cross_validate(self, X, y, preprocessor, k_values, fold_range):
+        """
+        Εκτελεί το cross-validation όλων των (αριθμός folds, K) στους workers.
+
+        Parameters:
+            X (pd.DataFrame): Τα χαρακτηριστικά της αναζήτησης.
+            y (pd.Series): Η ανταπόκριση.
+            preprocessor (ColumnTransformer): Ο (μη εκπαιδευμένος) preprocessor.
+            k_values (list): Οι τιμές του K.
+            fold_range (iterable): Οι αριθμοί folds.
+
+        Yields:
+            tuple: (αριθμός folds, K, {"accuracy": [...], "precision": [...]}) με τα σκορ όλων των splits, μόλις
+            ολοκληρωθούν.
+
+        Raises:
+            ValueError: Αν ο συντονιστής δεν έχει ξεκινήσει ή αν δεν υπάρχει κανένας worker για worker_timeout.
+        """
+        if self._listener is None:
+            raise ValueError("Ο συντονιστής δεν έχει ξεκινήσει. Καλέστε πρώτα τη μέθοδο start().")
+
+        fingerprint = dataset_fingerprint(X, y, preprocessor)
+        batches = [tuple(k_values[i:i + self.k_batch_size]) for i in range(0, len(k_values), self.k_batch_size)]
+        pending = deque((c, split, batch) for c in fold_range for split in range(c) for batch in batches)
+        scores = {}  # (folds, K) -> λίστα (accuracy, precision) ανά split
+        assigned = {}  # σύνδεση -> (εργασία, χρόνος ανάθεσης)
+        try:
+            yield from self._schedule(X, y, preprocessor, fingerprint, pending, scores, assigned)
+        finally:
+            # Αν η αναζήτηση διακοπεί, οι workers με εργασία σε εξέλιξη δεν μπορούν να ξαναχρησιμοποιηθούν
+            for conn in assigned:
+                conn.close()
+
+    def _schedule(self, X, y, preprocessor, fingerprint, pending, scores, assigned):
+        """
+        Ο βρόχος ανάθεσης εργασιών και συλλογής σκορ της cross_validate().
+        """
+        last_worker_seen = time.monotonic()
+        while pending or assigned:
+            self._collect_arrivals()
+            # Ανάθεση εργασιών στους ελεύθερους workers (με τα δεδομένα, αν δεν τα έχουν)
+            for conn in list(self._idle):
+                if not pending:
+                    break
+                job = pending.popleft()
+                try:
+                    if self._idle[conn] != fingerprint:
+                        conn.send(("data", fingerprint, X, y, preprocessor))
+                    conn.send(("job", job))
+                except (OSError, EOFError):
+                    self._lose(conn, job, pending)
+                    continue
+                del self._idle[conn]
+                assigned[conn] = (job, time.monotonic())
+
+            if assigned:
+                last_worker_seen = time.monotonic()
+            elif time.monotonic() - last_worker_seen > self.worker_timeout:
+                raise ValueError(f"Κανένας worker δεν συνδέθηκε στον συντονιστή {self.address} για {self.worker_timeout} s.")
+
+            for conn in wait(list(assigned), timeout=POLL_SECONDS) if assigned else ():
+                job, _ = assigned.pop(conn)
+                try:
+                    _, done_job, job_scores = conn.recv()
+                except (OSError, EOFError):
+                    self._lose(conn, job, pending)
+                    continue
+                self._idle[conn] = fingerprint
+                n_splits = done_job[0]
+                for k, split_scores in job_scores.items():
+                    scores.setdefault((n_splits, k), []).append(split_scores)
+                    if len(scores[(n_splits, k)]) == n_splits:
+                        accuracy, precision = zip(*scores.pop((n_splits, k)))
+                        yield n_splits, k, {"accuracy": list(accuracy), "precision": list(precision)}
+            if not assigned:
+                time.sleep(POLL_SECONDS)
+
+            # Εργασίες που ξεπέρασαν το job_timeout: ο worker θεωρείται χαμένος
+            now = time.monotonic()
+            for conn, (job, started) in list(assigned.items()):
+                if now - started > self.job_timeout:
+                    del assigned[conn]
+                    self._lose(conn, job, pending)
+
+    def close(self):
+        """
+        Τερματίζει τους workers και τον συντονιστή.
+        """
+        self._collect_arrivals()
+        for conn in self._idle:
+            try:
+                conn.send(("close",))
+            except (OSError, EOFError):
+                pass
+            conn.close()
+        self._idle = {}
+        if self._listener is not None:
+            # Η accept() δεν διακόπτεται με το κλείσιμο του socket: μια τελευταία σύνδεση ξυπνά το νήμα
+            self._closing.set()
+            try:
+                Client(self.address, authkey=self.authkey).close()
+            except (OSError, mp.AuthenticationError):
+                pass
+            self._accept_thread.join(timeout=5)
+            listener, self._listener = self._listener, None
+            listener.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Εκκίνηση worker για κατανεμημένη αναζήτηση του K.")
+    parser.add_argument("--coordinator", required=True, help="Διεύθυνση host:port του συντονιστή.")
+    parser.add_argument("--authkey", required=True, help="Κοινό κλειδί πιστοποίησης με τον συντονιστή.")
+    args = parser.parse_args()
+    host, port = args.coordinator.rsplit(":", 1)
+    run_worker((host, int(port)), args.authkey.encode(), reconnect=True)
@@ -0,0 +1,139 @@
+"""
+Exporter Module
+
+Αποθήκευση DataFrame προβλέψεων σε αρχεία, με επιλογή μορφής βάσει της
+επέκτασης του αρχείου:
+    - .xlsx: streaming εγγραφή (write-only workbook) με αυτόματο διαχωρισμό
+      σε πολλαπλά φύλλα όταν ξεπερνιέται το όριο γραμμών του Excel
+    - .csv: εγγραφή σε τμήματα (chunks)
+    - .parquet: στηλοθετική μορφή (απαιτεί pyarrow ή fastparquet)
+
+Usage:
+    from exporter import export_predictions
+    export_predictions(df, "predictions.xlsx", progress=lambda done, total: ...)
+"""
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+from openpyxl import Workbook
+
+EXCEL_MAX_ROWS = 1_048_576  # Μέγιστος αριθμός γραμμών ανά φύλλο Excel (μαζί με την επικεφαλίδα)
+CHUNK_SIZE = 50_000  # Πλήθος γραμμών που μετατρέπονται/γράφονται σε κάθε βήμα
+SUPPORTED_FORMATS = {
+    ".xlsx": "Excel files",
+    ".csv": "CSV files",
+    ".parquet": "Parquet files",
+}
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _chunks(df: pd.DataFrame, chunk_size: int):
+    """
+    Επιστρέφει διαδοχικά τμήματα του DataFrame μεγέθους το πολύ chunk_size γραμμών.
+    """
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _write_xlsx(df: pd.DataFrame, path: Path, index: bool, progress: Optional[ProgressCallback],
+                max_rows: int = EXCEL_MAX_ROWS) -> None:
+    """
+    Γράφει το DataFrame σε .xlsx με write-only workbook του openpyxl.
+
+    Οι γραμμές γράφονται απευθείας στο XML του φύλλου χωρίς να δημιουργείται
+    αντικείμενο για κάθε κελί. Όταν ένα φύλλο γεμίσει (max_rows γραμμές μαζί με
+    την επικεφαλίδα), η εγγραφή συνεχίζεται σε νέο φύλλο με την ίδια επικεφαλίδα.
+    """
+    rows_per_sheet = max_rows - 1
+    header = ([df.index.name or ""] if index else []) + [str(col) for col in df.columns]
+    total = len(df)
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = rows_per_sheet  # Εξαναγκάζει τη δημιουργία του πρώτου φύλλου
+    written = 0
+
+    for chunk in _chunks(df, CHUNK_SIZE):
+        # Οι τιμές NaN γράφονται ως κενά κελιά, όπως και στο DataFrame.to_excel
+        values = chunk.astype(object).where(chunk.notna(), None)
+        if index:
+            values.insert(0, "__index__", chunk.index.astype(object))
+        for row in values.itertuples(index=False, name=None):
+            if sheet_rows == rows_per_sheet:
+                sheet = workbook.create_sheet(title=f"Sheet{len(workbook.worksheets) + 1}")
+                sheet.append(header)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+        written += len(chunk)
+        if progress:
+            progress(written, total)
+
+    if sheet is None:  # Κενό DataFrame: γράφεται μόνο η επικεφαλίδα
+        workbook.create_sheet(title="Sheet1").append(header)
+    workbook.save(path)
+
+
+def _write_csv(df: pd.DataFrame, path: Path, index: bool, progress: Optional[ProgressCallback]) -> None:
+    """
+    Γράφει το DataFrame σε .csv σε τμήματα, ώστε να αναφέρεται η πρόοδος.
+
+    Χρησιμοποιείται κωδικοποίηση utf-8-sig ώστε το Excel να αναγνωρίζει τους
+    ελληνικούς χαρακτήρες.
+    """
+    total = len(df)
+    written = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        df.iloc[:0].to_csv(f, index=index)
+        for chunk in _chunks(df, CHUNK_SIZE):
+            chunk.to_csv(f, index=index, header=False)
+            written += len(chunk)
+            if progress:
+                progress(written, total)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, index: bool, progress: Optional[ProgressCallback]) -> None:
+    """
+    Γράφει το DataFrame σε .parquet.
+
+    Raises:
+        ValueError: Αν δεν είναι εγκατεστημένη βιβλιοθήκη parquet (pyarrow ή fastparquet).
+    """
+    try:
+        df.to_parquet(path, index=index)
+    except ImportError as e:
+        raise ValueError(
+            "Η αποθήκευση σε Parquet απαιτεί τη βιβλιοθήκη pyarrow ή fastparquet."
+        ) from e
+    if progress:
+        progress(len(df), len(df))
+
+
+def export_predictions(df: pd.DataFrame, path, index: bool = True,
+                       progress: Optional[ProgressCallback] = None) -> None:
+    """
+    Αποθηκεύει το DataFrame στο path, με μορφή που επιλέγεται από την επέκταση.
+
+    Parameters:
+        df (pd.DataFrame): Τα δεδομένα προς αποθήκευση.
+        path (str | Path): Το path του αρχείου (.xlsx, .csv ή .parquet).
+        index (bool): Αν θα αποθηκευτεί και το index του DataFrame.
+        progress (Callable[[int, int], None], optional): Καλείται με (γραμμές που γράφτηκαν, σύνολο γραμμών).
+
+    Raises:
+        ValueError: Αν η επέκταση του αρχείου δεν υποστηρίζεται.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".xlsx":
+        _write_xlsx(df, path, index, progress)
+    elif suffix == ".csv":
+        _write_csv(df, path, index, progress)
+    elif suffix == ".parquet":
+        _write_parquet(df, path, index, progress)
+    else:
+        raise ValueError(
+            f"Μη υποστηριζόμενη μορφή αρχείου '{suffix}'. Διαθέσιμες μορφές: {', '.join(SUPPORTED_FORMATS)}"
+        )
@@ -0,0 +1,141 @@
+"""
+Fast Inference Module
+
+Γρήγορη πρόβλεψη για μεμονωμένες εγγραφές από το αρχείο .npz της
+KNN.export_inference(), χωρίς pandas και sklearn (μόνο NumPy):
+    - Μια εγγραφή (dict ή tuple με τη σειρά των στηλών εκπαίδευσης)
+      μετατρέπεται απευθείας σε διάνυσμα χαρακτηριστικών.
+    - Οι γείτονες βρίσκονται με ακριβή αναζήτηση στο σύνολο αναφοράς, με
+      την απόσταση Minkowski (p) και τη στάθμιση ψήφων του μοντέλου.
+
+Δίνει τις ίδιες προβλέψεις με το πλήρες Pipeline: όταν ισαπέχοντα σημεία
+βρίσκονται στο όριο των k γειτόνων, προτιμάται το σημείο με τον μικρότερο
+δείκτη, όπως και στον classifier του μοντέλου (StableKNeighborsClassifier).
+
+Usage:
+    from fast_inference import CompiledKNN
+    model = CompiledKNN.load("model.npz")
+    model.predict_one({"Ηλικία": 35, "Φύλο": "female", ...})
+"""
+import numpy as np
+
+
+class CompiledKNN:
+    """
+    Μοντέλο K-NN από πίνακες NumPy (βλ. KNN.export_inference()).
+
+    Attributes:
+        columns (tuple): Η σειρά των στηλών για εγγραφές-tuple.
+        classes (np.ndarray): Οι κλάσεις της ανταπόκρισης.
+        n_neighbors (int): Ο αριθμός των γειτόνων.
+        weights (str): Η στάθμιση των ψήφων ("uniform" ή "distance").
+        p (float): Η παράμετρος p της απόστασης Minkowski.
+    """
+
+    def __init__(self, artifacts):
+        self.columns = tuple(artifacts["columns"].tolist())
+        self.classes = artifacts["classes"]
+        self.n_neighbors = int(artifacts["n_neighbors"])
+        # Αρχεία προηγούμενων εκδόσεων δεν έχουν στάθμιση και p: ισοβαρείς ψήφοι και Ευκλείδεια απόσταση
+        self.weights = str(artifacts["weights"]) if "weights" in artifacts else "uniform"
+        self.p = float(artifacts["p"]) if "p" in artifacts else 2.0
+        self._means = artifacts["means"]
+        self._scales = artifacts["scales"]
+        self._reference = np.ascontiguousarray(artifacts["reference"], dtype=np.float64)
+        self._labels = artifacts["labels"]
+
+        numeric_columns = artifacts["numeric_columns"].tolist()
+        categorical_columns = artifacts["categorical_columns"].tolist()
+        self._numeric_columns = numeric_columns
+        self._categorical_columns = categorical_columns
+        # (στήλη, κατηγορία) -> θέση στο διάνυσμα χαρακτηριστικών
+        offset = len(numeric_columns)
+        self._category_index = {
+            (categorical_columns[col], value): offset + i
+            for i, (col, value) in enumerate(zip(artifacts["category_column"].tolist(),
+                                                 artifacts["category_value"].tolist()))
+        }
+        self._n_features = offset + len(self._category_index)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Φορτώνει το μοντέλο από το αρχείο .npz.
+        """
+        with np.load(path, allow_pickle=False) as artifacts:
+            return cls({name: artifacts[name] for name in artifacts.files})
+
+    def vectorize(self, record):
+        """
+        Μετατρέπει μια εγγραφή σε διάνυσμα χαρακτηριστικών (όπως ο preprocessor του Pipeline).
+
+        Parameters:
+            record (dict | tuple): Οι τιμές της εγγραφής, ανά στήλη ή με τη σειρά του columns.
+
+        Returns:
+            np.ndarray: Το διάνυσμα χαρακτηριστικών.
+
+        Raises:
+            ValueError: Αν λείπει στήλη ή αν μια κατηγορία δεν υπήρχε στα δεδομένα εκπαίδευσης.
+        """
+        if not isinstance(record, dict):
+            record = dict(zip(self.columns, record))
+        try:
+            numeric = np.array([record[col] for col in self._numeric_columns], dtype=np.float64)
+            categories = [(col, str(record[col])) for col in self._categorical_columns]
+        except KeyError as e:
+            raise ValueError(f"Η εγγραφή δεν έχει τη στήλη {e}.")
+
+        vector = np.zeros(self._n_features)
+        vector[:len(numeric)] = (numeric - self._means) / self._scales
+        for key in categories:
+            if key not in self._category_index:
+                raise ValueError(f"Άγνωστη κατηγορία '{key[1]}' στη στήλη '{key[0]}'.")
+            vector[self._category_index[key]] = 1.0
+        return vector
+
+    def _neighbors(self, vector):
+        """
+        Οι κλάσεις και οι αποστάσεις των k πλησιέστερων γειτόνων ενός διανύσματος.
+        """
+        diff = self._reference - vector
+        # Σύγκριση με το άθροισμα των δυνάμεων (χωρίς ρίζα), που διατηρεί τη σειρά των αποστάσεων
+        if self.p == 2:
+            powers = np.einsum("ij,ij->i", diff, diff)
+        elif self.p == 1:
+            powers = np.abs(diff).sum(axis=1)
+        else:
+            powers = (np.abs(diff) ** self.p).sum(axis=1)
+        k = min(self.n_neighbors, len(powers))
+        # Όλα τα σημεία πιο κοντά από την k-οστή απόσταση και, από τα ισαπέχοντα, αυτά με τον μικρότερο δείκτη
+        kth = np.partition(powers, k - 1)[k - 1]
+        closer = np.flatnonzero(powers < kth)
+        ties = np.flatnonzero(powers == kth)[:k - len(closer)]
+        neighbors = np.concatenate([closer, ties])
+        return self._labels[neighbors], powers[neighbors] ** (1.0 / self.p)
+
+    def predict_proba_one(self, record):
+        """
+        Το (σταθμισμένο) ποσοστό των ψήφων των k γειτόνων της εγγραφής ανά κλάση (με τη σειρά του classes).
+        """
+        labels, distances = self._neighbors(self.vectorize(record))
+        if self.weights == "distance":
+            # Βάρος 1/απόσταση· αν υπάρχουν γείτονες σε μηδενική απόσταση, ψηφίζουν μόνο αυτοί
+            exact = distances == 0
+            weights = exact.astype(np.float64) if exact.any() else 1.0 / distances
+        else:
+            weights = None
+        counts = np.bincount(labels, weights=weights, minlength=len(self.classes))
+        return counts / counts.sum()
+
+    def predict_one(self, record):
+        """
+        Η κλάση πλειοψηφίας των k γειτόνων της εγγραφής (σε ισοψηφία η πρώτη κλάση, όπως στο KNeighborsClassifier).
+        """
+        return str(self.classes[self.predict_proba_one(record).argmax()])
+
+    def predict(self, records):
+        """
+        Οι προβλέψεις για μια σειρά εγγραφών.
+        """
+        return [self.predict_one(record) for record in records]
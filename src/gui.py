@@ -6,7 +6,7 @@ CampaignPredictionApp Module
     - Εκπαίδευση μοντέλου K-NN (αυτόματα ή χειροκίνητα)
     - Φόρτωση νέων δεδομένων για πρόβλεψη
     - Εκτέλεση προβλέψεων, εμφάνιση μετρικών και γραφημάτων
-    - Αποθήκευση αποτελεσμάτων σε αρχείο Excel
+    - Αποθήκευση αποτελεσμάτων σε αρχείο Excel, CSV ή Parquet
     
 Usage:
     from gui import CampaignPredictionApp
@@ -25,15 +25,41 @@ Authors:
     Κρανίτσα Αντωνία
     Ραφαήλ Ασλανίδης
 """
+import logging
+import math
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 import tkinter as tk
 from tkinter import messagebox, filedialog, scrolledtext, ttk, simpledialog
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 import sv_ttk
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from model import KNN
+from model import AGE_BAND, BREAKDOWN_COLUMNS, KNN, POSITIVE_LABEL, SCORE_COLUMN, SCORING, SELECTION_RULES, segment_counts
+from exporter import SUPPORTED_FORMATS, export_predictions
+from data_loader import CAMPAIGN_COLUMN, SchemaError, load_campaign_file, load_campaign_files
+from segmented import SEGMENT_COLUMNS, SegmentedKNN
+from cost_model import budgeted_search
+from session import clear_session, has_session, load_session, save_session
+from distributed import DistributedSearch
+from resources import ResourceConfig, benchmark_resources, candidate_configs
+from prediction_cache import PredictionCache
+from table_view import PredictionTable
+
+NO_SEGMENT = "Καμία"  # Η επιλογή ενός γενικού μοντέλου (χωρίς τμηματοποίηση)
+LOG_POLL_MS = 100  # Κάθε πόσα ms η ουρά καταγραφής αδειάζει στην καρτέλα καταγραφής
+LOG_MAX_LINES = 5000  # Ο μέγιστος αριθμός γραμμών που κρατά η καρτέλα καταγραφής
+LOG_BATCH_SIZE = 1000  # Ο μέγιστος αριθμός μηνυμάτων που εισάγονται ανά κύκλο
+LOG_FILE = "../logs/app.log"  # Το αρχείο στο οποίο αντιγράφονται όλα τα μηνύματα
+LOG_FILE_MAX_BYTES = 1_000_000  # Το μέγεθος μετά το οποίο το αρχείο καταγραφής περιστρέφεται
+LOG_FILE_BACKUPS = 3  # Ο αριθμός των παλαιών αρχείων καταγραφής που διατηρούνται
+WHAT_IF_MAX_K = 25  # Πόσοι γείτονες κάθε νέου πελάτη κρατούνται για την πρόβλεψη με άλλο K
 
 class CampaignPredictionApp:
     """
@@ -57,6 +83,10 @@ class CampaignPredictionApp:
             - model_trained -> load_new -> predictions_data_loaded
             - predictions_data_loaded -> predict -> predictions_made
             - predictions_made -> save -> restart (όλα τα flags επανέρχονται)
+            
+        Σε λειτουργία συνεδρίας ('keep_model_var'), η αποθήκευση επιστρέφει στο
+        model_trained, ώστε να βαθμολογηθούν διαδοχικά πολλές καμπάνιες με το
+        ίδιο μοντέλο.
     """
     def __init__(self, width: int, height: int) -> None:
         """
@@ -87,6 +117,15 @@ class CampaignPredictionApp:
         self.new_campaign_data = None
         self.knn_model = None
         self.predictions_df = None
+        self.resources = ResourceConfig()  # Διεργασίες, νήματα και όριο μνήμης των μοντέλων (βλ. configure_resources)
+        self.prediction_cache = PredictionCache()  # Μόνιμη cache προβλέψεων ανά πελάτη, κοινή για όλες τις εκτελέσεις
+        self.search_settings = None  # Ρυθμίσεις της κατανεμημένης αναζήτησης του K (βλ. configure_distributed_search)
+
+        # Προφόρτωση νέας καμπάνιας: η ανάγνωση γίνεται σε διεργασία παρασκηνίου κατά την εκπαίδευση
+        self.prefetch_executor = None
+        self.prefetch_future = None
+        self.prefetch_path = None
+        self.prefetch_output_path = None
 
         # Flags για τη διαχείριση κατάστασης κουμπιών
         self.training_data_loaded = False
@@ -94,11 +133,63 @@ class CampaignPredictionApp:
         self.predictions_data_loaded = False
         self.predictions_made = False
 
+        # Ουρά καταγραφής: η '_log' μπορεί να κληθεί από οποιοδήποτε νήμα
+        self.log_queue = queue.Queue()
+        self.file_logger = self._create_file_logger()
+
         # Δημιουργία του περιβάλλοντος διεπαφής
+        self._create_menu()
         self._create_buttons()
+        self._create_selection_controls()
         self._create_notebook()
+        self.master.after(LOG_POLL_MS, self._drain_log)
         self._log("Ξεκινήστε πρώτα με τη Φόρτωση Δεδομένων Προηγούμενης Καμπάνιας.\n")
         self._update_button_states()
+        # Πρόταση επαναφοράς της προηγούμενης συνεδρίας μόλις εμφανιστεί το παράθυρο
+        if has_session():
+            self.master.after_idle(self._offer_session_restore)
+
+    def _create_menu(self) -> None:
+        """
+        Δημιουργεί τη γραμμή μενού της εφαρμογής με τα επιπλέον εργαλεία.
+        
+        Τα εργαλεία αυτά δεν ανήκουν στη βασική ροή των πέντε βημάτων και
+        ενεργοποιούνται από την '_update_button_states' όταν υπάρχουν τα
+        απαιτούμενα δεδομένα.
+        """
+        self.menu_bar = tk.Menu(self.master)
+        self.tools_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.tools_menu.add_command(
+            label="Εξαγωγή Λίστας Στόχευσης (Top-N)...",
+            command=self.export_target_list
+            )
+        self.tools_menu.add_command(
+            label="Προσθήκη Αποτελεσμάτων Καμπάνιας...",
+            command=self.add_campaign_outcomes
+            )
+        self.tools_menu.add_command(
+            label="Προετοιμασία Νέας Καμπάνιας...",
+            command=self.queue_new_campaign
+            )
+        self.tools_menu.add_command(
+            label="Φόρτωση Ιστορικών Δεδομένων από Φάκελο...",
+            command=lambda: self.load_past_campaign_data(from_folder=True)
+            )
+        self.tools_menu.add_command(
+            label="Πρόβλεψη με Άλλο K...",
+            command=self.what_if_neighbors
+            )
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(
+            label="Ρύθμιση Πόρων (Διεργασίες/Νήματα)...",
+            command=self.configure_resources
+            )
+        self.tools_menu.add_command(
+            label="Κατανεμημένη Αναζήτηση K...",
+            command=self.configure_distributed_search
+            )
+        self.menu_bar.add_cascade(label="Εργαλεία", menu=self.tools_menu)
+        self.master.config(menu=self.menu_bar)
 
     def _create_buttons(self) -> None:
         """
@@ -195,13 +286,110 @@ class CampaignPredictionApp:
                     sticky='nsew'   # 'Κολλάει' τα κουμπιά στις διαστάσεις του παραθύρου
                     )
 
+    def _create_selection_controls(self) -> None:
+        """
+        Δημιουργεί τα στοιχεία επαναεπιλογής του αριθμού γειτόνων (k).
+        
+        Μετά την αυτόματη εκπαίδευση, ο χρήστης μπορεί να αλλάξει τη μετρική
+        βελτιστοποίησης ή τον κανόνα επιλογής και να επαναεπιλέξει το k από
+        τα ήδη αποθηκευμένα αποτελέσματα του cross-validation, χωρίς νέα
+        αναζήτηση.
+        """
+        selection_frame = ttk.Frame(self.master)
+        selection_frame.pack(padx=15, pady=(0, 5), fill=tk.X, expand=False)
+
+        ttk.Label(selection_frame, text="Μετρική:").pack(side=tk.LEFT, padx=5)
+        self.metric_var = tk.StringVar(value="accuracy")
+        self.cmb_metric = ttk.Combobox(
+            selection_frame,
+            textvariable=self.metric_var,
+            values=list(SCORING),
+            state='readonly',
+            width=12
+            )
+        self.cmb_metric.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(selection_frame, text="Κανόνας επιλογής:").pack(side=tk.LEFT, padx=5)
+        self.rule_var = tk.StringVar(value="mode")
+        self.cmb_rule = ttk.Combobox(
+            selection_frame,
+            textvariable=self.rule_var,
+            values=list(SELECTION_RULES),
+            state='readonly',
+            width=10
+            )
+        self.cmb_rule.pack(side=tk.LEFT, padx=5)
+
+        self.btn_reselect = ttk.Button(
+            selection_frame,
+            text="Επαναεπιλογή K",
+            command=self.reselect_neighbors
+            )
+        self.btn_reselect.pack(side=tk.LEFT, padx=5)
+
+        # Τμηματοποίηση: ένα μοντέλο ανά τιμή της επιλεγμένης στήλης (αυτόματη εκπαίδευση)
+        ttk.Label(selection_frame, text="Μοντέλα ανά:").pack(side=tk.LEFT, padx=5)
+        self.segment_var = tk.StringVar(value=NO_SEGMENT)
+        self.cmb_segment = ttk.Combobox(
+            selection_frame,
+            textvariable=self.segment_var,
+            values=[NO_SEGMENT, *SEGMENT_COLUMNS],
+            state='readonly',
+            width=10
+            )
+        self.cmb_segment.pack(side=tk.LEFT, padx=5)
+
+        # Χρονικό όριο αυτόματης εκπαίδευσης (κενό: πλήρης αναζήτηση)
+        ttk.Label(selection_frame, text="Χρονικό όριο (s):").pack(side=tk.LEFT, padx=5)
+        self.time_budget_var = tk.StringVar(value="")
+        self.ent_time_budget = ttk.Entry(selection_frame, textvariable=self.time_budget_var, width=6)
+        self.ent_time_budget.pack(side=tk.LEFT, padx=5)
+
+        # Λειτουργία συνεδρίας: το εκπαιδευμένο μοντέλο παραμένει φορτωμένο μετά την αποθήκευση
+        self.keep_model_var = tk.BooleanVar(value=True)
+        self.chk_keep_model = ttk.Checkbutton(
+            selection_frame,
+            text="Διατήρηση μοντέλου μετά την αποθήκευση",
+            variable=self.keep_model_var,
+            command=self._update_button_states
+            )
+        self.chk_keep_model.pack(side=tk.RIGHT, padx=5)
+
+        # Προσεγγιστικό ευρετήριο γειτόνων για πολύ μεγάλα ιστορικά δεδομένα
+        self.approximate_index_var = tk.BooleanVar(value=False)
+        self.chk_approximate_index = ttk.Checkbutton(
+            selection_frame,
+            text="Προσεγγιστικό ευρετήριο",
+            variable=self.approximate_index_var
+            )
+        self.chk_approximate_index.pack(side=tk.RIGHT, padx=5)
+
+        # Εκτεταμένη αναζήτηση: στάθμιση ψήφων και απόσταση Minkowski μαζί με τον αριθμό γειτόνων
+        self.extended_search_var = tk.BooleanVar(value=False)
+        self.chk_extended_search = ttk.Checkbutton(
+            selection_frame,
+            text="Εκτεταμένη αναζήτηση (βάρη, p)",
+            variable=self.extended_search_var
+            )
+        self.chk_extended_search.pack(side=tk.RIGHT, padx=5)
+
+        # Άπληστη επιλογή των χαρακτηριστικών της απόστασης πριν την αναζήτηση του k
+        self.feature_selection_var = tk.BooleanVar(value=False)
+        self.chk_feature_selection = ttk.Checkbutton(
+            selection_frame,
+            text="Επιλογή χαρακτηριστικών",
+            variable=self.feature_selection_var
+            )
+        self.chk_feature_selection.pack(side=tk.RIGHT, padx=5)
+
     def _create_notebook(self) -> None:
         """        
-        Δημιουργεί το notebook της εφαρμογής και τα δύο βασικά tabs.
+        Δημιουργεί το notebook της εφαρμογής και τα τρία βασικά tabs.
             
         Το πρώτο tab περιέχει ένα scrolled text widget για την εμφάνιση των
-        μηνυμάτων καταγραφής, ενώ το δεύτερο προετοιμάζει ένα καμβά matplotlib
-        για την απεικόνιση του γραφήματος πρόβλεψης ανταπόκρισης.
+        μηνυμάτων καταγραφής, το δεύτερο προετοιμάζει ένα καμβά matplotlib
+        για την απεικόνιση του γραφήματος πρόβλεψης ανταπόκρισης και το τρίτο
+        τον πίνακα των προβλέψεων.
         Χρησιμοποιείται 'pack()' για γενική διάταξη και 'grid()' όπου 
         απαιτείται ακρίβεια εντός πλαισίων.
             
@@ -235,6 +423,22 @@ class CampaignPredictionApp:
         # Tab #2: Περιοχή εμφάνισης γραφημάτων (plots)
         self.tab_plot = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_plot, text='Γράφημα Πρόβλεψης Ανταπόκρισης')
+        breakdown_frame = ttk.Frame(self.tab_plot)
+        breakdown_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Label(breakdown_frame, text="Ανάλυση ανά:").pack(side=tk.LEFT, padx=5)
+        self.breakdown_var = tk.StringVar(value="Φύλο")
+        self.cmb_breakdown = ttk.Combobox(
+            breakdown_frame,
+            textvariable=self.breakdown_var,
+            values=[*BREAKDOWN_COLUMNS, AGE_BAND],
+            state='readonly',
+            width=16
+            )
+        self.cmb_breakdown.pack(side=tk.LEFT, padx=5)
+        self.cmb_breakdown.bind(
+            "<<ComboboxSelected>>",
+            lambda event: self.plot_segment_breakdown() if self.predictions_df is not None else None
+            )
         self.plot_frame = ttk.Frame(self.tab_plot)
         self.plot_frame.pack(
             fill=tk.BOTH,
@@ -248,6 +452,14 @@ class CampaignPredictionApp:
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Tab #3: Πίνακας προβλέψεων (δημιουργεί γραμμές μόνο για τις ορατές εγγραφές)
+        self.tab_table = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_table, text='Πίνακας Προβλέψεων')
+        self.prediction_table = PredictionTable(self.tab_table)
+        self.prediction_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Διπλό κλικ σε πελάτη: οι πλησιέστεροι ιστορικοί πελάτες του
+        self.prediction_table.tree.bind("<Double-1>", self.show_nearest_customers)
+
     def _update_button_states(self) -> None:
         """        
         Ενημερώνει τη λειτουργική κατάσταση (ενεργό/ανενεργό) των κουμπιών της 
@@ -266,6 +478,10 @@ class CampaignPredictionApp:
             - Νεα δεδομένα φορτωμένα: ενεργό μόνο το κουμπί πρόβλεψης
             - Προβλέψεις ολοκληρώθηκαν: ενεργό μόνο το κουμπί αποθήκευσης
         
+        Σε λειτουργία συνεδρίας, με εκπαιδευμένο μοντέλο είναι επιπλέον ενεργό
+        το κουμπί φόρτωσης νέων δεδομένων και, πριν φορτωθεί νέα καμπάνια, το
+        κουμπί φόρτωσης ιστορικών δεδομένων (επανεκπαίδευση).
+        
         Authors:
             Πιτσαρής Κωνσταντίνος
         """
@@ -286,18 +502,75 @@ class CampaignPredictionApp:
         # Στάδιο 5 - Αποθήκευση αποτελεσμάτων
         elif self.predictions_made:
             states = [inactive, inactive, inactive, inactive, inactive, active]
+        # Λειτουργία συνεδρίας: με εκπαιδευμένο μοντέλο επιτρέπεται η φόρτωση νέας
+        # καμπάνιας σε κάθε στάδιο και η φόρτωση νέων ιστορικών δεδομένων (επανεκπαίδευση)
+        if self.keep_model_var.get() and self.model_trained:
+            states[3] = active
+            if not self.predictions_data_loaded:
+                states[0] = active
         for button, state in zip([self.btn_load_past, self.btn_train,
                                   self.btn_manual_train, self.btn_load_new,
                                   self.btn_predict, self.btn_save], states):
             button.config(state=state)
+        self.tools_menu.entryconfig("Φόρτωση Ιστορικών Δεδομένων από Φάκελο...", state=states[0])
+        # Η επαναεπιλογή του k απαιτεί αποτελέσματα αυτόματης εκπαίδευσης
+        can_reselect = (
+            self.model_trained
+            and self.knn_model is not None
+            and self.knn_model.cv_results_table is not None
+            )
+        self.btn_reselect.config(state=active if can_reselect else inactive)
+        # Η λίστα στόχευσης απαιτεί εκπαιδευμένο μοντέλο και δεδομένα νέας καμπάνιας
+        can_rank = self.model_trained and self.new_campaign_data is not None
+        self.tools_menu.entryconfig(
+            "Εξαγωγή Λίστας Στόχευσης (Top-N)...", state=active if can_rank else inactive
+            )
+        self.tools_menu.entryconfig(
+            "Προσθήκη Αποτελεσμάτων Καμπάνιας...",
+            state=active if self.model_trained and isinstance(self.knn_model, KNN) else inactive
+            )
+        # Η πρόβλεψη με άλλο K χρησιμοποιεί τους γείτονες των νέων πελατών (μόνο γενικό μοντέλο)
+        self.tools_menu.entryconfig(
+            "Πρόβλεψη με Άλλο K...",
+            state=active if self.predictions_df is not None and isinstance(self.knn_model, KNN) else inactive
+            )
+        # Η νέα καμπάνια μπορεί να προετοιμαστεί πριν ή κατά την εκπαίδευση
+        can_queue = self.prefetch_future is None and not self.predictions_data_loaded
+        self.tools_menu.entryconfig(
+            "Προετοιμασία Νέας Καμπάνιας...", state=active if can_queue else inactive
+            )
+
+    def _create_file_logger(self) -> logging.Logger:
+        """
+        Δημιουργεί τον logger που αντιγράφει τα μηνύματα καταγραφής σε αρχείο
+        με περιστροφή (RotatingFileHandler).
+        
+        Returns:
+            logging.Logger: Ο logger της εφαρμογής.
+        """
+        logger = logging.getLogger("campaign_app")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            try:
+                Path(LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(
+                    LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8"
+                    )
+            except OSError:
+                handler = logging.NullHandler() # Χωρίς δικαίωμα εγγραφής, μόνο η καρτέλα καταγραφής
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+        return logger
 
     def _log(self, message:str) -> None:
         """
         Καταγράφει ένα μήνυμα στην καρτέλα 'Αρχείο Καταγραφής' της εφαρμογής.
         
-        Η μέθοδος ενεργοποιεί προσωρινά την επεξεργασία του πεδίου κειμένου,
-        εισάγει το μήνυμα στο τέλος της περιοχής, μετακινεί την προβολή στην πιο
-        πρόσφατη εγγραφή και επαναφέρει την περιοχή σε κατάσταση μόνο-ανάγνωσης.
+        Η μέθοδος είναι ασφαλής για χρήση από νήματα παρασκηνίου: δεν αγγίζει
+        το Tk, αλλά βάζει το μήνυμα στην ουρά καταγραφής, την οποία αδειάζει
+        περιοδικά η '_drain_log' στο κύριο νήμα. Το μήνυμα αντιγράφεται αμέσως
+        και στο αρχείο καταγραφής.
         
         Args:
             message (str): Το μήνυμα που θα προστεθεί στο αρχείο καταγραφής.
@@ -305,11 +578,94 @@ class CampaignPredictionApp:
         Authors:
             Πιτσαρής Κωνσταντίνος
         """
-        self.notebook.select(self.tab_log)
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.insert(tk.END, message + "\n")
-        self.text_area.see(tk.END)
-        self.text_area.config(state=tk.DISABLED)
+        self.log_queue.put(message)
+        self.file_logger.info(message)
+
+    def _drain_log(self) -> None:
+        """
+        Αδειάζει την ουρά καταγραφής στην καρτέλα 'Αρχείο Καταγραφής'.
+        
+        Όλα τα μηνύματα που περιμένουν (έως LOG_BATCH_SIZE) εισάγονται με μία
+        εισαγωγή, οι παλαιότερες γραμμές πέρα από το LOG_MAX_LINES διαγράφονται
+        και η μέθοδος προγραμματίζει ξανά τον εαυτό της μέσω 'after'. Η
+        καρτέλα καταγραφής εμφανίζεται, εκτός αν ο χρήστης βρίσκεται στην
+        καρτέλα του πίνακα προβλέψεων (π.χ. μετά από διπλό κλικ σε πελάτη).
+        """
+        messages = []
+        while len(messages) < LOG_BATCH_SIZE:
+            try:
+                messages.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if messages:
+            if str(self.notebook.select()) != str(self.tab_table):
+                self.notebook.select(self.tab_log)
+            self.text_area.config(state=tk.NORMAL)
+            self.text_area.insert(tk.END, "\n".join(messages) + "\n")
+            n_lines = int(self.text_area.index("end-1c").split(".")[0])
+            if n_lines > LOG_MAX_LINES:
+                self.text_area.delete("1.0", f"{n_lines - LOG_MAX_LINES + 1}.0")
+            self.text_area.see(tk.END)
+            self.text_area.config(state=tk.DISABLED)
+        self.master.after(LOG_POLL_MS, self._drain_log)
+
+    def _default_data_dir(self) -> Path:
+        """
+        Επιστρέφει τον αρχικό φάκελο των διαλόγων ανοίγματος αρχείων: τον
+        υποφάκελο 'data', παράλληλο με τον φάκελο του κώδικα, ή το τρέχον
+        working directory αν δεν υπάρχει.
+        """
+        # Βρίσκουμε το κατάλογο του τρέχοντος αρχείου και τον γονέα του γονέα του
+        base_dir = Path(__file__).resolve().parent.parent
+        # Ορίζουμε τον υποφάκελο ~/data ως default
+        default_dir = base_dir / 'data'
+        # Εάν δεν υπάρχει - πάμε στο current working directory
+        if not default_dir.exists():
+            default_dir = Path.cwd()
+        return default_dir
+
+    def _load_history(self, from_folder: bool) -> Optional[pd.DataFrame]:
+        """
+        Φορτώνει τα ιστορικά δεδομένα από ένα ή περισσότερα αρχεία Excel ή από
+        όλα τα αρχεία ενός φακέλου.
+        
+        Τα αρχεία επικυρώνονται και διαβάζονται παράλληλα σε διεργασίες και
+        ενώνονται σε ένα DataFrame με τη στήλη 'Καμπάνια' (το όνομα του
+        αρχείου). Το αποτέλεσμα αποθηκεύεται σε cache, οπότε η επόμενη
+        φόρτωση των ίδιων αρχείων είναι άμεση.
+        
+        Args:
+            from_folder (bool): Επιλογή φακέλου αντί για αρχεία.
+            
+        Returns:
+            Optional[pd.DataFrame]: Τα ενωμένα δεδομένα, αλλιώς 'None'.
+        """
+        if from_folder:
+            folder = filedialog.askdirectory(
+                title="Επιλέξτε φάκελο με αρχεία προηγούμενων καμπανιών",
+                initialdir=self._default_data_dir()
+                )
+            paths = [folder] if folder else []
+        else:
+            paths = list(filedialog.askopenfilenames(
+                title="Επιλέξτε αρχεία δεδομένων προηγούμενων καμπανιών",
+                initialdir=self._default_data_dir(),
+                filetypes=[("Excel files", "*.xlsx")]
+                ))
+        if not paths:
+            messagebox.showwarning("Προσοχή!", "Δεν επιλέχθηκε αρχείο.")
+            return None
+        try:
+            return load_campaign_files(paths)
+        except SchemaError as se:
+            messagebox.showerror('Σφάλμα Μορφής Αρχείου', str(se))
+            return None
+        except Exception as e:
+            messagebox.showerror(
+                "Σφάλμα!",
+                f"Προέκυψε σφάλμα κατά τη φόρτωση των αρχείων Excel:\n{str(e)}"
+                )
+            return None
 
     def _load_data(self, title:str) -> Optional[pd.DataFrame]:
         """
@@ -326,6 +682,11 @@ class CampaignPredictionApp:
             Αγορές τις τελευταίες 4 εβδομάδες, Αγορές τους τελευταίους 6 μήνες,
             Σύνολο Αγορών, Ανταπόκριση
             
+        Πριν την πλήρη ανάγνωση, το αρχείο επικυρώνεται διαβάζοντας μόνο την
+        επικεφαλίδα και ένα μικρό δείγμα γραμμών, ώστε ένα λάθος αρχείο να
+        απορρίπτεται άμεσα. Στη συνέχεια φορτώνονται μόνο οι απαιτούμενες
+        στήλες με ρητούς τύπους δεδομένων.
+            
         Αν το DataFrame έχει RangeIndex, αυτό αντικαθίσταται απο index της
         μορφής 'Πελάτης Ν'.
         
@@ -338,47 +699,20 @@ class CampaignPredictionApp:
         Authors:
             Πιτσαρής Κωνσταντίνος
         """
-        # Βρίσκουμε το κατάλογο του τρέχοντος αρχείου και τον γονέα του γονέα του
-        base_dir = Path(__file__).resolve().parent.parent
-        # Ορίζουμε τον υποφάκελο ~/data ως default
-        default_dir = base_dir / 'data'
-        # Εάν δεν υπάρχει - πάμε στο current working directory
-        if not default_dir.exists():
-            default_dir = Path.cwd()
         file_path= filedialog.askopenfilename(
             title=title,
-            initialdir=default_dir,
+            initialdir=self._default_data_dir(),
             filetypes=[("Excel files", "*.xlsx")]
             )
         if not file_path:
             messagebox.showwarning("Προσοχή!", "Δεν επιλέχθηκε αρχείο.")
             return None
         try:
-            df = pd.read_excel(file_path)
-            
-            required_columns = ['Ηλικία', 'Φύλο', 'Περιοχή', 'Email', 'Χρήση Κινητού', 'Logins τις τελευταίες 4 εβδομάδες', 'Logins τους τελευταίους 6 μήνες', 'Αγορές τις τελευταίες 4 εβδομάδες', 'Αγορές τους τελευταίους 6 μήνες', 'Σύνολο Αγορών', 'Ανταπόκριση']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                messagebox.showerror(
-                    'Σφάλμα Μορφής Αρχείου',
-                    f"Το αρχείο δεν έχει τις στήλες: {', '.join(missing_columns)}"
-                    )
-                return None
-            
-            # Έλεγχος εάν το DataFrame είναι κενό
-            if df.empty:
-                messagebox.showerror(
-                    "Σφάλμα!",
-                    f"Το αρχείο είναι άδειο ή μη έγκυρου τύπου: {file_path}"
-                    )
-                return None
-            # Δημιουργία δυναμικού λεξικού ανάλογα με το μέγεθος του df
-            new_index = {i: f"Πελάτης {i+1}" for i in range(len(df))}
-            # Εάν το df έχει το default index, το μετονομάζει
-            if isinstance(df.index, pd.RangeIndex):
-                df = df.rename(index=new_index)
-            # Επιστρέφουμε το DataFrame με νέο index 'Πελάτης N'
-            return df
+            # Επικύρωση επικεφαλίδας/δείγματος και ανάγνωση μόνο των απαιτούμενων στηλών
+            return load_campaign_file(file_path)
+        except SchemaError as se:
+            messagebox.showerror('Σφάλμα Μορφής Αρχείου', str(se))
+            return None
         except FileNotFoundError:
             messagebox.showerror(
                 "Σφάλμα!", f"Το αρχείο δεν βρέθηκε: {file_path}"
@@ -406,12 +740,13 @@ class CampaignPredictionApp:
                 )
             return None
 
-    def load_past_campaign_data(self) -> None:
+    def load_past_campaign_data(self, from_folder: bool = False) -> None:
         """
-        Φορτώνει δεδομένα από αρχείο Excel που αντιστοιχούν σε προηγούμενη
-        καμπάνια.
+        Φορτώνει δεδομένα από αρχεία Excel που αντιστοιχούν σε προηγούμενες
+        καμπάνιες.
         
-        Η μέθοδος καλεί εσωτερικά τον διάλογο επιλογής αρχείου για παλαιά καμπάνια
+        Η μέθοδος καλεί εσωτερικά τον διάλογο επιλογής αρχείων (ή φακέλου) για
+        παλαιές καμπάνιες.
         Αν η φόρτωση είναι επιτυχής, ενημερώνει τις σχετικές μεταβλητές και 
         flags, μηδενίζει παλαιές προβλέψεις και το εκπαιδευμένο μοντέλο (αν υπάρχουν),
         ενημερώνει κατάλληλα το γραφικό περιβάλλον και τα κουμπιά δράσης και εμφανίζει
@@ -420,11 +755,14 @@ class CampaignPredictionApp:
         Σε περίπτωση αποτυχίας ή ακύρωση της φόρτωσης, καταγράφεται σχετικό μήνυμα
         στο αρχείο καταγραφής της εφαρμογής.
         
+        Args:
+            from_folder (bool): Φόρτωση όλων των αρχείων .xlsx ενός φακέλου.
+        
         Authors:
             Πιτσαρής Κωνσταντίνος
         """
         self._log("\n=== Φόρτωση Δεδομένων Προηγούμενης Καμπάνιας ===\n")
-        temp_data = self._load_data("Επιλέξτε αρχείο δεδομένων προηγούμενης καμπάνιας")
+        temp_data = self._load_history(from_folder)
         if temp_data is not None:
             # Ενημέρωση flags
             self.training_data_loaded = True
@@ -444,6 +782,9 @@ class CampaignPredictionApp:
                 "Τα δεδομένα της προηγούμενης καμπάνιας φορτώθηκαν επιτυχώς."
                 )
             self._log("Τα δεδομένα της προηγούμενης καμπάνιας φορτώθηκαν επιτυχώς.")
+            self._log(
+                f"    -{len(temp_data)} γραμμές από {temp_data[CAMPAIGN_COLUMN].nunique()} αρχεία καμπανιών"
+                )
             messagebox.showinfo("Επόμενο Βήμα","Προχωρήστε στην Εκπαίδευση Μοντέλου Πρόβλεψης.")
             messagebox.showwarning(
                 "Προειδοποίηση!",
@@ -475,6 +816,7 @@ class CampaignPredictionApp:
         self._log("\n=== Φόρτωση Δεδομένων Νέας Καμπάνιας ===\n")
         temp_data = self._load_data("Επιλέξτε αρχείο δεδομένων νέας καμπάνιας")
         if temp_data is not None:
+            self._cancel_prefetch() # Η χειροκίνητη φόρτωση αντικαθιστά την προετοιμασμένη καμπάνια
             # Ενημέρωση flags
             self.predictions_data_loaded = True
             self.predictions_made = False
@@ -496,22 +838,26 @@ class CampaignPredictionApp:
             self._log("Η φόρτωση των νέων δεδομένων απέτυχε ή ακυρώθηκε.")
             self._log("\n=================================================\n")
 
-    def _save_predictions(self, df_to_save: Optional[pd.DataFrame]) -> bool:
+    def _save_predictions(self, df_to_save: Optional[pd.DataFrame],
+                          on_success: Optional[Callable[[], None]] = None) -> bool:
         """
-        Αποθηκεύει το DataFrame πρόβλεψης σε αρχείο Excel μέσω διαλόγου αποθήκευσης.
+        Αποθηκεύει το DataFrame πρόβλεψης σε αρχείο μέσω διαλόγου αποθήκευσης.
         
-        Ελέγχει αν το DataFrame είναι κενό ή None, ανοίγει διάλογο για επιλογή
-        διαδρομής αρχείου Excel και γράφει τα δεδομένα. Σε περίπτωση σφάλματος
-        κατά την αποθήκευση, εμφανίζει μήνυμα και καταγράφει το σφάλμα στο 
-        αρχείο καταγραφής της εφαρμογής.
+        Ελέγχει αν το DataFrame είναι κενό ή None και ανοίγει διάλογο για επιλογή
+        διαδρομής αρχείου. Η μορφή του αρχείου (Excel, CSV ή Parquet) επιλέγεται
+        από την επέκταση. Η εγγραφή γίνεται στο παρασκήνιο, ώστε το γραφικό
+        περιβάλλον να μην 'παγώνει', και η πρόοδος καταγράφεται στο αρχείο
+        καταγραφής της εφαρμογής.
         
         Args:
             df_to_save (Optional[pd.DataFrame]): Το DataFrame με τις προβλέψεις
             προς αποθήκευση.
+            on_success (Optional[Callable[[], None]]): Καλείται όταν η εγγραφή
+            ολοκληρωθεί επιτυχώς.
             
         Returns:
             bool: 
-                - True: αν η αποθήκευση ολοκληρώθηκε επιτυχώς.
+                - True: αν ξεκίνησε η αποθήκευση.
                 - False: ακύρωση αποθήκευσης ή σφάλμα.
                 
         Authors:
@@ -522,40 +868,100 @@ class CampaignPredictionApp:
             return False
         save_path = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx")],
+            filetypes=[(name, f"*{ext}") for ext, name in SUPPORTED_FORMATS.items()],
             title="Αποθήκευση Προβλέψεων"
             )
         if not save_path:
             messagebox.showwarning("Ακύρωση", "Η αποθήκευση ακυρώθηκε.")
             self._log("Η αποθήκευση ακυρώθηκε.")
             return False
-        try:
-            df_to_save.to_excel(
-                save_path,
-                index=True # Κρατάμε τα index στα οποία αλλάξαμε το όνομα προηγουμένως
+        if Path(save_path).suffix.lower() not in SUPPORTED_FORMATS:
+            messagebox.showerror(
+                "Σφάλμα Αποθήκευσης!",
+                f"Μη υποστηριζόμενη μορφή αρχείου. Διαθέσιμες μορφές: {', '.join(SUPPORTED_FORMATS)}"
                 )
+            return False
+        self._start_export(df_to_save, save_path, on_success)
+        return True
+
+    def _start_export(self, df_to_save: pd.DataFrame, save_path: str,
+                      on_success: Optional[Callable[[], None]] = None) -> None:
+        """
+        Ξεκινά την εγγραφή του DataFrame σε νήμα παρασκηνίου.
+        
+        Το νήμα δεν αγγίζει το Tk: η πρόοδος καταγράφεται μέσω της '_log' και
+        το αποτέλεσμα μπαίνει σε ουρά, την οποία ελέγχει περιοδικά η
+        '_poll_export' στο κύριο νήμα.
+        
+        Args:
+            df_to_save (pd.DataFrame): Το DataFrame προς αποθήκευση.
+            save_path (str): Η διαδρομή του αρχείου.
+            on_success (Optional[Callable[[], None]]): Καλείται μετά από
+            επιτυχή εγγραφή.
+        """
+        events = queue.Queue()
+
+        def progress(done: int, total: int) -> None:
+            percent = 100 * done / total if total else 100
+            self._log(f"  Πρόοδος αποθήκευσης: {done}/{total} γραμμές ({percent:.0f}%)")
+
+        def worker() -> None:
+            try:
+                export_predictions(
+                    df_to_save,
+                    save_path,
+                    index=True, # Κρατάμε τα index στα οποία αλλάξαμε το όνομα προηγουμένως
+                    progress=progress
+                    )
+                events.put(("done", None))
+            except Exception as e:
+                events.put(("error", e))
+
+        self.btn_save.config(state='disabled')
+        self._log(f"Αποθήκευση προβλέψεων στο {save_path}...")
+        threading.Thread(target=worker, daemon=True).start()
+        self.master.after(100, self._poll_export, events, save_path, on_success)
+
+    def _poll_export(self, events: queue.Queue, save_path: str,
+                     on_success: Optional[Callable[[], None]]) -> None:
+        """
+        Ελέγχει αν η εγγραφή παρασκηνίου ολοκληρώθηκε και ενημερώνει τη διεπαφή.
+        
+        Args:
+            events (queue.Queue): Η ουρά με το αποτέλεσμα του νήματος εγγραφής.
+            save_path (str): Η διαδρομή του αρχείου.
+            on_success (Optional[Callable[[], None]]): Καλείται μετά από
+            επιτυχή εγγραφή.
+        """
+        try:
+            kind, error = events.get_nowait()
+        except queue.Empty:
+            self.master.after(100, self._poll_export, events, save_path, on_success)
+            return
+        if kind == "done":
             messagebox.showinfo(
                 "Επιτυχία",
                 f"Οι προβλέψεις αποθηκεύτηκαν με επιτυχία στο:\n{save_path}"
                 )
-            return True
-        except Exception as e:
+            self._update_button_states()
+            if on_success:
+                on_success()
+        else:
             messagebox.showerror(
                 "Σφάλμα Αποθήκευσης!",
-                f"Δεν ήταν δυνατή η αποθήκευση των προβλέψεων.\nΣφάλμα:{str(e)}"
+                f"Δεν ήταν δυνατή η αποθήκευση των προβλέψεων.\nΣφάλμα:{str(error)}"
                 )
-            self._log(f"Σφάλμα κατά την αποθήκευση στο {save_path}: {str(e)}")
-            return False
+            self._log(f"Σφάλμα κατά την αποθήκευση στο {save_path}: {str(error)}")
+            self._update_button_states()
 
     def save_predictions_wrapper(self) -> None:
         """
         Διαχειρίζεται τη ροή αποθήκευσης προβλέψεων και επαναφέριε την εφαρμογή
         σε αρχική κατάσταση.
         
-        Καλεί την εσωτερική μέθοδο αποθήκευσης αν υπάρχουν προβλέψεις και σε 
-        επιτυχία μηδενίζει όλα τα δεδομένα και flags, ενημερώνει καταλλήλως τα
-        κουμπιά και το αρχείο καταγραφής της εφαρμογής και ειδοποιεί τον χρήστη
-        ότι μπορεί να ξεκινήσει εκ νέου με νέες προβλέψεις.
+        Καλεί την εσωτερική μέθοδο αποθήκευσης αν υπάρχουν προβλέψεις και, όταν
+        η εγγραφή ολοκληρωθεί επιτυχώς, η '_reset_after_save' μηδενίζει όλα τα
+        δεδομένα και flags.
         Σε περίπτωση έλλεψιςη προβλέψεων, εμφανίζει προειδοποίηση.
         
         Authors:
@@ -563,30 +969,62 @@ class CampaignPredictionApp:
         """
         self._log("\n=== Aποθήκευση Προβλέψεων ===")
         if self.predictions_df is not None:
-            success = self._save_predictions(self.predictions_df)
-            if success:
-                # Επαναφορά όλων σε αρχική κατάσταση
-                self.past_campaign_data = None
-                self.new_campaign_data = None
-                self.knn_model = None
-                self.predictions_df = None
-
-                # Επαναφορά των flags
-                self.training_data_loaded = False
-                self.model_trained = False
-                self.predictions_data_loaded = False
-                self.predictions_made = False
-
-                # Ενημέρωση κουμπιών και log
-                self._update_button_states()
-                messagebox.showinfo('Επαναφορά', 'Μπορείτε να ξεκινήσετε ξανά από την αρχή.')
-                self._log("Επαναφορά εφαρμογής σε αρχική κατάσταση.")
-                self._log("\n===============ΤΕΛΟΣ ΠΡΟΓΡΑΜΜΑΤΟΣ===============")
-                self._log("\n=== Το πρόγραμμα επανήλθε στην αρχική κατάσταση. ===")
+            self._save_predictions(self.predictions_df, on_success=self._reset_after_save)
         else:
             messagebox.showwarning("Προσοχή!", "Δεν έχουν δημιουργηθεί προβλέψεις προς αποθήκευση.")
             self._log("Αποτυχία αποθήκευσης: Δεν υπάρχουν διαθέσιμες προβλέψεις.")
 
+    def _reset_after_save(self) -> None:
+        """
+        Επαναφέρει την εφαρμογή μετά από επιτυχή αποθήκευση.
+        
+        Σε λειτουργία συνεδρίας ('Διατήρηση μοντέλου μετά την αποθήκευση'),
+        τα ιστορικά δεδομένα και το εκπαιδευμένο μοντέλο (μαζί με το ευρετήριο
+        γειτόνων του) παραμένουν φορτωμένα και η εφαρμογή επιστρέφει στη
+        φόρτωση νέας καμπάνιας. Διαφορετικά, μηδενίζει όλα τα δεδομένα και
+        flags και ο χρήστης ξεκινά εκ νέου από την αρχή.
+        
+        Authors:
+            Πιτσαρής Κωνσταντίνος
+        """
+        if self.keep_model_var.get() and self.knn_model is not None:
+            # Επαναφορά μόνο των δεδομένων της καμπάνιας που ολοκληρώθηκε
+            self.new_campaign_data = None
+            self.predictions_df = None
+            self.prediction_table.set_data(None)
+            self.predictions_data_loaded = False
+            self.predictions_made = False
+
+            self._update_button_states()
+            self._log("Το εκπαιδευμένο μοντέλο παραμένει φορτωμένο.")
+            self._log(
+                "Επόμενο βήμα: Φορτώστε τα δεδομένα της επόμενης καμπάνιας "
+                "ή νέα ιστορικά δεδομένα για επανεκπαίδευση."
+                )
+            self._log("\n=================================================\n")
+            return
+
+        # Επαναφορά όλων σε αρχική κατάσταση
+        self.past_campaign_data = None
+        self.new_campaign_data = None
+        self.knn_model = None
+        self.predictions_df = None
+        self.prediction_table.set_data(None)
+        self._cancel_prefetch()
+
+        # Επαναφορά των flags
+        self.training_data_loaded = False
+        self.model_trained = False
+        self.predictions_data_loaded = False
+        self.predictions_made = False
+
+        # Ενημέρωση κουμπιών και log
+        self._update_button_states()
+        messagebox.showinfo('Επαναφορά', 'Μπορείτε να ξεκινήσετε ξανά από την αρχή.')
+        self._log("Επαναφορά εφαρμογής σε αρχική κατάσταση.")
+        self._log("\n===============ΤΕΛΟΣ ΠΡΟΓΡΑΜΜΑΤΟΣ===============")
+        self._log("\n=== Το πρόγραμμα επανήλθε στην αρχική κατάσταση. ===")
+
     def on_train(self) -> None:
         """
         Ξεκινά την αυτόματα εκπαίδευση του μοντέλου K-NN με βελτιστοποίηση του k.
@@ -607,19 +1045,77 @@ class CampaignPredictionApp:
             messagebox.showerror("Σφάλμα!", "Δεν έχουν φορτωθεί δεδομένα εκπαίδευσης.")
             self._log("Σφάλμα: Απαιτούνται δεδομένα εκπαίδευσης.")
             return
+        if self.segment_var.get() != NO_SEGMENT:
+            self._train_segmented(self.segment_var.get())
+            return
         try:
+            if self._time_budget() is not None and self.extended_search_var.get():
+                raise ValueError(
+                    "Το χρονικό όριο δεν συνδυάζεται με την εκτεταμένη αναζήτηση (στάθμιση/p), "
+                    "γιατί το πλάνο του ορίου καλύπτει μόνο το k. Αφαιρέστε το ένα από τα δύο."
+                    )
+            if self.search_settings is not None and (self._time_budget() is not None or self.extended_search_var.get()):
+                raise ValueError(
+                    "Η κατανεμημένη αναζήτηση K δεν συνδυάζεται με χρονικό όριο ή εκτεταμένη αναζήτηση. "
+                    "Απενεργοποιήστε την από το μενού Εργαλεία ή αφαιρέστε το χρονικό όριο/την εκτεταμένη αναζήτηση."
+                    )
             self._log("Aρχικοποίηση επεξεργαστή K-nn...")
-            self.knn_model = KNN(neighbors=None, test_size=0.2, random_state=42)
+            self.knn_model = KNN(
+                neighbors=None, test_size=0.2, random_state=42, index=self._index_type(), resources=self.resources,
+                prediction_cache=self.prediction_cache
+                )
+            # Η μετρική και ο κανόνας επιλογής του k από τα στοιχεία επαναεπιλογής
+            self.knn_model.metric = self.metric_var.get()
+            self.knn_model.selection_rule = self.rule_var.get()
             self._log("Τροφοδότηση δεδομένων εκπαίδευσης στο μοντέλο...")
             self.knn_model.feed_data(self.past_campaign_data)
+            if self.feature_selection_var.get():
+                self._log("Επιλογή χαρακτηριστικών (forward)...")
+                self.knn_model.select_features("forward")
+                for step in self.knn_model.feature_selection_results:
+                    self._log(f"    -Προσθήκη '{step['feature']}': {self.knn_model.metric} {step['score']:.4f}")
+                self._log(
+                    f"    -Επιλέχθηκαν {len(self.knn_model.selected_features)} από {self.knn_model.X.shape[1]} "
+                    f"χαρακτηριστικά: {', '.join(self.knn_model.selected_features)}"
+                    )
             self._log("Εύρεση βέλτιστου αριθμού γειτόνων (k)...")
             k_range = range(2, 16) # Μεγαλύτερο εύρος γειτόνων = αργότερη εκτέλεση
             fold_range = range(2, 8) # Μεγαλύτερο εύρος folds = αργότερη εκτέλεση
-            self.knn_model.find_best_neighbors(k_range=k_range, fold_range=fold_range)
+            budget = self._time_budget()
+            if budget is not None:
+                self._log(f"    -Χρονικό όριο αναζήτησης: {budget:g} s")
+                report = budgeted_search(self.knn_model, budget)
+                self._log(
+                    f"    -Πλάνο: folds {list(report['fold_range'])}, k {list(report['k_range'])}, "
+                    f"δείγμα {report['sample_fraction']:.0%} των δεδομένων εκπαίδευσης"
+                    )
+                if not report["within_budget"]:
+                    self._log("    -Προειδοποίηση: ούτε το φθηνότερο πλάνο χωράει στο χρονικό όριο.")
+                self._log(
+                    f"    -Χρόνος αναζήτησης: εκτίμηση {report['predicted_seconds']:.1f} s, "
+                    f"πραγματικός {report['actual_seconds']:.1f} s (δοκιμές κόστους {report['probe_seconds']:.1f} s)"
+                    )
+            elif self.extended_search_var.get():
+                self._log("    -Εκτεταμένη αναζήτηση: στάθμιση uniform/distance, p = 2 (Ευκλείδεια) / 1 (Manhattan)")
+                self.knn_model.find_best_neighbors(
+                    k_range=k_range, fold_range=fold_range, weights=("uniform", "distance"), p_values=(2, 1)
+                    )
+            elif self.search_settings is not None:
+                with DistributedSearch(**self.search_settings) as search:
+                    self._log(f"    -Κατανεμημένη αναζήτηση: συντονιστής στο {search.address[0]}:{search.address[1]}")
+                    self.knn_model.find_best_neighbors(k_range=k_range, fold_range=fold_range, executor=search)
+                if search.lost_workers:
+                    self._log(
+                        f"    -Χάθηκαν {search.lost_workers} workers· "
+                        f"{search.requeued_jobs} εργασίες εκτελέστηκαν ξανά από άλλους workers."
+                        )
+            else:
+                self.knn_model.find_best_neighbors(k_range=k_range, fold_range=fold_range)
             self.model_trained = True
             self._update_button_states()
             self._log("Ολοκληρώθηκε η διαδικασία εύρεσης βέλτιστου αριθμού γειτόνων (k)")
-            self._log(f"\n    -Βέλτιστος αριθμός γειτόνων (k):{self.knn_model.best_n_neighbors}\n")
+            self._log(f"\n    -Βέλτιστος αριθμός γειτόνων (k):{self.knn_model.best_n_neighbors}")
+            self._log(f"    -Στάθμιση: {self.knn_model.best_weights}, p: {self.knn_model.best_p}\n")
             self._log("Εκπαίδευση τελικού μοντέλου με τα πλήρη δεδομένα εκπαίδευσης...")
             self.knn_model.fit()
             self._log(
@@ -640,6 +1136,9 @@ class CampaignPredictionApp:
             self._log("\n=================================================\n")
             # Ακύρωση τυχόν προηγούμενων προβλέψεων τώρα που το μοντέλο επανεκπαιδεύτηκε
             self.predictions_df = None
+            if self.prefetch_future is not None:
+                self._run_queued_campaign()
+                return
             messagebox.showinfo(
                 "Επόμενο Βήμα", "Προχωρήστε στη φόρτωση των δεδομένων νέας καμπάνιας."
                 )
@@ -665,6 +1164,113 @@ class CampaignPredictionApp:
             self.training_data_loaded = True
             self._update_button_states()
 
+    def _train_segmented(self, segment_column: str) -> None:
+        """
+        Εκπαιδεύει ένα μοντέλο K-NN ανά τιμή της στήλης τμηματοποίησης, με
+        αυτόματη εύρεση του k για κάθε τμήμα σε παράλληλες διεργασίες.
+        
+        Args:
+            segment_column (str): Η στήλη τμηματοποίησης ('Φύλο' ή 'Περιοχή').
+        """
+        try:
+            # Οι ρυθμίσεις που δεν υποστηρίζονται από τα μοντέλα ανά τμήμα απορρίπτονται αντί να αγνοηθούν
+            unsupported = [
+                name for name, active in (
+                    ("προσεγγιστικό ευρετήριο", self.approximate_index_var.get()),
+                    ("χρονικό όριο", self._time_budget() is not None),
+                    ("επιλογή χαρακτηριστικών", self.feature_selection_var.get()),
+                    ("εκτεταμένη αναζήτηση", self.extended_search_var.get()),
+                    ("κατανεμημένη αναζήτηση", self.search_settings is not None),
+                    ) if active
+                ]
+            if unsupported:
+                raise ValueError(
+                    f"Η τμηματοποίηση δεν συνδυάζεται με: {', '.join(unsupported)}. "
+                    f"Απενεργοποιήστε τις ρυθμίσεις αυτές ή επιλέξτε τμηματοποίηση '{NO_SEGMENT}'."
+                    )
+            self._log(f"Εκπαίδευση ενός μοντέλου K-nn ανά '{segment_column}' (παράλληλα)...")
+            self._log("    -Οι προβλέψεις των μοντέλων ανά τμήμα δεν χρησιμοποιούν την cache προβλέψεων.")
+            self.knn_model = SegmentedKNN(segment_column, test_size=0.2, random_state=42, resources=self.resources)
+            self.knn_model.fit(self.past_campaign_data, k_range=range(2, 16), fold_range=range(2, 8))
+            self.model_trained = True
+            self.predictions_df = None
+            self._update_button_states()
+            self._log(self.knn_model.validation_metrics_str)
+            self._log("\n=================================================\n")
+            messagebox.showinfo(
+                "Εκπαίδευση Ολοκληρώθηκε!",
+                f"Εκπαιδεύτηκαν {len(self.knn_model.segments)} μοντέλα (ανά '{segment_column}' και ένα γενικό)."
+                )
+            if self.prefetch_future is not None:
+                self._run_queued_campaign()
+                return
+            self._log("Επόμενο βήμα: Προχωρήστε στη φόρτωση των δεδομένων νέας καμπάνιας.")
+        except Exception as e:
+            messagebox.showerror("Σφάλμα Εκπαίδευσης!", f"Σφάλμα κατά την εκπαίδευση:\n{str(e)}")
+            self._log(f"Σφάλμα κατά την εκπαίδευση των μοντέλων ανά τμήμα: {str(e)}")
+            self.knn_model = None
+            self.model_trained = False
+            self.training_data_loaded = True
+            self._update_button_states()
+
+    def _time_budget(self) -> Optional[float]:
+        """
+        Το χρονικό όριο της αυτόματης εκπαίδευσης σε δευτερόλεπτα (None αν το πεδίο είναι κενό).
+
+        Raises:
+            ValueError: Αν η τιμή δεν είναι θετικός αριθμός.
+        """
+        text = self.time_budget_var.get().strip()
+        if not text:
+            return None
+        try:
+            budget = float(text.replace(",", "."))
+        except ValueError:
+            budget = 0.0
+        if budget <= 0:
+            raise ValueError(f"Μη έγκυρο χρονικό όριο '{text}': δώστε θετικό αριθμό δευτερολέπτων.")
+        return budget
+
+    def _index_type(self) -> str:
+        """
+        Επιστρέφει το ευρετήριο γειτόνων που έχει επιλέξει ο χρήστης για το
+        τελικό μοντέλο ('rpforest' ή 'exact').
+        """
+        return "rpforest" if self.approximate_index_var.get() else "exact"
+
+    def reselect_neighbors(self) -> None:
+        """
+        Επαναεπιλέγει τον αριθμό γειτόνων (k) με την επιλεγμένη μετρική και
+        κανόνα, από τα αποθηκευμένα αποτελέσματα της αυτόματης εκπαίδευσης.
+        
+        Το τελικό μοντέλο επανεκπαιδεύεται με το νέο k (χωρίς νέα αναζήτηση),
+        οι μετρικές και τα γραφήματα επικύρωσης ανανεώνονται και τυχόν
+        προηγούμενες προβλέψεις ακυρώνονται.
+        """
+        self._log("\n=== Επαναεπιλογή Αριθμού Γειτόνων ===\n")
+        if self.knn_model is None or self.knn_model.cv_results_table is None:
+            messagebox.showerror(
+                "Σφάλμα!", "Δεν υπάρχουν αποτελέσματα αυτόματης εκπαίδευσης."
+                )
+            return
+        metric, rule = self.metric_var.get(), self.rule_var.get()
+        try:
+            previous_k = self.knn_model.best_n_neighbors
+            k = self.knn_model.select_best_neighbors(metric=metric, rule=rule)
+            self._log(f"Μετρική: {metric}, κανόνας επιλογής: {rule}")
+            self._log(f"    -Αριθμός γειτόνων (k): {previous_k} -> {k}")
+            self.knn_model.fit()
+            self.knn_model.gen_metrics()
+            self._log(self.knn_model.validation_metrics_str)
+            # Ακύρωση τυχόν προηγούμενων προβλέψεων τώρα που άλλαξε το μοντέλο
+            self.predictions_df = None
+            self.predictions_made = False
+            self._update_button_states()
+            messagebox.showinfo("Επαναεπιλογή Ολοκληρώθηκε!", f"Νέο k = {k}")
+        except ValueError as ve:
+            messagebox.showerror("Σφάλμα!", f"Σφάλμα κατά την επαναεπιλογή:\n{str(ve)}")
+            self._log(f"Σφάλμα (ValueError) κατά την επαναεπιλογή: {str(ve)}")
+
     def manual_train(self) -> None:
         """
         Εκτελεί χειροκίνητη εκπαίδευση του μοντέλου K-NN με τιμή k που εισάγει
@@ -705,7 +1311,10 @@ class CampaignPredictionApp:
                 return
 
             self._log(f"Εκπαίδευση μοντέλου με K = {k} γείτονες...")
-            self.knn_model = KNN(neighbors=k, test_size=0.2, random_state=42)
+            self.knn_model = KNN(
+                neighbors=k, test_size=0.2, random_state=42, index=self._index_type(), resources=self.resources,
+                prediction_cache=self.prediction_cache
+                )
             self.knn_model.feed_data(self.past_campaign_data)
             self.knn_model.fit()
 
@@ -724,6 +1333,9 @@ class CampaignPredictionApp:
             messagebox.showinfo(
                 "Εκπαίδευση Ολοκληρώθηκε!", f"To μοντέλο εκπαιδεύτηκε επιτυχώς με k = {k}"
                 )
+            if self.prefetch_future is not None:
+                self._run_queued_campaign()
+                return
             self._log("Επόμενο βήμα: Προχωρήστε στη φόρτωση των δεδομένων νέας καμπάνιας.\n")
 
         except ValueError as ve:
@@ -739,7 +1351,7 @@ class CampaignPredictionApp:
             self.model_trained = False
             self._update_button_states()
 
-    def on_predict(self) -> None:
+    def on_predict(self, prompt_save: bool = True) -> None:
         """
         Εκκινεί τη διαδικασία πρόβλεψης ανταπόκρισης για τη νέα καμπάνια.
         
@@ -748,7 +1360,12 @@ class CampaignPredictionApp:
         προβλέψει την ανταπόκριση, ενημερώνει τα εσωτερικά flags και τα κουμπιά, 
         εμφανίζει στο χρήστη μηνύματα επιτυχίας και τα μετρικά ελέγχου και 
         αποτυπώνει όλα τα στατιστικά στο αρχείο καταγραφής. Τέλος, δείχνει
-        διάγραμμα πίτας με την κατανομή των απαντήσεων ανά φύλο.
+        διαγράμματα πίτας με την κατανομή των απαντήσεων για την επιλεγμένη
+        ανάλυση (π.χ. ανά φύλο).
+        
+        Args:
+            prompt_save (bool): Αν θα ζητηθεί από τον χρήστη να αποθηκεύσει τα
+            αποτελέσματα (όχι όταν η αποθήκευση έχει ήδη προγραμματιστεί).
         
         Authors:
             Πιτσαρής Κωνσταντίνος
@@ -771,6 +1388,14 @@ class CampaignPredictionApp:
             self._log("Χρήση του εκπαιδευμένου μοντέλου για πρόβλεψη...")
             # Κλήση της μεθόδου predict απο το knn_model
             self.predictions_df = self.knn_model.predict(self.new_campaign_data, output_path=None)
+            cache_stats = getattr(self.knn_model, "cache_stats", None)
+            if cache_stats:
+                total = cache_stats["hits"] + cache_stats["misses"]
+                self._log(
+                    f"    -Cache προβλέψεων: {cache_stats['hits']}/{total} πελάτες από την cache "
+                    f"({cache_stats['hits'] / max(total, 1):.0%}), {cache_stats['misses']} νέοι υπολογισμοί"
+                    )
+            self.prediction_table.set_data(self.predictions_df)
             self.predictions_made = True
             self._update_button_states()
             messagebox.showinfo(
@@ -780,10 +1405,12 @@ class CampaignPredictionApp:
             self._log("Η πρόβλεψη ολοκληρώθηκε")
             self._log("\n=================================================\n")
             # Προτροπή χρήστη για αποθήκευση των αποτελεσμάτων πρόβλεψης
-            messagebox.showinfo("Ειδοποίηση", "Παρακαλώ αποθηκεύστε τα αποτελέσματα της πρόβλεψης.")
-            # Εμφάνιση γραφήματος πίτας ανταπόκρισης (gender / yes-no)
-            self.responses_by_gender_pie()
-            self._log("\nΠαρακαλώ αποθηκεύστε τα αποτελέσματα της πρόβλεψης.")
+            if prompt_save:
+                messagebox.showinfo("Ειδοποίηση", "Παρακαλώ αποθηκεύστε τα αποτελέσματα της πρόβλεψης.")
+            # Εμφάνιση γραφημάτων πίτας ανταπόκρισης για την επιλεγμένη ανάλυση
+            self.plot_segment_breakdown()
+            if prompt_save:
+                self._log("\nΠαρακαλώ αποθηκεύστε τα αποτελέσματα της πρόβλεψης.")
         except ValueError as ve: # Ανεπαρκή ή λάθος μορφή δεδομένων
             messagebox.showerror(
                 "Σφάλμα Πρόβλεψης!", f"Προέκυψε σφάλμα τιμής κατά την πρόβλεψη:\n{str(ve)}"
@@ -799,50 +1426,421 @@ class CampaignPredictionApp:
             self.predictions_df = None # Ακύρωση προβλέψεων
             self._update_button_states()
 
-    def responses_by_gender_pie(self) -> None:
+    def queue_new_campaign(self) -> None:
         """
-        Δημιουργεί και εμφανίζει ένα διάγραμμα πίτας που απεικονίζει τις απαντήσεις
-        χωριστά άνα φύλο.
+        Προετοιμάζει τη νέα καμπάνια πριν ή κατά την εκπαίδευση.
         
-        Η μέθοδος βασίζεται στα δεδομένα προβλέψεων. Εάν δεν υπάρχουν δεδομένα
-        προβλέψεων ('self.predictions_df' είναι None), εμφανίζει μήνυμα λάθους
-        και καταγράφει σχετικό μήνυμα στο αρχείο καταγραφής.
+        Ο χρήστης επιλέγει το αρχείο της νέας καμπάνιας και, προαιρετικά, το
+        αρχείο εξόδου. Η επικύρωση και η ανάγνωση του αρχείου ξεκινούν αμέσως
+        σε διεργασία παρασκηνίου, παράλληλα με την εκπαίδευση. Μόλις η
+        εκπαίδευση ολοκληρωθεί, η πρόβλεψη εκτελείται αμέσως στα ήδη
+        φορτωμένα δεδομένα και, αν δόθηκε αρχείο εξόδου, τα αποτελέσματα
+        αποθηκεύονται αυτόματα.
+        """
+        file_path = filedialog.askopenfilename(
+            title="Επιλέξτε αρχείο δεδομένων νέας καμπάνιας",
+            filetypes=[("Excel files", "*.xlsx")]
+            )
+        if not file_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[(name, f"*{ext}") for ext, name in SUPPORTED_FORMATS.items()],
+            title="Αρχείο Εξόδου Προβλέψεων (Άκυρο: χωρίς αυτόματη αποθήκευση)"
+            )
+        if output_path and Path(output_path).suffix.lower() not in SUPPORTED_FORMATS:
+            messagebox.showerror(
+                "Σφάλμα!",
+                f"Μη υποστηριζόμενη μορφή αρχείου. Διαθέσιμες μορφές: {', '.join(SUPPORTED_FORMATS)}"
+                )
+            return
+        if self.prefetch_executor is None:
+            # Διεργασία (όχι νήμα): η ανάγνωση του Excel δεν ανταγωνίζεται την εκπαίδευση για το GIL
+            self.prefetch_executor = ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"))
+        self.prefetch_path = file_path
+        self.prefetch_output_path = output_path or None
+        self.prefetch_future = self.prefetch_executor.submit(load_campaign_file, file_path)
+        self._log(f"Η νέα καμπάνια ({Path(file_path).name}) φορτώνεται στο παρασκήνιο.")
+        if self.prefetch_output_path:
+            self._log(f"Οι προβλέψεις θα αποθηκευτούν αυτόματα στο {self.prefetch_output_path}.")
+        self._update_button_states()
+        if self.model_trained and not self.predictions_data_loaded:
+            self._run_queued_campaign() # Το μοντέλο είναι ήδη έτοιμο
+
+    def _cancel_prefetch(self) -> None:
+        """
+        Ακυρώνει την προετοιμασμένη νέα καμπάνια (αν υπάρχει).
+        """
+        if self.prefetch_future is not None:
+            self.prefetch_future.cancel()
+        self.prefetch_future = None
+        self.prefetch_path = None
+        self.prefetch_output_path = None
+
+    def _run_queued_campaign(self) -> None:
+        """
+        Εκτελεί την πρόβλεψη για την προετοιμασμένη καμπάνια μόλις ολοκληρωθεί
+        η ανάγνωσή της.
         
-        Η μέθοδος μετατρέπει τα ονόματα στηλών σε μικρά γράμματα χωρίς κενά και
-        μετονομάζει τις στήλες 'Φύλο' και 'Ανταπόκριση' σε 'gender' και 'response'
-        αντίστοιχα, ώστε να υπολογίσει το ποσοστό των 'yes' απαντήσεων ανά φύλο.
+        Αν η ανάγνωση δεν έχει ολοκληρωθεί, η μέθοδος ελέγχει ξανά μέσω 'after'
+        χωρίς να 'παγώνει' το γραφικό περιβάλλον.
+        """
+        future: Optional[Future] = self.prefetch_future
+        if future is None:
+            return
+        if not future.done():
+            self.master.after(100, self._run_queued_campaign)
+            return
+        file_path, output_path = self.prefetch_path, self.prefetch_output_path
+        self._cancel_prefetch()
+        try:
+            new_data = future.result()
+        except SchemaError as se:
+            messagebox.showerror('Σφάλμα Μορφής Αρχείου', str(se))
+            self._log(f"Η φόρτωση της νέας καμπάνιας ({file_path}) απέτυχε: {str(se)}")
+            self._update_button_states()
+            return
+        except Exception as e:
+            messagebox.showerror(
+                "Σφάλμα!", f"Σφάλμα κατά τη φόρτωση του αρχείου Excel: {file_path}\n{str(e)}"
+                )
+            self._log(f"Η φόρτωση της νέας καμπάνιας ({file_path}) απέτυχε: {str(e)}")
+            self._update_button_states()
+            return
+        self._log(f"Τα δεδομένα της νέας καμπάνιας ({len(new_data)} πελάτες) είναι έτοιμα.")
+        self.new_campaign_data = new_data
+        self.predictions_data_loaded = True
+        self.predictions_made = False
+        self.predictions_df = None
+        self.on_predict(prompt_save=output_path is None)
+        if output_path and self.predictions_made:
+            self._start_export(self.predictions_df, output_path, on_success=self._reset_after_save)
+
+    def export_target_list(self) -> None:
+        """
+        Δημιουργεί και αποθηκεύει τη λίστα στόχευσης της νέας καμπάνιας.
         
-        Στη συνέχεια σχεδιάζει δύο διαγράμματα πίτας (ένα για κάθε φύλο) με
-        διαφορετικά χρώματα και τίτλους.
+        Ζητάει από τον χρήστη τον αριθμό των πελατών που χωράνε στον
+        προϋπολογισμό (N), κατατάσσει τους νέους πελάτες με βάση το ποσοστό
+        των γειτόνων τους με θετική ανταπόκριση και αποθηκεύει τους N πρώτους.
+        Η ροή της εφαρμογής δεν επηρεάζεται.
+        """
+        self._log("\n=== Λίστα Στόχευσης ===\n")
+        if self.knn_model is None or self.new_campaign_data is None:
+            messagebox.showerror(
+                "Σφάλμα!",
+                "Απαιτούνται εκπαιδευμένο μοντέλο και δεδομένα νέας καμπάνιας."
+                )
+            return
+        n_customers = len(self.new_campaign_data)
+        top_n = simpledialog.askinteger(
+            "Λίστα Στόχευσης",
+            f"Πόσους πελάτες (από {n_customers}) μπορεί να προσεγγίσει η καμπάνια;",
+            minvalue=1,
+            maxvalue=n_customers
+            )
+        if top_n is None:
+            self._log("Η δημιουργία λίστας στόχευσης ακυρώθηκε από τον χρήστη.")
+            return
+        try:
+            ranked_df = self.knn_model.rank_customers(self.new_campaign_data, top_n=top_n)
+        except ValueError as ve:
+            messagebox.showerror("Σφάλμα!", f"Σφάλμα κατά την κατάταξη:\n{str(ve)}")
+            self._log(f"Σφάλμα (ValueError) κατά την κατάταξη: {str(ve)}")
+            return
+        self._log(
+            f"Επιλέχθηκαν οι {len(ranked_df)} πελάτες με το μεγαλύτερο σκορ ανταπόκρισης "
+            f"(ελάχιστο σκορ: {ranked_df.iloc[-1][SCORE_COLUMN]:.2f})."
+            )
+        self._save_predictions(ranked_df)
+
+    def configure_resources(self) -> None:
+        """
+        Ρυθμίζει τους υπολογιστικούς πόρους (διεργασίες, νήματα ανά διεργασία
+        και όριο μνήμης) της αναζήτησης, της εκπαίδευσης και της πρόβλεψης.
         
-        Authors:
-            Κρανίτσα Αντωνία
+        Αν έχουν φορτωθεί ιστορικά δεδομένα, προτείνεται μέτρηση όλων των
+        συνδυασμών διεργασιών/νημάτων στο τρέχον μηχάνημα και επιλογή του
+        γρηγορότερου. Διαφορετικά οι τιμές δίνονται χειροκίνητα. Η ρύθμιση
+        εφαρμόζεται και στο τρέχον μοντέλο.
+        """
+        self._log("\n=== Ρύθμιση Πόρων ===\n")
+        if self.past_campaign_data is not None and messagebox.askyesno(
+            "Ρύθμιση Πόρων",
+            "Να μετρηθούν οι συνδυασμοί διεργασιών και νημάτων με τα ιστορικά δεδομένα;\n"
+            "Η μέτρηση εκπαιδεύει ένα μοντέλο για κάθε συνδυασμό."
+            ):
+            self._log("Μέτρηση των συνδυασμών διεργασιών/νημάτων...")
+            try:
+                table = benchmark_resources(
+                    self.past_campaign_data, configs=candidate_configs(self.resources.working_memory)
+                    )
+            except ValueError as ve:
+                messagebox.showerror("Σφάλμα!", f"Σφάλμα κατά τη μέτρηση:\n{str(ve)}")
+                self._log(f"Σφάλμα (ValueError) κατά τη μέτρηση: {str(ve)}")
+                return
+            self._log(table.to_string(index=False, float_format=lambda seconds: f"{seconds:.3f}"))
+            self.resources = ResourceConfig.from_row(table.iloc[0])
+        else:
+            n_jobs = simpledialog.askinteger(
+                "Ρύθμιση Πόρων",
+                "Διεργασίες της αναζήτησης του K (-1 για όλους τους πυρήνες):",
+                initialvalue=self.resources.n_jobs,
+                minvalue=-1
+                )
+            if n_jobs is None:
+                return
+            threads = simpledialog.askinteger(
+                "Ρύθμιση Πόρων",
+                "Νήματα ανά διεργασία (0 για αυτόματη κατανομή των πυρήνων):",
+                initialvalue=self.resources.threads or 0,
+                minvalue=0
+                )
+            if threads is None:
+                return
+            working_memory = simpledialog.askinteger(
+                "Ρύθμιση Πόρων",
+                "Όριο μνήμης υπολογισμού αποστάσεων σε MiB (0 για την προεπιλογή):",
+                initialvalue=self.resources.working_memory or 0,
+                minvalue=0
+                )
+            if working_memory is None:
+                return
+            try:
+                self.resources = ResourceConfig(n_jobs, threads or None, working_memory or None)
+            except ValueError as ve:
+                messagebox.showerror("Σφάλμα!", str(ve))
+                self._log(f"Σφάλμα (ValueError) στη ρύθμιση πόρων: {str(ve)}")
+                return
+        if self.knn_model is not None and hasattr(self.knn_model, "resources"):
+            self.knn_model.resources = self.resources
+        memory = f"{self.resources.working_memory} MiB" if self.resources.working_memory else "προεπιλογή"
+        self._log(
+            f"Πόροι: {self.resources.n_jobs} διεργασίες, {self.resources.effective_threads()} νήματα ανά διεργασία, "
+            f"όριο μνήμης: {memory}"
+            )
+
+    def configure_distributed_search(self) -> None:
+        """
+        Ρυθμίζει την κατανεμημένη αναζήτηση του K (βλ. distributed.py).
+
+        Η αναζήτηση μοιράζεται σε τοπικούς workers και, αν δοθεί διεύθυνση,
+        σε απομακρυσμένους workers που συνδέονται σε αυτήν με το ίδιο κλειδί.
+        Με 0 τοπικούς workers και χωρίς διεύθυνση η αναζήτηση γίνεται τοπικά
+        (grid search).
+        """
+        settings = self.search_settings or {}
+        n_workers = simpledialog.askinteger(
+            "Κατανεμημένη Αναζήτηση K",
+            "Τοπικοί workers (0 για κανέναν):",
+            initialvalue=settings.get("n_workers", 0),
+            minvalue=0
+            )
+        if n_workers is None:
+            return
+        address = simpledialog.askstring(
+            "Κατανεμημένη Αναζήτηση K",
+            "Διεύθυνση host:port για απομακρυσμένους workers (κενό για μόνο τοπικούς):",
+            initialvalue=""
+            )
+        if address is None:
+            return
+        if not n_workers and not address.strip():
+            self.search_settings = None
+            self._log("Κατανεμημένη αναζήτηση K: απενεργοποιήθηκε.")
+            return
+        listen = ("127.0.0.1", 0)
+        authkey = None
+        if address.strip():
+            host, _, port = address.strip().rpartition(":")
+            if not host or not port.isdigit():
+                messagebox.showerror("Σφάλμα!", f"Μη έγκυρη διεύθυνση '{address}' (αναμενόταν host:port).")
+                return
+            listen = (host, int(port))
+            key = simpledialog.askstring(
+                "Κατανεμημένη Αναζήτηση K", "Κλειδί πιστοποίησης των workers:", show="*"
+                )
+            if not key:
+                return
+            authkey = key.encode()
+        self.search_settings = {"n_workers": n_workers, "address": listen, "authkey": authkey}
+        self._log(
+            f"Κατανεμημένη αναζήτηση K: {n_workers} τοπικοί workers"
+            + (f", απομακρυσμένοι workers στο {listen[0]}:{listen[1]}" if authkey else "")
+            )
+
+    def _neighbor_cache(self):
+        """
+        Οι γείτονες κάθε νέου πελάτη (βλ. NeighborCache), με μία αναζήτηση την
+        πρώτη φορά που ζητούνται για τα τρέχοντα δεδομένα και μοντέλο.
+        """
+        cache = self.knn_model.neighbor_cache
+        if cache is None or cache.index is not self.new_campaign_data.index:
+            max_k = max(WHAT_IF_MAX_K, self.knn_model.best_n_neighbors)
+            self._log(f"Υπολογισμός των {max_k} πλησιέστερων γειτόνων κάθε νέου πελάτη...")
+            cache = self.knn_model.cache_neighbors(self.new_campaign_data, max_k)
+            self.knn_model.neighbor_cache = cache
+        return cache
+
+    def what_if_neighbors(self) -> None:
+        """
+        Δείχνει πώς θα άλλαζαν οι προβλέψεις με διαφορετικό αριθμό γειτόνων (K).
+        
+        Οι γείτονες κάθε νέου πελάτη υπολογίζονται μία φορά για έως
+        WHAT_IF_MAX_K γείτονες, οπότε κάθε νέο K αξιολογείται σε χιλιοστά του
+        δευτερολέπτου. Ο χρήστης μπορεί στη συνέχεια να εφαρμόσει το K στο
+        μοντέλο και στις προβλέψεις.
+        """
+        self._log("\n=== Πρόβλεψη με Άλλο K ===\n")
+        if not isinstance(self.knn_model, KNN) or self.predictions_df is None:
+            messagebox.showerror("Σφάλμα!", "Απαιτούνται προβλέψεις από γενικό (μη τμηματοποιημένο) μοντέλο.")
+            return
+        try:
+            cache = self._neighbor_cache()
+        except ValueError as ve:
+            messagebox.showerror("Σφάλμα!", f"Σφάλμα κατά την αναζήτηση γειτόνων:\n{str(ve)}")
+            self._log(f"Σφάλμα (ValueError) κατά την αναζήτηση γειτόνων: {str(ve)}")
+            return
+        current_k = self.knn_model.best_n_neighbors
+        k = simpledialog.askinteger(
+            "Πρόβλεψη με Άλλο K",
+            f"Αριθμός γειτόνων (1-{cache.max_k}, τρέχων: {current_k}):",
+            initialvalue=current_k,
+            minvalue=1,
+            maxvalue=cache.max_k
+            )
+        if k is None:
+            return
+        start = time.perf_counter()
+        labels = cache.predict(k, self.knn_model.best_weights)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        current_labels = self.predictions_df[self.knn_model.response_column].to_numpy()
+        changed = int((labels != current_labels).sum())
+        self._log(
+            f"Με k = {k}: αλλάζει η πρόβλεψη για {changed} από {len(labels)} πελάτες. "
+            f"Θετική ανταπόκριση: {(labels == POSITIVE_LABEL).mean():.1%} "
+            f"(με k = {current_k}: {(current_labels == POSITIVE_LABEL).mean():.1%}). "
+            f"Υπολογισμός σε {elapsed_ms:.0f} ms."
+            )
+        if k == current_k or not messagebox.askyesno(
+            "Πρόβλεψη με Άλλο K",
+            f"Με k = {k} αλλάζει η πρόβλεψη για {changed} πελάτες.\n"
+            f"Να εφαρμοστεί το k = {k} στο μοντέλο και στις προβλέψεις;"
+            ):
+            return
+        self.knn_model.best_n_neighbors = k
+        self.knn_model.fit()
+        self.knn_model.neighbor_cache = cache  # Οι γείτονες δεν αλλάζουν με το K
+        self.knn_model.gen_metrics()
+        self._log(f"Το μοντέλο επανεκπαιδεύτηκε με k = {k}.")
+        self._log(self.knn_model.validation_metrics_str)
+        self.predictions_df = self.new_campaign_data.copy()
+        self.predictions_df[self.knn_model.response_column] = labels
+        self.knn_model.segment_counts = segment_counts(self.new_campaign_data, labels, cache.classes)
+        self.prediction_table.set_data(self.predictions_df)
+        self.plot_segment_breakdown()
+
+    def show_nearest_customers(self, event: Optional[tk.Event] = None) -> None:
         """
-        if self.predictions_df is None:
+        Εμφανίζει τους πλησιέστερους ιστορικούς πελάτες (απόσταση και
+        ανταπόκριση) του πελάτη που επιλέχθηκε στον πίνακα προβλέψεων.
+        
+        Args:
+            event (Optional[tk.Event], optional): Το διπλό κλικ στον πίνακα.
+                Προεπιλεγμένη τιμή είναι None.
+        """
+        position = self.prediction_table.selected_position()
+        if position is None or not isinstance(self.knn_model, KNN) or self.predictions_df is None:
+            return
+        try:
+            nearest = self._neighbor_cache().nearest(position, self.knn_model.best_n_neighbors)
+        except ValueError as ve:
+            self._log(f"Σφάλμα (ValueError) κατά την αναζήτηση γειτόνων: {str(ve)}")
+            return
+        customer = self.predictions_df.index[position]
+        text = nearest.to_string(float_format=lambda distance: f"{distance:.3f}")
+        self._log(f"Οι {len(nearest)} πλησιέστεροι ιστορικοί πελάτες του '{customer}':\n{text}")
+        messagebox.showinfo(f"Πλησιέστεροι Πελάτες: {customer}", text)
+
+    def add_campaign_outcomes(self) -> None:
+        """
+        Προσθέτει τα πραγματικά αποτελέσματα μιας καμπάνιας που ολοκληρώθηκε
+        στο εκπαιδευμένο μοντέλο, χωρίς νέα αναζήτηση του k.
+        
+        Το αρχείο πρέπει να έχει συμπληρωμένη τη στήλη 'Ανταπόκριση'. Οι νέες
+        παρατηρήσεις προστίθενται στο σύνολο αναφοράς του μοντέλου και το k
+        επανελέγχεται μόνο γύρω από την τρέχουσα τιμή. Αν τα νέα δεδομένα
+        διαφέρουν σημαντικά από τα ιστορικά, γίνεται πλήρης επανεκπαίδευση.
+        """
+        self._log("\n=== Προσθήκη Αποτελεσμάτων Καμπάνιας ===\n")
+        if self.knn_model is None:
+            messagebox.showerror("Σφάλμα!", "Δεν υπάρχει εκπαιδευμένο μοντέλο πρόβλεψης.")
+            return
+        outcomes = self._load_data("Επιλέξτε αρχείο με τα αποτελέσματα της καμπάνιας")
+        if outcomes is None:
+            self._log("Η φόρτωση των αποτελεσμάτων απέτυχε ή ακυρώθηκε.")
+            return
+        try:
+            previous_k = self.knn_model.best_n_neighbors
+            full_refit = self.knn_model.add_observations(outcomes, recheck_neighbors=True)
+        except ValueError as ve:
+            messagebox.showerror("Σφάλμα!", f"Σφάλμα κατά την προσθήκη αποτελεσμάτων:\n{str(ve)}")
+            self._log(f"Σφάλμα (ValueError) κατά την προσθήκη αποτελεσμάτων: {str(ve)}")
+            return
+        if self.past_campaign_data is not None:
+            # Με τις ετικέτες που έδωσε το μοντέλο στις νέες γραμμές (μοναδικές, βλ. add_observations())
+            outcomes = outcomes.set_axis(self.knn_model.X.index[-len(outcomes):])
+            self.past_campaign_data = pd.concat([self.past_campaign_data, outcomes])
+        self._log(f"Προστέθηκαν {len(outcomes)} παρατηρήσεις στο μοντέλο.")
+        if full_refit:
+            self._log("Τα νέα δεδομένα διαφέρουν σημαντικά από τα ιστορικά: έγινε πλήρης επανεκπαίδευση.")
+        self._log(f"    -Αριθμός γειτόνων (k): {previous_k} -> {self.knn_model.best_n_neighbors}")
+        # Ακύρωση τυχόν προηγούμενων προβλέψεων τώρα που άλλαξε το μοντέλο
+        self.predictions_df = None
+        self.predictions_made = False
+        self._update_button_states()
+        messagebox.showinfo(
+            "Επιτυχία!", f"Προστέθηκαν {len(outcomes)} παρατηρήσεις στο μοντέλο."
+            )
+
+    def plot_segment_breakdown(self) -> None:
+        """
+        Δημιουργεί και εμφανίζει ένα διάγραμμα πίτας με τις απαντήσεις για
+        κάθε τιμή της επιλεγμένης ανάλυσης (φύλο, περιοχή, ηλικιακή ομάδα κ.λπ.).
+        
+        Τα πλήθη υπολογίζονται από το μοντέλο κατά την πρόβλεψη
+        ('segment_counts'), οπότε η αλλαγή ανάλυσης δεν επεξεργάζεται ξανά τα
+        δεδομένα. Δημιουργείται ένα διάγραμμα ανά τιμή με μη μηδενικό πλήθος,
+        για οποιονδήποτε αριθμό τιμών.
+        """
+        counts = getattr(self.knn_model, "segment_counts", None)
+        if self.predictions_df is None or not counts:
             self._log('Δεν υπάρχουν στοιχεία πρόβλεψης για δημιουργία γραφήματος.')
             messagebox.showerror(
                 'Σφάλμα', 'Δεν υπάρχουν στοιχεία πρόβλεψης για δημιουργία γραφήματος.'
                 )
             return
-        df = self.predictions_df.copy()
-        # Μετατροπή ονομάτων στηλών
-        df.columns = [col.strip().lower().replace(' ', '') for col in df.columns]
-        df.rename(columns={'φύλο': 'gender', 'ανταπόκριση': 'response'}, inplace=True)
-        grouped = df.groupby('gender')['response'].value_counts().unstack().fillna(0)
-        grouped['percentage_yes'] = (grouped.get('yes', 0) / grouped.sum(axis=1)) * 100
+        grouped = counts[self.breakdown_var.get()]
+        grouped = grouped[grouped.sum(axis=1) > 0]
         self.fig.clear()
-        axes = self.fig.subplots(1, 2)
-        for i, gender in enumerate(grouped.index):
-            yes = grouped.loc[gender, 'yes'] if 'yes' in grouped.columns else 0
-            no = grouped.loc[gender, 'no'] if 'no' in grouped.columns else 0
-            colors = ['#ADD8E6', '#9400D3']
-            axes[i].pie(
-                [yes, no],
+        if grouped.empty: # Καμία τιμή της ανάλυσης με μη μηδενικό πλήθος
+            self._log(f"Δεν υπάρχουν δεδομένα για την ανάλυση '{self.breakdown_var.get()}'.")
+            self.canvas.draw()
+            return
+        n_cols = min(len(grouped), 3)
+        n_rows = math.ceil(len(grouped) / n_cols)
+        axes = self.fig.subplots(n_rows, n_cols, squeeze=False).ravel()
+        colors = ['#ADD8E6', '#9400D3']
+        for ax, (value, row) in zip(axes, grouped.iterrows()):
+            ax.pie(
+                [row.get('yes', 0), row.get('no', 0)],
                 labels=['Yes', 'No'],
                 autopct='%1.1f%%',
                 startangle=90,
                 colors=colors)
-            axes[i].set_title(f'Responses for {gender.capitalize()}')
+            ax.set_title(f'Responses for {str(value).capitalize()}')
+        for ax in axes[len(grouped):]:
+            ax.axis('off')
         self.canvas.draw()
 
     def quit_app(self, event: Optional[tk.Event] = None) -> None:
@@ -857,13 +1855,92 @@ class CampaignPredictionApp:
        Authors:
             Ασλανίδης Ραφαήλ
         """
+        if self.prefetch_executor is not None:
+            self.prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._save_session()
         self.master.quit()
 
+    def _save_session(self) -> None:
+        """
+        Αποθηκεύει την κατάσταση εργασίας (δεδομένα, μοντέλο, προβλέψεις και
+        flags) ώστε να προταθεί η επαναφορά της στην επόμενη εκκίνηση.
+        
+        Αν δεν έχει φορτωθεί τίποτα, το προηγούμενο snapshot διατηρείται.
+        Σφάλμα αποθήκευσης καταγράφεται χωρίς να εμποδίζει την έξοδο.
+        """
+        if self.past_campaign_data is None and self.new_campaign_data is None:
+            return
+        try:
+            save_session(
+                {
+                    "past_campaign_data": self.past_campaign_data,
+                    "new_campaign_data": self.new_campaign_data,
+                    "predictions_df": self.predictions_df,
+                },
+                model=self.knn_model if self.model_trained else None,
+                flags={
+                    "training_data_loaded": self.training_data_loaded,
+                    "model_trained": self.model_trained,
+                    "predictions_data_loaded": self.predictions_data_loaded,
+                    "predictions_made": self.predictions_made,
+                },
+            )
+        except Exception as e:
+            self.file_logger.warning(f"Η αποθήκευση της συνεδρίας απέτυχε: {str(e)}")
+
+    def _offer_session_restore(self) -> None:
+        """
+        Προτείνει την επαναφορά της συνεδρίας που αποθηκεύτηκε κατά την
+        προηγούμενη έξοδο.
+        
+        Τα δεδομένα και οι πίνακες του μοντέλου αντιστοιχίζονται στη μνήμη
+        (memory-mapped), οπότε η επαναφορά δεν ξαναδιαβάζει τα αρχεία Excel
+        ούτε επανεκπαιδεύει το μοντέλο. Αν ο χρήστης αρνηθεί, το snapshot
+        διαγράφεται.
+        """
+        if not messagebox.askyesno(
+            "Επαναφορά Συνεδρίας",
+            "Βρέθηκε αποθηκευμένη συνεδρία από την προηγούμενη χρήση.\nΘέλετε να την επαναφέρετε;"
+            ):
+            clear_session()
+            return
+        try:
+            state = load_session()
+        except Exception as e:
+            messagebox.showerror("Σφάλμα!", f"Η επαναφορά της συνεδρίας απέτυχε:\n{str(e)}")
+            self._log(f"Σφάλμα κατά την επαναφορά της συνεδρίας: {str(e)}")
+            clear_session()
+            return
+        frames, flags = state["frames"], state["flags"]
+        self.past_campaign_data = frames.get("past_campaign_data")
+        self.new_campaign_data = frames.get("new_campaign_data")
+        self.predictions_df = frames.get("predictions_df")
+        self.knn_model = state["model"]
+        self.training_data_loaded = flags.get("training_data_loaded", False)
+        self.model_trained = flags.get("model_trained", False) and self.knn_model is not None
+        self.predictions_data_loaded = flags.get("predictions_data_loaded", False)
+        self.predictions_made = flags.get("predictions_made", False) and self.predictions_df is not None
+        self._log("Επαναφέρθηκε η προηγούμενη συνεδρία:")
+        if self.past_campaign_data is not None:
+            self._log(f"    -Ιστορικά δεδομένα: {len(self.past_campaign_data)} εγγραφές")
+        if self.model_trained:
+            self._log(f"    -Εκπαιδευμένο μοντέλο με k = {getattr(self.knn_model, 'best_n_neighbors', '-')}")
+        if self.new_campaign_data is not None:
+            self._log(f"    -Δεδομένα νέας καμπάνιας: {len(self.new_campaign_data)} εγγραφές")
+        if self.predictions_made:
+            self.prediction_table.set_data(self.predictions_df)
+            if getattr(self.knn_model, "segment_counts", None):
+                self.plot_segment_breakdown()
+            self._log(f"    -Προβλέψεις: {len(self.predictions_df)} εγγραφές")
+        self._log("\n=================================================\n")
+        self._update_button_states()
+
     def run(self) -> None:
         """
         Εκκινεί την εφαρμογή και συνδέει πλήκτρα εξόδου.
         
-        Συνδέει τα πλήκτρα 'q' και 'Esc' με την έξοδο της εφαρμογής και ξεκινά
+        Συνδέει τα πλήκτρα 'q' και 'Esc' και το κλείσιμο του παραθύρου με την
+        έξοδο της εφαρμογής (που αποθηκεύει τη συνεδρία) και ξεκινά
         τον κύριο βρόχο του γραφικού περιβάλλοντος.
         
         Authors:
@@ -872,4 +1949,5 @@ class CampaignPredictionApp:
         """
         self.master.bind("<q>", self.quit_app)
         self.master.bind("<Escape>", self.quit_app)
+        self.master.protocol("WM_DELETE_WINDOW", self.quit_app)
         self.master.mainloop()
@@ -1,15 +1,511 @@
+import math
+import numpy as np
 import pandas as pd
 from plotter import Plotter
+from exporter import export_predictions
+from data_loader import CAMPAIGN_COLUMN
+from ann import ApproximateKNeighborsClassifier
+from resources import ResourceConfig, governed
+from prediction_cache import array_fingerprint, row_hashes
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
-from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neighbors import KNeighborsClassifier, NearestNeighbors
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
 from sklearn.metrics import accuracy_score, precision_score, confusion_matrix, classification_report
 
 
+POSITIVE_LABEL = "yes"  # Η τιμή της ανταπόκρισης που θεωρείται θετική
+SCORE_COLUMN = "Πιθανότητα Ανταπόκρισης"  # Η στήλη με το ποσοστό ψήφων των γειτόνων υπέρ του POSITIVE_LABEL
+RANK_COLUMN = "Κατάταξη"  # Η στήλη με τη θέση του πελάτη στη λίστα στόχευσης
+
+# Οι διαθέσιμες μετρικές για την αξιολόγηση του μοντέλου (όνομα -> scorer του sklearn)
+SCORING = {
+    "precision": "precision_macro",
+    "accuracy": "accuracy",
+}
+# Οι κανόνες επιλογής του αριθμού γειτόνων από τον πίνακα αποτελεσμάτων του cross-validation
+SELECTION_RULES = ("mode", "mean", "one_se")
+# Τα διαθέσιμα ευρετήρια γειτόνων του τελικού μοντέλου: ακριβής αναζήτηση ή προσεγγιστικό random projection forest
+INDEX_TYPES = ("exact", "rpforest")
+# Οι τρόποι στάθμισης των ψήφων των γειτόνων που εξετάζει η εκτεταμένη αναζήτηση
+WEIGHT_OPTIONS = ("uniform", "distance")
+BOOTSTRAP_RESAMPLES = 2000  # Πλήθος επαναδειγματοληψιών για τα διαστήματα εμπιστοσύνης των μετρικών επικύρωσης
+CONFIDENCE_LEVEL = 0.95  # Το επίπεδο εμπιστοσύνης των διαστημάτων
+BOOTSTRAP_BATCH_ELEMENTS = 10_000_000  # Μέγιστο πλήθος δεικτών (επαναδειγματοληψίες x δείγματα) ανά παρτίδα
+# Οι κατευθύνσεις της άπληστης επιλογής χαρακτηριστικών
+SELECTION_DIRECTIONS = ("forward", "backward")
+FEATURE_SELECTION_ROWS = 1500  # Μέγιστο δείγμα γραμμών για την επιλογή χαρακτηριστικών (πίνακες αποστάσεων n x n ανά χαρακτηριστικό)
+# Οι κατηγορικές στήλες για τις οποίες η predict() μετρά τις προβλέψεις ανά τιμή
+BREAKDOWN_COLUMNS = ("Φύλο", "Περιοχή", "Email", "Χρήση Κινητού")
+AGE_BAND = "Ηλικιακή Ομάδα"  # Το όνομα της ανάλυσης ανά ηλικιακή ομάδα
+AGE_BAND_EDGES = (25, 35, 45, 55, 65)  # Τα όρια των ηλικιακών ομάδων
+AGE_BAND_LABELS = ("<25", "25-34", "35-44", "45-54", "55-64", "65+")
+
+
+def select_top(scores, top_n=None, top_percent=None):
+    """
+    Επιλέγει τις θέσεις των top_n (ή του top_percent %) μεγαλύτερων σκορ, ταξινομημένες φθίνουσα.
+
+    Χρησιμοποιεί μερική επιλογή (np.argpartition, O(n)) και ταξινομεί μόνο τα επιλεγμένα στοιχεία,
+    ώστε η κατάταξη εκατομμυρίων πελατών να μην απαιτεί πλήρη ταξινόμηση.
+
+    Parameters:
+        scores (np.ndarray): Τα σκορ των πελατών.
+        top_n (int, optional): Ο αριθμός των πελατών που θα επιλεγούν.
+        top_percent (float, optional): Το ποσοστό (0-100] των πελατών που θα επιλεγούν.
+
+    Returns:
+        np.ndarray: Οι θέσεις των επιλεγμένων πελατών, από το μεγαλύτερο στο μικρότερο σκορ.
+
+    Raises:
+        ValueError: Αν δεν δοθεί ακριβώς ένα από τα top_n, top_percent ή αν έχουν μη έγκυρη τιμή.
+    """
+    scores = np.asarray(scores)
+    if (top_n is None) == (top_percent is None):
+        raise ValueError("Ορίστε ακριβώς ένα από τα top_n ή top_percent.")
+    if top_percent is not None:
+        if not 0 < top_percent <= 100:
+            raise ValueError("Το top_percent πρέπει να είναι στο διάστημα (0, 100].")
+        top_n = math.ceil(len(scores) * top_percent / 100)
+    if top_n < 1:
+        raise ValueError("Το top_n πρέπει να είναι θετικός ακέραιος.")
+
+    top_n = min(top_n, len(scores))
+    if top_n < len(scores):
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+    else:
+        top = np.arange(len(scores))
+    # Σταθερή ταξινόμηση μόνο των επιλεγμένων, ώστε οι ισοβαθμίες να διατηρούν τη σειρά του αρχείου
+    top = np.sort(top)
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def rank_by_scores(new_data, scores, response_column, top_n=None, top_percent=None):
+    """
+    Δημιουργεί τη λίστα στόχευσης από τα σκορ ανταπόκρισης των πελατών.
+
+    Parameters:
+        new_data (pd.DataFrame): Τα νέα δεδομένα προς κατάταξη.
+        scores (np.ndarray): Το ποσοστό ψήφων υπέρ του POSITIVE_LABEL για κάθε πελάτη.
+        response_column (str): Η στήλη στην οποία γράφεται η προβλεπόμενη ανταπόκριση.
+        top_n (int, optional): Ο αριθμός των πελατών που θα επιλεγούν.
+        top_percent (float, optional): Το ποσοστό των πελατών που θα επιλεγούν.
+
+    Returns:
+        pd.DataFrame: Οι επιλεγμένοι πελάτες, ταξινομημένοι κατά φθίνον σκορ, με τις στήλες κατάταξης και σκορ.
+    """
+    top = select_top(scores, top_n=top_n, top_percent=top_percent)
+
+    ranked_df = new_data.iloc[top].copy()
+    ranked_df[response_column] = np.where(scores[top] > 0.5, POSITIVE_LABEL, "no")
+    ranked_df[SCORE_COLUMN] = scores[top]
+    ranked_df.insert(0, RANK_COLUMN, np.arange(1, len(top) + 1))
+    return ranked_df
+
+
+def segment_counts(data, predictions, classes):
+    """
+    Μετρά τις προβλέψεις ανά τιμή κάθε στήλης του BREAKDOWN_COLUMNS και ανά ηλικιακή ομάδα.
+
+    Οι τιμές κάθε στήλης μετατρέπονται σε ακέραιους κωδικούς και όλοι οι συνδυασμοί (τιμή, κλάση) μετρώνται με ένα
+    np.bincount, χωρίς groupby.
+
+    Parameters:
+        data (pd.DataFrame): Τα δεδομένα των προβλέψεων.
+        predictions (np.ndarray): Η προβλεπόμενη κλάση κάθε γραμμής.
+        classes (np.ndarray): Οι κλάσεις του μοντέλου.
+
+    Returns:
+        dict: Όνομα ανάλυσης -> pd.DataFrame (τιμές x κλάσεις) με το πλήθος των προβλέψεων.
+    """
+    n_classes = len(classes)
+    class_codes = np.searchsorted(classes, predictions)
+    breakdowns = {}
+
+    columns = [col for col in BREAKDOWN_COLUMNS if col in data.columns]
+    for col in columns:
+        values = data[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values, sort=True)
+        breakdowns[col] = (codes, uniques)
+    if "Ηλικία" in data.columns:
+        codes = np.searchsorted(AGE_BAND_EDGES, data["Ηλικία"].to_numpy(), side="right")
+        breakdowns[AGE_BAND] = (codes, pd.Index(AGE_BAND_LABELS))
+
+    counts = {}
+    for name, (codes, uniques) in breakdowns.items():
+        valid = codes >= 0  # Κενές τιμές (κωδικός -1) δεν μετρώνται
+        flat = np.bincount(
+            codes[valid] * n_classes + class_codes[valid], minlength=len(uniques) * n_classes
+        )
+        counts[name] = pd.DataFrame(
+            flat.reshape(len(uniques), n_classes), index=pd.Index(uniques, name=name), columns=classes
+        )
+    return counts
+
+
+def fitted_group(preprocessor, name):
+    """
+    Ο εκπαιδευμένος transformer μιας ομάδας χαρακτηριστικών του preprocessor και οι στήλες της.
+
+    Ο preprocessor έχει ομάδα "num" ή "cat" μόνο αν υπάρχουν χαρακτηριστικά του αντίστοιχου τύπου
+    (π.χ. μετά από select_features()).
+
+    Parameters:
+        preprocessor (ColumnTransformer): Ο εκπαιδευμένος preprocessor (βλ. KNN._make_preprocessor()).
+        name (str): Η ομάδα ("num" ή "cat").
+
+    Returns:
+        tuple: (transformer, λίστα στηλών) ή (None, []) αν η ομάδα δεν υπάρχει.
+    """
+    columns = next((list(cols) for group, _, cols in preprocessor.transformers_ if group == name), [])
+    if not columns:
+        return None, []
+    return preprocessor.named_transformers_.get(name), columns
+
+
+def stable_kneighbors(query, X, n_neighbors, n_samples):
+    """
+    Οι n_neighbors πλησιέστεροι γείτονες από ένα ευρετήριο του sklearn, ταξινομημένοι κατά (απόσταση, δείκτη).
+
+    Το kd-tree επιστρέφει τους ισαπέχοντες γείτονες με σειρά που εξαρτάται από τη διάσχιση του δέντρου, οπότε
+    όταν ισαπέχοντα σημεία μοιράζονται τη θέση του n_neighbors-οστού γείτονα, το σύνολο των γειτόνων είναι
+    αυθαίρετο. Εδώ από τα ισαπέχοντα κρατούνται αυτά με τον μικρότερο δείκτη, ώστε το αποτέλεσμα να μην εξαρτάται
+    από το ευρετήριο ούτε από τον διαμοιρασμό του συνόλου αναφοράς (βλ. sharded.merge_top_k()). Μόνο για τις
+    γραμμές με ισοπαλία στο όριο γίνεται νέα αναζήτηση, με περισσότερους γείτονες.
+
+    Parameters:
+        query (callable): Η kneighbors(X, n_neighbors=...) του εκπαιδευμένου ευρετηρίου (π.χ. NearestNeighbors).
+        X (np.ndarray): Τα ερωτήματα.
+        n_neighbors (int): Ο αριθμός των γειτόνων (περιορίζεται στο μέγεθος του συνόλου αναφοράς).
+        n_samples (int): Το μέγεθος του συνόλου αναφοράς του ευρετηρίου.
+
+    Returns:
+        tuple: (αποστάσεις, δείκτες), πίνακες (ερωτήματα x n_neighbors).
+    """
+    k = min(n_neighbors, n_samples)
+    distances, indices = query(X, n_neighbors=min(k + 1, n_samples))
+    tied = np.flatnonzero(distances[:, k] == distances[:, k - 1]) if distances.shape[1] > k else np.array([], dtype=int)
+    distances, indices = distances[:, :k].copy(), indices[:, :k].copy()
+    m = k
+    while len(tied):
+        # Όλοι οι γείτονες έως την k-οστή απόσταση: διπλασιασμός των γειτόνων μέχρι να την ξεπεράσουν
+        m = min(2 * m, n_samples)
+        kth = distances[tied, -1][:, None]
+        tied_distances, tied_indices = query(X[tied], n_neighbors=m)
+        done = (tied_distances[:, -1:] > kth).ravel() | (m == n_samples)
+        outside = tied_distances[done] > kth[done]
+        keys = (np.where(outside, n_samples, tied_indices[done]), np.where(outside, np.inf, tied_distances[done]))
+        order = np.lexsort(keys, axis=-1)[:, :k]
+        distances[tied[done]] = np.take_along_axis(tied_distances[done], order, axis=1)
+        indices[tied[done]] = np.take_along_axis(tied_indices[done], order, axis=1)
+        tied = tied[~done]
+    # Ταξινόμηση κατά δείκτη και μετά σταθερή ταξινόμηση κατά απόσταση: (απόσταση, δείκτης) λεξικογραφικά
+    by_index = np.argsort(indices, axis=1, kind="stable")
+    distances = np.take_along_axis(distances, by_index, axis=1)
+    indices = np.take_along_axis(indices, by_index, axis=1)
+    order = np.argsort(distances, axis=1, kind="stable")
+    return np.take_along_axis(distances, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+
+class StableKNeighborsClassifier(KNeighborsClassifier):
+    """
+    KNeighborsClassifier με σταθερή επιλογή γειτόνων σε ισοπαλίες αποστάσεων (βλ. stable_kneighbors()).
+
+    Οι προβλέψεις ταυτίζονται με της διαμοιρασμένης πρόβλεψης (sharded.py) για οποιονδήποτε αριθμό shards. Το
+    ευρετήριο είναι kd-tree, ώστε κάθε απόσταση να υπολογίζεται ανεξάρτητα από τα υπόλοιπα σημεία του συνόλου
+    αναφοράς (ο brute υπολογισμός του sklearn χρησιμοποιεί πολλαπλασιασμό πινάκων).
+    """
+
+    def __init__(self, n_neighbors=5, *, weights="uniform", algorithm="kd_tree", leaf_size=30, p=2,
+                 metric="minkowski", metric_params=None, n_jobs=None):
+        super().__init__(
+            n_neighbors=n_neighbors, weights=weights, algorithm=algorithm, leaf_size=leaf_size, p=p, metric=metric,
+            metric_params=metric_params, n_jobs=n_jobs,
+        )
+
+    def fit(self, X, y):
+        super().fit(X, y)
+        self.reference_codes_ = np.searchsorted(self.classes_, np.asarray(y))
+        return self
+
+    def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+        if X is None:  # Οι γείτονες των ίδιων των σημείων αναφοράς (χωρίς τον εαυτό τους)
+            return super().kneighbors(X, n_neighbors, return_distance)
+        distances, indices = stable_kneighbors(super().kneighbors, X, n_neighbors or self.n_neighbors, self.n_samples_fit_)
+        return (distances, indices) if return_distance else indices
+
+    def predict_proba(self, X):
+        distances, indices = self.kneighbors(X)
+        votes = neighbor_vote_totals(
+            self.reference_codes_[indices], self.n_neighbors, len(self.classes_),
+            distances if self.weights == "distance" else None,
+        )
+        return votes / votes.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def neighbor_votes(neighbor_codes, k, n_classes, distances=None):
+    """
+    Υπολογίζει την πρόβλεψη πλειοψηφίας από τους k πρώτους γείτονες κάθε δείγματος.
+
+    Με αποστάσεις (weights="distance") κάθε γείτονας ψηφίζει με βάρος 1/απόσταση· αν κάποιοι γείτονες έχουν μηδενική
+    απόσταση, ψηφίζουν μόνο αυτοί, όπως και στο KNeighborsClassifier. Σε ισοψηφία επιλέγεται η κλάση με τον
+    μικρότερο κωδικό.
+
+    Parameters:
+        neighbor_codes (np.ndarray): Πίνακας (δείγματα x γείτονες) με τους κωδικούς κλάσης των γειτόνων, ταξινομημένους κατά απόσταση.
+        k (int): Ο αριθμός των γειτόνων που ψηφίζουν.
+        n_classes (int): Ο αριθμός των κλάσεων.
+        distances (np.ndarray, optional): Οι αντίστοιχες αποστάσεις των γειτόνων. Αν δεν δοθούν, οι ψήφοι είναι ισοβαρείς.
+
+    Returns:
+        np.ndarray: Ο κωδικός της προβλεπόμενης κλάσης για κάθε δείγμα.
+    """
+    return neighbor_vote_totals(neighbor_codes, k, n_classes, distances).argmax(axis=1)
+
+
+def neighbor_vote_totals(neighbor_codes, k, n_classes, distances=None):
+    """
+    Το άθροισμα των ψήφων κάθε κλάσης από τους k πρώτους γείτονες κάθε δείγματος (βλ. neighbor_votes()).
+
+    Returns:
+        np.ndarray: Πίνακας (δείγματα x κλάσεις) με τις ψήφους.
+    """
+    if distances is None:
+        weights = np.ones(neighbor_codes[:, :k].shape)
+    else:
+        distances = distances[:, :k]
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / distances
+        exact = distances == 0
+        exact_rows = exact.any(axis=1)
+        weights[exact_rows] = exact[exact_rows]
+    votes = np.zeros((neighbor_codes.shape[0], n_classes))
+    for code in range(n_classes):
+        votes[:, code] = np.where(neighbor_codes[:, :k] == code, weights, 0.0).sum(axis=1)
+    return votes
+
+
+def subset_cv_score(distances, y_codes, folds, k, n_classes, metric="accuracy"):
+    """
+    Το μέσο σκορ cross-validation του K-NN για έναν πίνακα αποστάσεων μεταξύ όλων των γραμμών.
+
+    Parameters:
+        distances (np.ndarray): Πίνακας (n x n) με τις (τετραγωνικές) αποστάσεις όλων των ζευγών γραμμών.
+        y_codes (np.ndarray): Οι κωδικοί κλάσης των γραμμών.
+        folds (list): Τα (train_idx, test_idx) των splits.
+        k (int): Ο αριθμός των γειτόνων.
+        n_classes (int): Ο αριθμός των κλάσεων.
+        metric (str): Η μετρική ("accuracy" ή "precision").
+
+    Returns:
+        float: Η μέση τιμή της μετρικής στα splits.
+    """
+    scores = []
+    for train_idx, test_idx in folds:
+        block = distances[np.ix_(test_idx, train_idx)]
+        k_fold = min(k, len(train_idx))
+        # Οι k πλησιέστεροι χωρίς ταξινόμηση: όσοι είναι πιο κοντά από την k-οστή απόσταση ψηφίζουν με βάρος 1 και
+        # όσοι ισαπέχουν με αυτήν μοιράζονται τις υπόλοιπες θέσεις (η αναμενόμενη ψήφος με τυχαία επιλογή ανάμεσά
+        # τους). Τα δεδομένα έχουν πολλές ισοπαλίες και έτσι το σκορ δεν εξαρτάται από τη σειρά των γραμμών.
+        kth = np.partition(block, k_fold - 1, axis=1)[:, k_fold - 1:k_fold]
+        closer = block < kth
+        ties = block == kth
+        share = (k_fold - closer.sum(axis=1)) / ties.sum(axis=1)
+        y_train = y_codes[train_idx]
+        votes = np.stack(
+            [(closer & (y_train == code)).sum(axis=1) + share * (ties & (y_train == code)).sum(axis=1)
+             for code in range(n_classes)],
+            axis=1,
+        )
+        y_pred = votes.argmax(axis=1)
+        if metric == "precision":
+            scores.append(precision_score(y_codes[test_idx], y_pred, average="macro", zero_division=0))
+        else:
+            scores.append(accuracy_score(y_codes[test_idx], y_pred))
+    return float(np.mean(scores))
+
+
+def bootstrap_intervals(y_true, y_pred, labels, indicators=None, n_resamples=BOOTSTRAP_RESAMPLES,
+                        confidence=CONFIDENCE_LEVEL, random_state=None):
+    """
+    Υπολογίζει διαστήματα εμπιστοσύνης bootstrap (percentile) για τις μετρικές επικύρωσης από τις ήδη υπολογισμένες προβλέψεις.
+
+    Όλες οι επαναδειγματοληψίες μιας παρτίδας είναι ένας πίνακας δεικτών (επαναδειγματοληψίες x δείγματα). Κάθε
+    ζεύγος (πραγματική, προβλεπόμενη κλάση) κωδικοποιείται ως ένα κελί του πίνακα σύγχυσης και οι πίνακες σύγχυσης
+    όλων των επαναδειγματοληψιών προκύπτουν από ένα np.bincount. Καμία μετρική δεν απαιτεί νέα εκπαίδευση.
+
+    Parameters:
+        y_true (array-like): Οι πραγματικές κλάσεις του συνόλου επικύρωσης.
+        y_pred (array-like): Οι προβλεπόμενες κλάσεις.
+        labels (list): Οι κλάσεις, με τη σειρά του πίνακα σύγχυσης.
+        indicators (dict, optional): Επιπλέον μετρικές ως όνομα -> πίνακας bool ανά δείγμα, των οποίων η μέση τιμή είναι η μετρική.
+        n_resamples (int): Το πλήθος των επαναδειγματοληψιών.
+        confidence (float): Το επίπεδο εμπιστοσύνης (0, 1).
+        random_state (int, optional): Το seed για αναπαραγωγιμότητα.
+
+    Returns:
+        dict: Όνομα μετρικής (όπως στο validation_metrics) -> (κάτω όριο, άνω όριο).
+
+    Raises:
+        ValueError: Αν το επίπεδο εμπιστοσύνης ή το πλήθος επαναδειγματοληψιών δεν είναι έγκυρα.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Το επίπεδο εμπιστοσύνης πρέπει να είναι στο διάστημα (0, 1).")
+    if n_resamples < 1:
+        raise ValueError("Το πλήθος των επαναδειγματοληψιών πρέπει να είναι θετικός ακέραιος.")
+
+    labels = [str(label) for label in labels]
+    n_classes = len(labels)
+    lookup = {label: code for code, label in enumerate(labels)}
+    true_codes = np.array([lookup[str(value)] for value in y_true])
+    pred_codes = np.array([lookup[str(value)] for value in y_pred])
+    cells = true_codes * n_classes + pred_codes
+    indicators = {name: np.asarray(values, dtype=np.float64) for name, values in (indicators or {}).items()}
+    n_samples = len(cells)
+
+    rng = np.random.default_rng(random_state)
+    batch_size = max(1, BOOTSTRAP_BATCH_ELEMENTS // max(n_samples, 1))
+    samples = {}
+    for start in range(0, n_resamples, batch_size):
+        batch = min(batch_size, n_resamples - start)
+        idx = rng.integers(0, n_samples, size=(batch, n_samples))
+        offsets = (np.arange(batch) * n_classes * n_classes)[:, None]
+        cm = np.bincount((offsets + cells[idx]).ravel(), minlength=batch * n_classes * n_classes)
+        cm = cm.reshape(batch, n_classes, n_classes)
+
+        correct = np.diagonal(cm, axis1=1, axis2=2)
+        actual, predicted = cm.sum(axis=2), cm.sum(axis=1)
+        recall = np.divide(correct, actual, out=np.zeros(correct.shape), where=actual > 0)
+        precision = np.divide(correct, predicted, out=np.zeros(correct.shape), where=predicted > 0)
+        # Ο μέσος όρος (macro) στις κλάσεις που εμφανίζονται στην επαναδειγματοληψία, όπως στο classification_report
+        present = (actual + predicted) > 0
+
+        batch_metrics = {
+            "Accuracy": correct.sum(axis=1) / n_samples,
+            "Precision": (precision * present).sum(axis=1) / present.sum(axis=1),
+        }
+        for code, label in enumerate(labels):
+            batch_metrics[f"{label.capitalize()} Accuracy"] = recall[:, code]
+            batch_metrics[f"{label.capitalize()} Precision"] = precision[:, code]
+        for name, values in indicators.items():
+            batch_metrics[name] = values[idx].mean(axis=1)
+        for name, values in batch_metrics.items():
+            samples.setdefault(name, []).append(values)
+
+    alpha = (1 - confidence) / 2 * 100
+    return {
+        name: tuple(np.percentile(np.concatenate(values), [alpha, 100 - alpha]))
+        for name, values in samples.items()
+    }
+
+
+class NeighborCache:
+    """
+    Οι max_k πλησιέστεροι γείτονες (θέσεις στο σύνολο αναφοράς και αποστάσεις) κάθε πελάτη μιας πρόβλεψης.
+
+    Με τη cache, η πρόβλεψη για οποιονδήποτε αριθμό γειτόνων έως max_k ή με άλλη στάθμιση και η εμφάνιση των
+    πλησιέστερων ιστορικών πελατών γίνονται με πράξεις πινάκων, χωρίς νέα αναζήτηση γειτόνων. Οι θέσεις
+    αποθηκεύονται ως int32 και οι αποστάσεις ως float32. Οι γείτονες είναι ταξινομημένοι κατά (απόσταση, δείκτη),
+    οπότε σε ισοπαλίες αποστάσεων στον k-οστό γείτονα ψηφίζουν όσοι έχουν τον μικρότερο δείκτη, όπως στον classifier
+    του μοντέλου (βλ. stable_kneighbors()).
+
+    Attributes:
+        indices (np.ndarray): Πίνακας (πελάτες x max_k) με τις θέσεις των γειτόνων στο σύνολο αναφοράς (int32).
+        distances (np.ndarray): Οι αντίστοιχες αποστάσεις (float32).
+        neighbor_codes (np.ndarray): Οι κωδικοί κλάσης των γειτόνων (int8).
+        classes (np.ndarray): Οι κλάσεις του μοντέλου.
+        index (pd.Index): Οι ετικέτες των πελατών της πρόβλεψης.
+        reference_index (pd.Index): Οι ετικέτες των πελατών του συνόλου αναφοράς.
+        reference_labels (np.ndarray): Η ανταπόκριση των πελατών του συνόλου αναφοράς.
+    """
+
+    def __init__(self, indices, distances, reference_codes, classes, index, reference_index):
+        self.indices = np.ascontiguousarray(indices, dtype=np.int32)
+        self.distances = np.ascontiguousarray(distances, dtype=np.float32)
+        self.neighbor_codes = np.asarray(reference_codes, dtype=np.int8)[self.indices]
+        self.classes = np.asarray(classes)
+        self.index = index
+        self.reference_index = reference_index
+        self.reference_labels = self.classes[np.asarray(reference_codes)]
+
+    @property
+    def max_k(self):
+        """
+        Ο μέγιστος αριθμός γειτόνων που μπορεί να αξιολογηθεί.
+        """
+        return self.indices.shape[1]
+
+    def _vote_totals(self, k, weights):
+        if not 1 <= k <= self.max_k:
+            raise ValueError(f"Ο αριθμός γειτόνων πρέπει να είναι από 1 έως {self.max_k} (τους γείτονες της cache).")
+        if weights not in WEIGHT_OPTIONS:
+            raise ValueError(f"Invalid weights '{weights}'. Available weights are: {', '.join(WEIGHT_OPTIONS)}")
+        return neighbor_vote_totals(
+            self.neighbor_codes, k, len(self.classes), self.distances if weights == "distance" else None
+        )
+
+    def predict(self, k, weights="uniform"):
+        """
+        Η προβλεπόμενη κλάση κάθε πελάτη με k γείτονες.
+
+        Parameters:
+            k (int): Ο αριθμός γειτόνων (έως max_k).
+            weights (str): Η στάθμιση των ψήφων (βλ. WEIGHT_OPTIONS).
+
+        Returns:
+            np.ndarray: Η κλάση κάθε πελάτη.
+
+        Raises:
+            ValueError: Αν ο αριθμός γειτόνων ή η στάθμιση δεν είναι έγκυρα.
+        """
+        return self.classes[self._vote_totals(k, weights).argmax(axis=1)]
+
+    def scores(self, k, weights="uniform"):
+        """
+        Το ποσοστό των ψήφων των k γειτόνων κάθε πελάτη υπέρ του POSITIVE_LABEL (όπως η predict_proba()).
+
+        Parameters:
+            k (int): Ο αριθμός γειτόνων (έως max_k).
+            weights (str): Η στάθμιση των ψήφων (βλ. WEIGHT_OPTIONS).
+
+        Returns:
+            np.ndarray: Το σκορ κάθε πελάτη.
+        """
+        votes = self._vote_totals(k, weights)
+        if POSITIVE_LABEL not in self.classes:
+            return np.zeros(len(votes))
+        return votes[:, list(self.classes).index(POSITIVE_LABEL)] / votes.sum(axis=1)
+
+    def nearest(self, position, k=None):
+        """
+        Οι πλησιέστεροι ιστορικοί πελάτες ενός πελάτη της πρόβλεψης.
+
+        Parameters:
+            position (int): Η θέση του πελάτη στα δεδομένα της πρόβλεψης.
+            k (int, optional): Πόσοι γείτονες (προεπιλογή: όλοι οι γείτονες της cache).
+
+        Returns:
+            pd.DataFrame: Μία γραμμή ανά γείτονα (ετικέτα ιστορικού πελάτη ως index), με την απόσταση και την ανταπόκρισή του.
+        """
+        k = min(k or self.max_k, self.max_k)
+        neighbors = self.indices[position, :k]
+        return pd.DataFrame(
+            {"Απόσταση": self.distances[position, :k], "Ανταπόκριση": self.reference_labels[neighbors]},
+            index=self.reference_index[neighbors],
+        )
+
+
 class KNN:
-    def __init__(self, neighbors=None, test_size=0.2, random_state=42):
+    def __init__(self, neighbors=None, test_size=0.2, random_state=42, drift_threshold=0.5, index="exact", index_params=None,
+                 n_jobs=-1, plots_dir="../plots", resources=None, prediction_cache=None):
         """
         Αρχικοποίηση του μοντέλου KNN και των παραμέτρων του.
 
@@ -17,13 +513,28 @@ class KNN:
             neighbors (int): Ο αριθμός των γειτόνων για το KNN. Αν δεν δοθεί, θα βρεθεί αυτόματα.
             test_size (float): Το ποσοστό των δεδομένων που θα χρησιμοποιηθούν για επικύρωση.
             random_state (int): Το seed για αναπαραγωγιμότητα.
+            drift_threshold (float): Η μέγιστη μετατόπιση (σε τυπικές αποκλίσεις) της μέσης τιμής των αριθμητικών χαρακτηριστικών νέων παρατηρήσεων, πέρα από την οποία η add_observations() κάνει πλήρη επανεκπαίδευση.
+            index (str): Το ευρετήριο γειτόνων του τελικού μοντέλου ("exact" ή "rpforest", βλ. INDEX_TYPES).
+            index_params (dict, optional): Παράμετροι κατασκευής/αναζήτησης του προσεγγιστικού ευρετηρίου (n_trees, leaf_size, search_trees).
+            n_jobs (int): Ο αριθμός των παράλληλων εργασιών του grid search (-1 για όλους τους πυρήνες). Αγνοείται αν δοθεί το resources.
+            plots_dir (str, optional): Ο φάκελος αποθήκευσης των γραφημάτων της gen_metrics(). Αν είναι None, δεν δημιουργούνται γραφήματα.
+            resources (ResourceConfig, optional): Διεργασίες, νήματα ανά διεργασία και όριο μνήμης της αναζήτησης, της εκπαίδευσης και της πρόβλεψης.
+            prediction_cache (PredictionCache, optional): Μόνιμη cache προβλέψεων ανά γραμμή. Οι predict() και predict_proba() υπολογίζουν μόνο τις γραμμές που δεν υπάρχουν σε αυτή.
+
+        Raises:
+            ValueError: Αν το ευρετήριο δεν είναι έγκυρο.
         """
 
+        if index not in INDEX_TYPES:
+            raise ValueError(f"Invalid index '{index}'. Available indexes are: {', '.join(INDEX_TYPES)}")
+
         self.plotter = None  # Ο Plotter για την απεικόνιση των μετρικών
         self.response_column = "Ανταπόκριση"  # Ονομασία της στήλης που περιέχει την ανταπόκριση
         self.test_size = test_size  # Το ποσοστό των δεδομένων που θα χρησιμοποιηθούν για επικύρωση
         self.random_state = random_state  # Το seed
         self.best_n_neighbors = neighbors  # Ο αριθμός των γειτόνων για το KNN, αν έχει οριστεί
+        self.best_weights = "uniform"  # Η στάθμιση των ψήφων των γειτόνων (βλ. WEIGHT_OPTIONS)
+        self.best_p = 2  # Η παράμετρος p της απόστασης Minkowski (1: Manhattan, 2: Ευκλείδεια)
         self.results = []  # Μετρικές για κάθε fold
         self.detailed_results = [] # Λεπτομερές μετρικές για καθε αριθμό γειτόνων για κάθε fold
         self.X = None  # Τα χαρακτηριστικά των δεδομένων
@@ -35,22 +546,54 @@ class KNN:
         self.preprocessor = None  # Ο προεπεξεργαστής των δεδομένων
         self.validation_metrics = None  # Οι μετρικές επικύρωσης του μοντέλου
         self.validation_metrics_str = ""  # Ένα string που περιέχει τις μετρικές επικύρωσης
+        self.validation_intervals = None  # Τα διαστήματα εμπιστοσύνης bootstrap των μετρικών επικύρωσης (βλ. bootstrap_intervals())
+        self.confidence_level = CONFIDENCE_LEVEL  # Το επίπεδο εμπιστοσύνης των διαστημάτων
         self.cv_validation_metrics = None  # Οι συνολικές μετρικές επικύρωσης του cross-validation
         self.overall_validation_metrics = None  # Οι συνολικές μετρικές επικύρωσης
         self.final_model = None  # Το τελικό μοντέλο KNN μετά την εκπαίδευση
         self.metric = "accuracy"  # Η μετρική που θα χρησιμοποιηθεί για την αξιολόγηση του μοντέλου
+        self.selection_rule = "mode"  # Ο κανόνας επιλογής του αριθμού γειτόνων (βλ. SELECTION_RULES)
+        self.cv_results_table = None  # Πίνακας (DataFrame) με όλα τα σκορ ανά (αριθμό folds, αριθμό γειτόνων, στάθμιση, p)
+        self.drift_threshold = drift_threshold  # Η μέγιστη τυποποιημένη μετατόπιση μέσης τιμής νέων παρατηρήσεων πριν από πλήρη επανεκπαίδευση
+        self.X_reference = None  # Τα προεπεξεργασμένα χαρακτηριστικά του συνόλου αναφοράς του τελικού μοντέλου
+        self.index = index  # Το ευρετήριο γειτόνων του τελικού μοντέλου
+        self.index_params = index_params or {}  # Οι παράμετροι του προσεγγιστικού ευρετηρίου
+        self.resources = resources or ResourceConfig(n_jobs=n_jobs)  # Οι υπολογιστικοί πόροι (βλ. resources.py)
+        self.prediction_cache = prediction_cache  # Η cache προβλέψεων ανά γραμμή (βλ. prediction_cache.py)
+        self.neighbor_cache = None  # Οι γείτονες κάθε πελάτη της τελευταίας πρόβλεψης (αν ζητήθηκαν, βλ. NeighborCache)
+        self.cache_stats = None  # Επιτυχίες/αποτυχίες της cache στην τελευταία πρόβλεψη
+        self.plots_dir = plots_dir  # Ο φάκελος αποθήκευσης των γραφημάτων
+        self.index_recall = None  # Το recall του προσεγγιστικού ευρετηρίου σε σχέση με την ακριβή αναζήτηση (μετά τη fit())
+        self.segment_counts = None  # Το πλήθος των προβλέψεων ανά τιμή κάθε ανάλυσης (μετά την predict(), βλ. segment_counts())
+        self.selected_features = None  # Τα χαρακτηριστικά που χρησιμοποιεί το μοντέλο (None: όλα, βλ. select_features())
+        self.feature_selection_results = []  # Τα βήματα της επιλογής χαρακτηριστικών με το σκορ cross-validation
 
-    def find_best_neighbors(self, k_range, fold_range):
+    @governed
+    def find_best_neighbors(self, k_range, fold_range, weights=None, p_values=None, sample_fraction=1.0, executor=None):
         """
         Εύρεση του καλύτερου αριθμού γειτόνων για το KNN μέσω Grid Search με cross-validation σε διάφορα folds και εύρος αριθμού γειτόνων.
 
+        Όλα τα σκορ ανά (αριθμό folds, αριθμό γειτόνων, στάθμιση, p) αποθηκεύονται στον πίνακα cv_results_table, ώστε η
+        επιλογή να μπορεί να επαναληφθεί με άλλη μετρική ή κανόνα μέσω της select_best_neighbors().
+
+        Αν δοθούν weights ή p_values, γίνεται εκτεταμένη αναζήτηση (βλ. _shared_neighbor_search()): σε κάθε split οι
+        γείτονες υπολογίζονται μία φορά ανά p και όλοι οι συνδυασμοί στάθμισης και αριθμού γειτόνων αξιολογούνται
+        από αυτούς, αντί για ένα GridSearchCV που θα εκπαίδευε ξεχωριστό μοντέλο για κάθε συνδυασμό.
+
         Parameters:
-            on (str): Η μετρική για την οποία θα γίνει η βελτιστοποίηση. Μπορεί να είναι "accuracy" ή "precision".
             k_range (range): Το εύρος των τιμών για τον αριθμό των γειτόνων που θα εξεταστούν.
             fold_range (range): Το εύρος των τιμών για τον αριθμό των folds στο cross-validation.
+            weights (tuple, optional): Οι τρόποι στάθμισης των ψήφων που θα εξεταστούν (βλ. WEIGHT_OPTIONS).
+            p_values (tuple, optional): Οι τιμές του p της απόστασης Minkowski που θα εξεταστούν.
+            sample_fraction (float): Το ποσοστό (0, 1] των δεδομένων εκπαίδευσης (στρωματοποιημένο δείγμα) στο οποίο
+                γίνεται το cross-validation. Οι μετρικές επικύρωσης υπολογίζονται πάντα με όλα τα δεδομένα εκπαίδευσης.
+            executor (DistributedSearch, optional): Εκτέλεση του cross-validation σε workers (βλ. distributed.py) αντί για
+                GridSearchCV σε αυτόν τον υπολογιστή. Τα σκορ κάθε (αριθμού folds, αριθμού γειτόνων) προστίθενται στα
+                detailed_results μόλις ολοκληρωθούν όλα τα splits του.
 
         Raises:
-            ValueError: Αν η μετρική που έχει δοθεί δεν είναι έγκυρη.
+            ValueError: Αν ο αριθμός γειτόνων έχει ήδη οριστεί, αν η μετρική, η στάθμιση ή το ποσοστό δείγματος δεν
+            είναι έγκυρα ή αν ζητηθεί εκτεταμένη αναζήτηση με προσεγγιστικό ευρετήριο ή με executor.
         """
 
         if self.best_n_neighbors is not None:
@@ -58,6 +601,47 @@ class KNN:
                 "Ο αριθμός γειτόνων έχει ήδη οριστεί."
             )
 
+        if self.metric not in SCORING:
+            raise ValueError(f"Invalid scoring method '{self.metric}'. Available methods are: {', '.join(SCORING.keys())}")
+
+        if not 0 < sample_fraction <= 1:
+            raise ValueError("Το ποσοστό δείγματος πρέπει να είναι στο διάστημα (0, 1].")
+        X_search, y_search = self.X_train, self.y_train
+        if sample_fraction < 1:
+            X_search, _, y_search, _ = train_test_split(
+                self.X_train,
+                self.y_train,
+                train_size=sample_fraction,
+                shuffle=True,
+                random_state=self.random_state,
+                stratify=self.y_train,
+            )
+
+        if weights is not None or p_values is not None:
+            weights = tuple(weights or ("uniform",))
+            p_values = tuple(p_values or (2,))
+            invalid = [w for w in weights if w not in WEIGHT_OPTIONS]
+            if invalid:
+                raise ValueError(f"Invalid weights '{invalid[0]}'. Available weights are: {', '.join(WEIGHT_OPTIONS)}")
+            if any(p < 1 for p in p_values):
+                raise ValueError("Η παράμετρος p της απόστασης Minkowski πρέπει να είναι τουλάχιστον 1.")
+            if self.index != "exact":
+                raise ValueError("Η αναζήτηση στάθμισης και p υποστηρίζεται μόνο με ακριβή αναζήτηση γειτόνων.")
+            if executor is not None:
+                raise ValueError("Η αναζήτηση στάθμισης και p δεν υποστηρίζεται με κατανεμημένη εκτέλεση.")
+            self.detailed_results.extend(
+                self._shared_neighbor_search(X_search, y_search, list(k_range), fold_range, weights, p_values)
+            )
+            self.cv_results_table = pd.DataFrame(self.detailed_results)
+            self.select_best_neighbors()
+            return
+
+        if executor is not None:
+            self._distributed_search(executor, X_search, y_search, list(k_range), fold_range)
+            self.cv_results_table = pd.DataFrame(self.detailed_results)
+            self.select_best_neighbors()
+            return
+
         # Ορισμός του pipeline με τον preprocessor και τον classifier KNN
         knn = Pipeline(
             [
@@ -71,14 +655,8 @@ class KNN:
             "classifier__n_neighbors": k_range,
         }
 
-        # Ορισμός των διαθέσιμων μετρικών χρησιμοποιηθούν για την αξιολόγηση του μοντέλου
-        scoring = {
-            "precision": "precision_macro",
-            "accuracy": "accuracy",
-        }
-
-        if self.metric not in scoring:
-            raise ValueError(f"Invalid scoring method '{self.metric}'. Available methods are: {', '.join(scoring.keys())}")
+        # Οι μετρικές επικύρωσης για κάθε αριθμό γειτόνων (δεν εξαρτώνται από τον αριθμό των folds)
+        validation_scores = self._validation_scores(list(k_range))
 
         # Εκτέλεση του grid search για κάθε fold στο εύρος που έχει οριστεί
         for c in fold_range:
@@ -86,52 +664,235 @@ class KNN:
                 knn,
                 param_grid,
                 cv=StratifiedKFold(n_splits=c),
-                scoring=scoring,
-                refit=self.metric, # type: ignore
-                n_jobs=-1,
+                scoring=SCORING,
+                refit=False, # Η επιλογή γίνεται από τον πίνακα αποτελεσμάτων, δεν χρειάζεται το best_estimator_
+                n_jobs=self.resources.n_jobs,
                 return_train_score=True,
             )
 
             # Εκπαίδευση του grid search με τα δεδομένα εκπαίδευσης
-            grid_search.fit(self.X_train, self.y_train)
+            grid_search.fit(X_search, y_search)
+
+            # Αποθήκευση λεπτομερών αποτελεσμάτων (για καθε αριθμό γειτόνων) για το τρέχον fold
+            cv_results = grid_search.cv_results_
+            for i, n in enumerate(cv_results["param_classifier__n_neighbors"]):
+                self.detailed_results.append(
+                    {
+                        "cv": c,
+                        "neighbors": int(n),
+                        "weights": "uniform",
+                        "p": 2,
+                        "cv_precision": cv_results["mean_test_precision"][i],
+                        "cv_accuracy": cv_results["mean_test_accuracy"][i],
+                        "std_precision": cv_results["std_test_precision"][i],
+                        "std_accuracy": cv_results["std_test_accuracy"][i],
+                        "valid_accuracy": validation_scores[(int(n), "uniform", 2)]["accuracy"],
+                        "valid_precision": validation_scores[(int(n), "uniform", 2)]["precision"],
+                    }
+                )
+
+        # Ο πίνακας αποτελεσμάτων σε στηλοθετική μορφή
+        self.cv_results_table = pd.DataFrame(self.detailed_results)
+        self.select_best_neighbors()
 
-            # Αποθήκευση του καλύτερου αριθμού γειτόνων και των μετρικών
-            current_best_n_neighbors = grid_search.best_params_["classifier__n_neighbors"]
+    def _distributed_search(self, executor, X_search, y_search, k_values, fold_range):
+        """
+        Το cross-validation της find_best_neighbors() μέσω executor (βλ. DistributedSearch.cross_validate()).
 
-            # Πρόβλεψη με χρήση του μοντέλου με τις καλύτερες παραμέτρους (για plotting, δεν επιρεάζει πιο Κ θα χρησιμοποιηθεί τελικά)
-            best_model = grid_search.best_estimator_
-            y_pred = best_model.predict(self.X_valid)
-            accuracy = accuracy_score(self.y_valid, y_pred)
-            precision = precision_score(self.y_valid, y_pred, average="macro", zero_division=0) # type: ignore
+        Οι εγγραφές προστίθενται στα detailed_results καθώς επιστρέφουν και στο τέλος ταξινομούνται ανά (αριθμό
+        folds, αριθμό γειτόνων), όπως στο GridSearchCV.
+        """
 
-            # Αποθήκευση των αποτελεσμάτων για το τρέχον fold
-            self.results.append(
+        validation_scores = self._validation_scores(k_values)
+        start = len(self.detailed_results)
+        for c, n, cv_scores in executor.cross_validate(X_search, y_search, self.preprocessor, k_values, fold_range):
+            self.detailed_results.append(
                 {
                     "cv": c,
-                    "neighbors": current_best_n_neighbors,
-                    "cv_accuracy": accuracy,
-                    "cv_precision": precision,
+                    "neighbors": int(n),
+                    "weights": "uniform",
+                    "p": 2,
+                    "cv_precision": np.mean(cv_scores["precision"]),
+                    "cv_accuracy": np.mean(cv_scores["accuracy"]),
+                    "std_precision": np.std(cv_scores["precision"]),
+                    "std_accuracy": np.std(cv_scores["accuracy"]),
+                    "valid_accuracy": validation_scores[(int(n), "uniform", 2)]["accuracy"],
+                    "valid_precision": validation_scores[(int(n), "uniform", 2)]["precision"],
                 }
             )
+        self.detailed_results[start:] = sorted(self.detailed_results[start:], key=lambda row: (row["cv"], row["neighbors"]))
 
-            # Αποθήκευση λεπτομερών αποτελεσμάτων (για καθε αριθμό γειτόνων) για το τρέχον fold
-            for mean_precision, mean_accuracy, n in zip(
-                grid_search.cv_results_["mean_test_precision"],
-                grid_search.cv_results_["mean_test_accuracy"],
-                grid_search.cv_results_["param_classifier__n_neighbors"],
-            ):
-                self.detailed_results.append(
+    def _shared_neighbor_search(self, X_search, y_search, k_values, fold_range, weights, p_values):
+        """
+        Αξιολογεί με cross-validation όλους τους συνδυασμούς (αριθμός γειτόνων, στάθμιση, p) με κοινούς υπολογισμούς γειτόνων.
+
+        Σε κάθε split ο preprocessor εκπαιδεύεται μία φορά και οι γείτονες του τμήματος ελέγχου υπολογίζονται μία
+        φορά ανά p για τον μέγιστο αριθμό γειτόνων. Κάθε μικρότερος αριθμός γειτόνων και κάθε στάθμιση αξιολογούνται
+        κρατώντας τους πρώτους γείτονες και τις αποστάσεις τους, οπότε το κόστος εξαρτάται από το πλήθος των p και
+        όχι από το πλήθος των συνδυασμών.
+
+        Parameters:
+            X_search (pd.DataFrame): Τα χαρακτηριστικά του cross-validation.
+            y_search (pd.Series): Η ανταπόκριση του cross-validation.
+            k_values (list): Οι αριθμοί γειτόνων που θα αξιολογηθούν.
+            fold_range (range): Το εύρος των τιμών για τον αριθμό των folds.
+            weights (tuple): Οι τρόποι στάθμισης των ψήφων.
+            p_values (tuple): Οι τιμές του p της απόστασης Minkowski.
+
+        Returns:
+            list: Μία εγγραφή (dict) ανά (αριθμό folds, p, στάθμιση, αριθμό γειτόνων), με τις στήλες του cv_results_table.
+        """
+
+        classes, y_codes = np.unique(np.asarray(y_search, dtype=str), return_inverse=True)
+        configs = [(k, w, p) for p in p_values for w in weights for k in k_values]
+        validation_scores = self._validation_scores(k_values, weights, p_values)
+
+        rows = []
+        for c in fold_range:
+            accuracy = {config: [] for config in configs}
+            precision = {config: [] for config in configs}
+            for train_idx, test_idx in StratifiedKFold(n_splits=c).split(X_search, y_codes):
+                preprocessor = clone(self.preprocessor)
+                X_fold_train = preprocessor.fit_transform(X_search.iloc[train_idx])
+                X_fold_test = preprocessor.transform(X_search.iloc[test_idx])
+                max_k = min(max(k_values), len(train_idx))
+
+                for p in p_values:
+                    index = NearestNeighbors(n_neighbors=max_k, p=p).fit(X_fold_train)
+                    distances, indices = index.kneighbors(X_fold_test)
+                    neighbor_codes = y_codes[train_idx][indices]
+                    for w in weights:
+                        for k in k_values:
+                            y_pred = neighbor_votes(
+                                neighbor_codes, min(k, max_k), len(classes), distances if w == "distance" else None
+                            )
+                            accuracy[(k, w, p)].append(accuracy_score(y_codes[test_idx], y_pred))
+                            precision[(k, w, p)].append(
+                                precision_score(y_codes[test_idx], y_pred, average="macro", zero_division=0)
+                            )
+
+            for k, w, p in configs:
+                rows.append(
                     {
                         "cv": c,
-                        "neighbors": n,
-                        "cv_precision": mean_precision,
-                        "cv_accuracy": mean_accuracy,
+                        "neighbors": k,
+                        "weights": w,
+                        "p": p,
+                        "cv_precision": np.mean(precision[(k, w, p)]),
+                        "cv_accuracy": np.mean(accuracy[(k, w, p)]),
+                        "std_precision": np.std(precision[(k, w, p)]),
+                        "std_accuracy": np.std(accuracy[(k, w, p)]),
+                        "valid_accuracy": validation_scores[(k, w, p)]["accuracy"],
+                        "valid_precision": validation_scores[(k, w, p)]["precision"],
                     }
                 )
+        return rows
+
+    def _validation_scores(self, k_values, weights=("uniform",), p_values=(2,)):
+        """
+        Υπολογίζει τις μετρικές επικύρωσης για κάθε συνδυασμό (αριθμός γειτόνων, στάθμιση, p) με μία αναζήτηση γειτόνων ανά p.
+
+        Οι γείτονες του συνόλου επικύρωσης υπολογίζονται μία φορά για τον μέγιστο αριθμό γειτόνων και κάθε
+        μικρότερος αριθμός αξιολογείται κρατώντας τους πρώτους γείτονες.
+
+        Parameters:
+            k_values (list): Οι αριθμοί γειτόνων που θα αξιολογηθούν.
+            weights (tuple): Οι τρόποι στάθμισης των ψήφων.
+            p_values (tuple): Οι τιμές του p της απόστασης Minkowski.
+
+        Returns:
+            dict: Για κάθε (αριθμό γειτόνων, στάθμιση, p), ένα dict με τα "accuracy" και "precision" στο σύνολο επικύρωσης.
+        """
+
+        preprocessor = clone(self.preprocessor)
+        X_train = preprocessor.fit_transform(self.X_train)
+        X_valid = preprocessor.transform(self.X_valid)
+
+        classes, y_train_codes = np.unique(self.y_train, return_inverse=True)
+        max_k = min(max(k_values), X_train.shape[0])
+
+        scores = {}
+        for p in p_values:
+            index = NearestNeighbors(n_neighbors=max_k, p=p).fit(X_train)
+            distances, indices = index.kneighbors(X_valid)
+            neighbor_codes = y_train_codes[indices]
+            for w in weights:
+                for k in k_values:
+                    y_pred = classes[neighbor_votes(
+                        neighbor_codes, min(k, max_k), len(classes), distances if w == "distance" else None
+                    )]
+                    scores[(k, w, p)] = {
+                        "accuracy": accuracy_score(self.y_valid, y_pred),
+                        "precision": precision_score(self.y_valid, y_pred, average="macro", zero_division=0), # type: ignore
+                    }
+        return scores
+
+    def select_best_neighbors(self, metric=None, rule=None):
+        """
+        Επιλέγει τον αριθμό γειτόνων (και τη στάθμιση και το p) από τον αποθηκευμένο πίνακα αποτελεσμάτων, χωρίς νέα αναζήτηση.
 
-        # Μετατροπή των αποτελεσμάτων σε DataFrame και εύρεση του πιο συχνά εμφανιζόμενου αριθμού γειτόνων
-        results_df = pd.DataFrame(self.results)
-        self.best_n_neighbors = results_df["neighbors"].mode().iloc[0]
+        Κανόνες επιλογής:
+            - "mode": ο πιο συχνά εμφανιζόμενος βέλτιστος συνδυασμός ανάμεσα στα folds.
+            - "mean": ο συνδυασμός με τη μεγαλύτερη μέση τιμή της μετρικής σε όλα τα folds.
+            - "one_se": για τη στάθμιση και το p του βέλτιστου συνδυασμού, ο μεγαλύτερος (πιο ομαλός) αριθμός
+              γειτόνων με μέση τιμή εντός ενός τυπικού σφάλματος από τη βέλτιστη.
+
+        Parameters:
+            metric (str, optional): Η μετρική βελτιστοποίησης ("accuracy" ή "precision"). Αν δεν δοθεί, χρησιμοποιείται η self.metric.
+            rule (str, optional): Ο κανόνας επιλογής. Αν δεν δοθεί, χρησιμοποιείται ο self.selection_rule.
+
+        Returns:
+            int: Ο επιλεγμένος αριθμός γειτόνων. Η επιλεγμένη στάθμιση και το p αποθηκεύονται στα best_weights και best_p.
+
+        Raises:
+            ValueError: Αν δεν έχει εκτελεστεί η find_best_neighbors() ή αν η μετρική/ο κανόνας δεν είναι έγκυρα.
+        """
+
+        metric = self.metric if metric is None else metric
+        rule = self.selection_rule if rule is None else rule
+
+        if self.cv_results_table is None:
+            raise ValueError("Δεν υπάρχουν αποτελέσματα αναζήτησης. Καλέστε πρώτα τη μέθοδο find_best_neighbors().")
+        if metric not in SCORING:
+            raise ValueError(f"Invalid scoring method '{metric}'. Available methods are: {', '.join(SCORING.keys())}")
+        if rule not in SELECTION_RULES:
+            raise ValueError(f"Invalid selection rule '{rule}'. Available rules are: {', '.join(SELECTION_RULES)}")
+
+        table = self.cv_results_table
+        score_column = "cv_" + metric
+        config_columns = ["weights", "p", "neighbors"]
+
+        # Βέλτιστος συνδυασμός ανά fold (σε ισοβαθμία ο πρώτος του πίνακα, όπως στο GridSearchCV)
+        best_rows = table.loc[table.groupby("cv", sort=False)[score_column].idxmax()]
+        self.results = [
+            {
+                "cv": row.cv,
+                "neighbors": row.neighbors,
+                "weights": row.weights,
+                "p": row.p,
+                "cv_accuracy": row.valid_accuracy,
+                "cv_precision": row.valid_precision,
+            }
+            for row in best_rows.itertuples(index=False)
+        ]
+
+        if rule == "mode":
+            # Σε ισοβαθμία ο μικρότερος αριθμός γειτόνων
+            best_k, best_weights, best_p = best_rows.groupby(["neighbors", "weights", "p"]).size().idxmax()
+        else:
+            per_config = table.assign(se=table["std_" + metric] / np.sqrt(table["cv"])).groupby(config_columns)[[score_column, "se"]].mean()
+            best_weights, best_p, best_k = per_config[score_column].idxmax()
+            if rule == "one_se":
+                threshold = per_config.loc[(best_weights, best_p, best_k), score_column] - per_config.loc[(best_weights, best_p, best_k), "se"]
+                per_k = per_config.loc[(best_weights, best_p)]
+                best_k = per_k.index[per_k[score_column] >= threshold].max()
+
+        self.metric = metric
+        self.selection_rule = rule
+        self.best_weights = str(best_weights)
+        self.best_p = int(best_p) if float(best_p).is_integer() else float(best_p)
+        self.best_n_neighbors = int(best_k)
+        return self.best_n_neighbors
 
     def feed_data(self, train_data):
         """
@@ -142,20 +903,12 @@ class KNN:
         """
 
         # Διαχωρισμός των δεδομένων σε χαρακτηριστικά (X) και ανταπόκριση (y) (axis=1 για στήλες)
-        self.X = train_data.drop(self.response_column, axis=1)
+        # Η καμπάνια προέλευσης (δεδομένα πολλών αρχείων) δεν είναι χαρακτηριστικό του πελάτη
+        self.X = train_data.drop(self.response_column, axis=1).drop(columns=CAMPAIGN_COLUMN, errors="ignore")
         self.y = train_data[self.response_column]
 
-        # Διαχωρισμός των χαρακτηριστικών σε κατηγορικά και αριθμητικά
-        categorical_cols = self.X.select_dtypes(include=["category", "object"]).columns.tolist()
-        numeric_cols = self.X.select_dtypes(include=["int64", "float64"]).columns.tolist()
-
-        # Αρχικοποίηση του preprocessor με StandardScaler για αριθμητικά χαρακτηριστικά και OneHotEncoder για κατηγορικά χαρακτηριστικά
-        self.preprocessor = ColumnTransformer(
-            transformers= [
-                ("num", StandardScaler(), numeric_cols), # Κανονικοποίηση των αριθμητικών χαρακτηριστικών
-                ("cat", OneHotEncoder(), categorical_cols) # Μετατροπή των κατηγορικών χαρακτηριστικών σε δυαδική μορφή
-            ]
-        )
+        self.selected_features = None
+        self.preprocessor = self._make_preprocessor(self.X.columns)
 
         # Διαχωρισμός των δεδομένων σε σύνολα εκπαίδευσης και επικύρωσης
         self.X_train, self.X_valid, self.y_train, self.y_valid = train_test_split(
@@ -167,6 +920,150 @@ class KNN:
             stratify=self.y,
         )
 
+    def _make_preprocessor(self, features):
+        """
+        Δημιουργεί τον preprocessor για ένα υποσύνολο των χαρακτηριστικών του X (οι υπόλοιπες στήλες αγνοούνται).
+
+        Parameters:
+            features (list): Τα χαρακτηριστικά που θα χρησιμοποιηθούν.
+
+        Returns:
+            ColumnTransformer: Ο (μη εκπαιδευμένος) preprocessor.
+        """
+
+        # Διαχωρισμός των χαρακτηριστικών σε κατηγορικά και αριθμητικά
+        X = self.X[list(features)]
+        categorical_cols = X.select_dtypes(include=["category", "object"]).columns.tolist()
+        numeric_cols = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
+
+        # Αρχικοποίηση του preprocessor με StandardScaler για αριθμητικά χαρακτηριστικά και OneHotEncoder για κατηγορικά χαρακτηριστικά
+        # Μια ομάδα χωρίς στήλες παραλείπεται, αλλιώς ο transformer της μένει μη εκπαιδευμένος (βλ. fitted_group())
+        # Η έξοδος είναι πάντα πυκνός πίνακας (sparse_threshold=0): το σύνολο αναφοράς, το kd-tree και η cache
+        # προβλέψεων δουλεύουν με πυκνούς πίνακες, ενώ με πολλές κατηγορίες ο ColumnTransformer θα έδινε αραιό
+        transformers = []
+        if numeric_cols:
+            transformers.append(("num", StandardScaler(), numeric_cols)) # Κανονικοποίηση των αριθμητικών χαρακτηριστικών
+        if categorical_cols:
+            transformers.append(("cat", OneHotEncoder(), categorical_cols)) # Μετατροπή των κατηγορικών χαρακτηριστικών σε δυαδική μορφή
+        return ColumnTransformer(transformers=transformers, sparse_threshold=0)
+
+    @governed
+    def select_features(self, direction="forward", n_neighbors=None, n_splits=5, tolerance=0.0,
+                        max_rows=FEATURE_SELECTION_ROWS):
+        """
+        Άπληστη επιλογή των χαρακτηριστικών που χρησιμοποιούνται στην απόσταση, με σκορ cross-validation.
+
+        Η τετραγωνική Ευκλείδεια απόσταση είναι άθροισμα όρων ανά χαρακτηριστικό (μία στήλη για τα αριθμητικά,
+        οι στήλες του one-hot encoding για τα κατηγορικά). Οι πίνακες (n x n) αυτών των όρων υπολογίζονται μία φορά
+        σε ένα στρωματοποιημένο δείγμα των δεδομένων εκπαίδευσης. Κάθε υποψήφιο υποσύνολο αξιολογείται με μία
+        πρόσθεση (forward) ή αφαίρεση (backward) ενός πίνακα από το άθροισμα του τρέχοντος υποσυνόλου, χωρίς νέο
+        υπολογισμό αποστάσεων. Ο preprocessor εκπαιδεύεται μία φορά σε όλο το δείγμα, οπότε τα σκορ χρησιμεύουν
+        για σύγκριση υποσυνόλων και όχι ως εκτίμηση της απόδοσης του μοντέλου.
+
+            - "forward": ξεκινά χωρίς χαρακτηριστικά και προσθέτει κάθε φορά αυτό που βελτιώνει περισσότερο το σκορ,
+              όσο η βελτίωση ξεπερνά το tolerance.
+            - "backward": ξεκινά με όλα και αφαιρεί κάθε φορά αυτό που μειώνει λιγότερο το σκορ, όσο η μείωση δεν
+              ξεπερνά το tolerance.
+
+        Το επιλεγμένο υποσύνολο ορίζει τον preprocessor του μοντέλου. Ακολουθούν η find_best_neighbors() (ή ο
+        ορισμός του αριθμού γειτόνων) και η fit().
+
+        Parameters:
+            direction (str): Η κατεύθυνση της αναζήτησης (βλ. SELECTION_DIRECTIONS).
+            n_neighbors (int, optional): Ο αριθμός γειτόνων της αξιολόγησης. Αν δεν δοθεί, ο best_n_neighbors ή 5.
+            n_splits (int): Ο αριθμός των folds.
+            tolerance (float): Η ελάχιστη βελτίωση (forward) ή η μέγιστη επιτρεπτή μείωση (backward) του σκορ.
+            max_rows (int): Το μέγιστο μέγεθος του δείγματος.
+
+        Returns:
+            list: Τα επιλεγμένα χαρακτηριστικά, με τη σειρά των στηλών του X.
+
+        Raises:
+            ValueError: Αν δεν έχουν τροφοδοτηθεί δεδομένα, αν η κατεύθυνση ή η μετρική δεν είναι έγκυρες.
+        """
+
+        if self.X is None:
+            raise ValueError(
+                "Τα δεδομένα εκπαίδευσης δεν έχουν τροφοδοτηθεί στο μοντέλο. Καλέστε πρώτα τη μέθοδο feed_data()."
+            )
+        if direction not in SELECTION_DIRECTIONS:
+            raise ValueError(f"Invalid direction '{direction}'. Available directions are: {', '.join(SELECTION_DIRECTIONS)}")
+        if self.metric not in SCORING:
+            raise ValueError(f"Invalid scoring method '{self.metric}'. Available methods are: {', '.join(SCORING.keys())}")
+
+        k = n_neighbors or self.best_n_neighbors or 5
+        features = list(self.X.columns)
+        X_sample, y_sample = self.X_train, self.y_train
+        if len(X_sample) > max_rows:
+            X_sample, _, y_sample, _ = train_test_split(
+                self.X_train,
+                self.y_train,
+                train_size=max_rows,
+                shuffle=True,
+                random_state=self.random_state,
+                stratify=self.y_train,
+            )
+        classes, y_codes = np.unique(np.asarray(y_sample, dtype=str), return_inverse=True)
+        folds = list(StratifiedKFold(n_splits=n_splits).split(X_sample, y_codes))
+
+        # Ο πίνακας τετραγωνικών αποστάσεων ανά χαρακτηριστικό (float32 για μικρότερη μνήμη)
+        preprocessor = self._make_preprocessor(features).fit(X_sample)
+        X_t = preprocessor.transform(X_sample)
+        X_t = np.asarray(X_t.toarray() if hasattr(X_t, "toarray") else X_t, dtype=np.float64)
+        _, numeric_cols = fitted_group(preprocessor, "num")
+        encoder, categorical_cols = fitted_group(preprocessor, "cat")
+        widths = [1] * len(numeric_cols) + [len(c) for c in (encoder.categories_ if encoder is not None else [])]
+        bounds = np.cumsum([0] + widths)
+        components = {}
+        for feature, start, stop in zip([*numeric_cols, *categorical_cols], bounds[:-1], bounds[1:]):
+            block = X_t[:, start:stop]
+            norms = (block ** 2).sum(axis=1)
+            components[feature] = np.maximum(norms[:, None] + norms[None, :] - 2 * block @ block.T, 0).astype(np.float32)
+
+        def score(distances):
+            return subset_cv_score(distances, y_codes, folds, k, len(classes), self.metric)
+
+        self.feature_selection_results = []
+        if direction == "forward":
+            # Τα αθροίσματα σε float64, ώστε οι ισοπαλίες να μην εξαρτώνται από τη σειρά των προσθέσεων
+            selected, current, current_score = [], np.zeros((len(X_sample), len(X_sample))), -np.inf
+            while len(selected) < len(features):
+                candidates = [(score(current + components[f]), f) for f in features if f not in selected]
+                best_score, best_feature = max(candidates, key=lambda candidate: candidate[0])
+                if selected and best_score <= current_score + tolerance:
+                    break
+                selected.append(best_feature)
+                current += components[best_feature]
+                current_score = best_score
+                self.feature_selection_results.append(
+                    {"step": len(self.feature_selection_results) + 1, "action": "add", "feature": best_feature,
+                     "score": best_score, "n_features": len(selected)}
+                )
+        else:
+            selected = list(features)
+            current = sum(components[f].astype(np.float64) for f in features)
+            current_score = score(current)
+            self.feature_selection_results.append(
+                {"step": 0, "action": "start", "feature": None, "score": current_score, "n_features": len(selected)}
+            )
+            while len(selected) > 1:
+                candidates = [(score(current - components[f]), f) for f in selected]
+                best_score, best_feature = max(candidates, key=lambda candidate: candidate[0])
+                if best_score < current_score - tolerance:
+                    break
+                selected.remove(best_feature)
+                current -= components[best_feature]
+                current_score = best_score
+                self.feature_selection_results.append(
+                    {"step": len(self.feature_selection_results), "action": "remove", "feature": best_feature,
+                     "score": best_score, "n_features": len(selected)}
+                )
+
+        self.selected_features = [f for f in features if f in selected]
+        self.preprocessor = self._make_preprocessor(self.selected_features)
+        return self.selected_features
+
+    @governed
     def fit(self):
         """
         Εκπαίδευση του μοντέλου KNN με τα δεδομένα εκπαίδευσης και τον καλύτερο αριθμό γειτόνων που έχει βρεθεί ή εχει οριστεί.
@@ -188,49 +1085,408 @@ class KNN:
         self.final_model = Pipeline(
             [
                 ("preprocessor", self.preprocessor),
-                ("classifier", KNeighborsClassifier(n_neighbors=self.best_n_neighbors)),
+                ("classifier", self._make_classifier()),
             ]
         )
 
         # Εκπαίδευση του τελικού μοντέλου με τα δεδομένα εκπαίδευσης
         self.final_model.fit(self.X, self.y)
+        self.index_recall = getattr(self.final_model.named_steps["classifier"], "recall_", None)
+
+        # Το σύνολο αναφοράς του classifier, ώστε νέες παρατηρήσεις να προστίθενται χωρίς νέα προεπεξεργασία
+        self.X_reference = np.asarray(self.final_model[:-1].transform(self.X), dtype=np.float64)
+        self.neighbor_cache = None  # Οι γείτονες προηγούμενων προβλέψεων αφορούν το προηγούμενο σύνολο αναφοράς
+
+    def _make_classifier(self):
+        """
+        Δημιουργεί τον classifier του τελικού μοντέλου με το ευρετήριο γειτόνων που έχει οριστεί.
+        """
+
+        if self.index == "rpforest":
+            return ApproximateKNeighborsClassifier(
+                n_neighbors=self.best_n_neighbors, random_state=self.random_state, **self.index_params
+            )
+        return StableKNeighborsClassifier(n_neighbors=self.best_n_neighbors, weights=self.best_weights, p=self.best_p)
+
+    @governed
+    def add_observations(self, new_data, recheck_neighbors=False):
+        """
+        Προσθέτει παρατηρήσεις με γνωστή ανταπόκριση (π.χ. από καμπάνια που ολοκληρώθηκε) στο εκπαιδευμένο μοντέλο.
+
+        Οι νέες γραμμές μετασχηματίζονται με τον ήδη εκπαιδευμένο preprocessor (scaler/encoder) και προστίθενται στο
+        σύνολο αναφοράς του classifier, του οποίου το ευρετήριο γειτόνων ξαναχτίζεται. Αν οι νέες παρατηρήσεις
+        περιέχουν άγνωστες κατηγορίες ή η μετατόπισή τους ξεπερνά το drift_threshold, γίνεται πλήρης επανεκπαίδευση.
+        Οι νέες παρατηρήσεις προστίθενται και στο σύνολο εκπαίδευσης· το σύνολο επικύρωσης δεν αλλάζει. Αν οι
+        ετικέτες τους υπάρχουν ήδη στα δεδομένα εκπαίδευσης, αριθμούνται εκ νέου μετά τους υπάρχοντες πελάτες.
 
-    def predict(self, new_data, output_path=None):
+        Parameters:
+            new_data (pd.DataFrame): Οι νέες παρατηρήσεις, με συμπληρωμένη τη στήλη της ανταπόκρισης.
+            recheck_neighbors (bool): Αν θα επανελεγχθεί ο αριθμός γειτόνων γύρω από την τρέχουσα τιμή (βλ. recheck_neighbors()).
+
+        Returns:
+            bool: True αν έγινε πλήρης επανεκπαίδευση, False αν οι παρατηρήσεις προστέθηκαν στο υπάρχον μοντέλο.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί ή αν λείπουν τιμές ανταπόκρισης.
+        """
+
+        if self.final_model is None:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+        if new_data[self.response_column].isna().any():
+            raise ValueError("Οι νέες παρατηρήσεις πρέπει να έχουν συμπληρωμένη τη στήλη της ανταπόκρισης.")
+
+        X_new = new_data[self.X.columns]
+        y_new = new_data[self.response_column].astype(str)
+        drift = self.observation_drift(X_new)
+
+        # Κάθε αρχείο καμπάνιας αριθμεί τους πελάτες από 'Πελάτης 1' (βλ. load_campaign_file()), οπότε νέες γραμμές
+        # με ετικέτες που υπάρχουν ήδη συνεχίζουν την αρίθμηση, ώστε κάθε πελάτης του συνόλου αναφοράς να είναι μοναδικός
+        if X_new.index.has_duplicates or X_new.index.isin(self.X.index).any():
+            start = len(self.X)
+            labels = pd.Index([f"Πελάτης {start + i + 1}" for i in range(len(X_new))])
+            while labels.isin(self.X.index).any():
+                start += len(X_new)
+                labels = pd.Index([f"Πελάτης {start + i + 1}" for i in range(len(X_new))])
+            X_new, y_new = X_new.set_axis(labels), y_new.set_axis(labels)
+
+        self.X = pd.concat([self.X, X_new])
+        self.y = pd.concat([self.y.astype(str), y_new])
+        self.X_train = pd.concat([self.X_train, X_new])
+        self.y_train = pd.concat([self.y_train.astype(str), y_new])
+
+        full_refit = drift > self.drift_threshold
+        if full_refit:
+            self.fit()
+        else:
+            # Προσθήκη των νέων γραμμών στο σύνολο αναφοράς με τον ήδη εκπαιδευμένο preprocessor
+            X_new_transformed = self.final_model.named_steps["preprocessor"].transform(X_new)
+            self.X_reference = np.vstack([self.X_reference, np.asarray(X_new_transformed, dtype=np.float64)])
+            self.final_model.named_steps["classifier"].fit(self.X_reference, self.y)
+            self.neighbor_cache = None
+            self.index_recall = getattr(self.final_model.named_steps["classifier"], "recall_", None)
+
+        if recheck_neighbors:
+            self.recheck_neighbors()
+
+        return full_refit
+
+    def observation_drift(self, X_new):
+        """
+        Υπολογίζει πόσο διαφέρουν νέες παρατηρήσεις από τα δεδομένα με τα οποία εκπαιδεύτηκε ο preprocessor.
+
+        Parameters:
+            X_new (pd.DataFrame): Τα χαρακτηριστικά των νέων παρατηρήσεων.
+
+        Returns:
+            float: Η μέγιστη απόλυτη μέση τιμή των τυποποιημένων αριθμητικών χαρακτηριστικών, ή inf αν
+            υπάρχουν κατηγορίες που δεν είχε δει ο encoder.
+        """
+
+        preprocessor = self.final_model.named_steps["preprocessor"]
+        scaler, numeric_cols = fitted_group(preprocessor, "num")
+        encoder, categorical_cols = fitted_group(preprocessor, "cat")
+
+        for col, categories in zip(categorical_cols, encoder.categories_ if encoder is not None else []):
+            if not X_new[col].isin(categories).all():
+                return float("inf")
+
+        if not numeric_cols or len(X_new) == 0:
+            return 0.0
+        scaled = scaler.transform(X_new[numeric_cols])
+        return float(np.abs(scaled.mean(axis=0)).max())
+
+    @governed
+    def recheck_neighbors(self, window=2, n_splits=5):
+        """
+        Επανελέγχει τον αριθμό γειτόνων μόνο σε ένα παράθυρο γύρω από την τρέχουσα τιμή.
+
+        Χρησιμοποιεί ένα μόνο StratifiedKFold πάνω στο προεπεξεργασμένο σύνολο αναφοράς: σε κάθε split οι
+        γείτονες υπολογίζονται μία φορά για τον μέγιστο υποψήφιο αριθμό και κάθε υποψήφιος αξιολογείται από αυτούς.
+        Η στάθμιση και το p του μοντέλου δεν αλλάζουν.
+
+        Parameters:
+            window (int): Πόσες τιμές πάνω και κάτω από τον τρέχοντα αριθμό γειτόνων θα εξεταστούν.
+            n_splits (int): Ο αριθμός των folds.
+
+        Returns:
+            int: Ο επιλεγμένος αριθμός γειτόνων.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί.
+        """
+
+        if self.final_model is None:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+
+        candidates = list(range(max(1, self.best_n_neighbors - window), self.best_n_neighbors + window + 1))
+        classes, y_codes = np.unique(self.y, return_inverse=True)
+        scores = np.zeros(len(candidates))
+
+        for train_idx, test_idx in StratifiedKFold(n_splits=n_splits).split(self.X_reference, y_codes):
+            max_k = min(candidates[-1], len(train_idx))
+            index = NearestNeighbors(n_neighbors=max_k, p=self.best_p).fit(self.X_reference[train_idx])
+            distances, indices = index.kneighbors(self.X_reference[test_idx])
+            neighbor_codes = y_codes[train_idx][indices]
+            distances = distances if self.best_weights == "distance" else None
+            for i, k in enumerate(candidates):
+                y_pred = neighbor_votes(neighbor_codes, min(k, max_k), len(classes), distances)
+                if self.metric == "precision":
+                    scores[i] += precision_score(y_codes[test_idx], y_pred, average="macro", zero_division=0)
+                else:
+                    scores[i] += accuracy_score(y_codes[test_idx], y_pred)
+
+        # Σε ισοβαθμία κρατάμε τον μικρότερο αριθμό γειτόνων, όπως και στην αρχική αναζήτηση
+        self.best_n_neighbors = candidates[int(np.argmax(scores))]
+        self.final_model.named_steps["classifier"].set_params(n_neighbors=self.best_n_neighbors)
+        return self.best_n_neighbors
+
+    @governed
+    def predict(self, new_data, output_path=None, keep_neighbors=None):
         """
         Κάνει προβλέψεις με το εκπαιδευμένο μοντέλο KNN για νέα δεδομένα.
 
         Parameters:
             new_data (pd.DataFrame): Τα νέα δεδομένα για τα οποία θα γίνουν προβλέψεις.
-            output_path (str, optional): Το path για την αποθήκευση των αποτελεσμάτων σε αρχείο Excel. Αν δεν δοθεί, δεν θα αποθηκευτούν τα αποτελέσματα.
+            output_path (str, optional): Το path για την αποθήκευση των αποτελεσμάτων (.xlsx, .csv ή .parquet). Αν δεν δοθεί, δεν θα αποθηκευτούν τα αποτελέσματα.
+            keep_neighbors (int, optional): Αν δοθεί, οι keep_neighbors πλησιέστεροι γείτονες κάθε πελάτη κρατούνται στο
+                neighbor_cache (βλ. NeighborCache) και η πρόβλεψη γίνεται από αυτούς. Η cache προβλέψεων δεν χρησιμοποιείται.
 
         Returns:
             pd.DataFrame: Ένα DataFrame που περιέχει τα νέα δεδομένα με τις αντίστοιχες προβλέψεις στην στήλη της ανταπόκρισης.
+            Το πλήθος των προβλέψεων ανά τμήμα πελατών αποθηκεύεται στο segment_counts.
 
         Raises:
-            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί ή αν δεν έχουν τροφοδοτηθεί τα νέα δεδομένα.
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί, αν δεν έχουν τροφοδοτηθεί τα νέα δεδομένα ή αν το
+            keep_neighbors είναι μικρότερο από τον αριθμό γειτόνων του μοντέλου.
         """
 
         if self.final_model is None:
             raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
 
         # Κανει την πρόβλεψη για τα νέα δεδομένα
-        predictions_new = self.final_model.predict(new_data)
+        if keep_neighbors is not None:
+            self.neighbor_cache = self.cache_neighbors(new_data, keep_neighbors)
+            predictions_new = self.neighbor_cache.predict(self.best_n_neighbors, self.best_weights)
+        elif self.prediction_cache is not None:
+            predictions_new, _ = self._cached_predictions(new_data)
+        else:
+            predictions_new = self.final_model.predict(new_data)
+        self.segment_counts = segment_counts(new_data, predictions_new, self.final_model.classes_)
 
         # Αντιγραφή των νέων δεδομένων και προσθήκη των προβλέψεων στην αντίστοιχη στήλη
         result_df = new_data.copy()
         result_df[self.response_column] = predictions_new
 
-        # Αν το output_path έχει δοθεί, αποθηκεύει τα αποτελέσματα σε αρχείο Excel
+        # Αν το output_path έχει δοθεί, αποθηκεύει τα αποτελέσματα (η μορφή επιλέγεται από την επέκταση)
         if output_path:
-            result_df.to_excel(output_path, index=False)
+            export_predictions(result_df, output_path, index=False)
 
         # Επιστρέφει το DataFrame με τα αποτελέσματα
         return result_df
 
-    def gen_metrics(self):
+    @governed
+    def predict_proba(self, new_data):
+        """
+        Υπολογίζει για κάθε νέο πελάτη το ποσοστό των γειτόνων του με θετική ανταπόκριση.
+
+        Parameters:
+            new_data (pd.DataFrame): Τα νέα δεδομένα για τα οποία θα υπολογιστούν τα σκορ.
+
+        Returns:
+            np.ndarray: Το ποσοστό ψήφων των γειτόνων υπέρ του POSITIVE_LABEL για κάθε πελάτη.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί.
+        """
+
+        if self.final_model is None:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+
+        if self.prediction_cache is not None:
+            return self._cached_predictions(new_data)[1]
+        proba = self.final_model.predict_proba(new_data)
+        classes = list(self.final_model.classes_)
+        if POSITIVE_LABEL not in classes:
+            return np.zeros(len(new_data))
+        return proba[:, classes.index(POSITIVE_LABEL)]
+
+    @governed
+    def cache_neighbors(self, new_data, max_k):
+        """
+        Υπολογίζει με μία αναζήτηση τους max_k πλησιέστερους γείτονες κάθε πελάτη (βλ. NeighborCache).
+
+        Parameters:
+            new_data (pd.DataFrame): Τα νέα δεδομένα.
+            max_k (int): Ο μέγιστος αριθμός γειτόνων (περιορίζεται στο μέγεθος του συνόλου αναφοράς).
+
+        Returns:
+            NeighborCache: Οι γείτονες κάθε πελάτη.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί ή αν το max_k είναι μικρότερο από τον αριθμό γειτόνων του μοντέλου.
+        """
+
+        if self.final_model is None:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+        if max_k < self.best_n_neighbors:
+            raise ValueError(
+                f"Οι γείτονες της cache ({max_k}) πρέπει να είναι τουλάχιστον όσοι του μοντέλου ({self.best_n_neighbors})."
+            )
+
+        classifier = self.final_model.named_steps["classifier"]
+        X = self.final_model[:-1].transform(new_data)
+        distances, indices = classifier.kneighbors(X, n_neighbors=min(max_k, len(self.X_reference)))
+        return NeighborCache(indices, distances, self._reference_codes(), classifier.classes_, new_data.index, self.X.index)
+
+    def _reference_codes(self):
+        """
+        Ο κωδικός κλάσης (θέση στο classes_ του classifier) κάθε γραμμής του συνόλου αναφοράς.
+
+        Υπολογίζεται από το y, που είναι ευθυγραμμισμένο με το X_reference, και όχι από τα εσωτερικά attributes του
+        classifier.
+        """
+
+        return np.searchsorted(self.final_model.named_steps["classifier"].classes_, np.asarray(self.y))
+
+    def model_fingerprint(self):
+        """
+        Το αποτύπωμα του εκπαιδευμένου μοντέλου: αλλάζει με κάθε αλλαγή του συνόλου αναφοράς, των κλάσεών του ή των
+        παραμέτρων της αναζήτησης γειτόνων, οπότε οι προβλέψεις προηγούμενων μοντέλων δεν χρησιμοποιούνται ποτέ.
+
+        Returns:
+            str: Το αποτύπωμα (hex).
+        """
+
+        classifier = self.final_model.named_steps["classifier"]
+        return array_fingerprint(
+            self.X_reference,
+            self._reference_codes(),
+            np.asarray(classifier.classes_),
+            (self.best_n_neighbors, self.best_weights, self.best_p, self.index, self.random_state),
+            tuple(sorted(self.index_params.items())),
+            tuple(self.selected_features or ()),
+        )
+
+    def _cached_predictions(self, new_data):
+        """
+        Προβλέψεις μέσω της cache: μαζική αναζήτηση όλων των γραμμών και αναζήτηση γειτόνων μόνο για όσες λείπουν.
+
+        Returns:
+            tuple: (κλάσεις, σκορ θετικής ανταπόκρισης) για κάθε γραμμή. Το πλήθος επιτυχιών/αποτυχιών αποθηκεύεται
+            στο cache_stats.
+        """
+
+        X = np.asarray(self.final_model[:-1].transform(new_data), dtype=np.float64)
+        hashes = row_hashes(X)
+        fingerprint = self.model_fingerprint()
+        cached = self.prediction_cache.lookup(fingerprint, hashes)
+        miss = np.array([h not in cached for h in hashes], dtype=bool)
+
+        labels = np.empty(len(X), dtype=object)
+        scores = np.zeros(len(X))
+        hit_positions = np.flatnonzero(~miss)
+        if len(hit_positions):
+            labels[hit_positions], scores[hit_positions] = zip(*(cached[hashes[i]] for i in hit_positions))
+        if miss.any():
+            classifier = self.final_model.named_steps["classifier"]
+            # Η κλάση από το predict_proba (σε ισοψηφία η πρώτη κλάση, όπως το predict), με μία αναζήτηση γειτόνων
+            proba = classifier.predict_proba(X[miss])
+            classes = list(classifier.classes_)
+            labels[miss] = classifier.classes_[proba.argmax(axis=1)]
+            if POSITIVE_LABEL in classes:
+                scores[miss] = proba[:, classes.index(POSITIVE_LABEL)]
+            self.prediction_cache.store(
+                fingerprint, [hashes[i] for i in np.flatnonzero(miss)], labels[miss], scores[miss]
+            )
+        self.cache_stats = {"hits": int(len(hit_positions)), "misses": int(miss.sum())}
+        return labels, scores
+
+    @governed
+    def rank_customers(self, new_data, top_n=None, top_percent=None, output_path=None):
+        """
+        Δημιουργεί τη λίστα στόχευσης: τους top_n (ή το top_percent %) πελάτες με το μεγαλύτερο σκορ ανταπόκρισης.
+
+        Parameters:
+            new_data (pd.DataFrame): Τα νέα δεδομένα προς κατάταξη.
+            top_n (int, optional): Ο αριθμός των πελατών που χωράνε στον προϋπολογισμό της καμπάνιας.
+            top_percent (float, optional): Το ποσοστό των πελατών που θα επιλεγούν.
+            output_path (str, optional): Το path για την αποθήκευση της λίστας (.xlsx, .csv ή .parquet).
+
+        Returns:
+            pd.DataFrame: Οι επιλεγμένοι πελάτες, ταξινομημένοι κατά φθίνον σκορ, με τις στήλες κατάταξης και σκορ.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί ή αν τα top_n/top_percent δεν είναι έγκυρα.
+        """
+
+        scores = self.predict_proba(new_data)
+        ranked_df = rank_by_scores(new_data, scores, self.response_column, top_n=top_n, top_percent=top_percent)
+
+        if output_path:
+            export_predictions(ranked_df, output_path, index=True)
+
+        return ranked_df
+
+    def export_inference(self, path):
+        """
+        Αποθηκεύει το εκπαιδευμένο μοντέλο ως πίνακες NumPy (.npz) για το fast_inference.
+
+        Ο preprocessor μεταφράζεται σε μέσες τιμές/κλίμακες για τα αριθμητικά χαρακτηριστικά και σε αντιστοίχιση
+        (στήλη, κατηγορία) -> θέση για το one-hot encoding, ώστε η πρόβλεψη για μία εγγραφή να γίνεται χωρίς pandas
+        και sklearn. Μαζί αποθηκεύονται το σύνολο αναφοράς, οι κωδικοί των κλάσεών του, η στάθμιση και το p.
+
+        Parameters:
+            path (str): Το path του αρχείου .npz.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί ή χρησιμοποιεί προσεγγιστικό ευρετήριο.
+        """
+
+        if self.final_model is None:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+        if self.index != "exact":
+            raise ValueError("Η εξαγωγή για γρήγορη πρόβλεψη υποστηρίζεται μόνο με ακριβή αναζήτηση γειτόνων.")
+
+        preprocessor = self.final_model.named_steps["preprocessor"]
+        classifier = self.final_model.named_steps["classifier"]
+        # Οι στήλες που δεν επιλέχθηκαν (select_features()) βρίσκονται στο "remainder" και δεν εξάγονται
+        scaler, numeric_cols = fitted_group(preprocessor, "num")
+        encoder, categorical_cols = fitted_group(preprocessor, "cat")
+
+        # Οι στήλες του one-hot encoding ακολουθούν τα αριθμητικά χαρακτηριστικά, με τη σειρά των κατηγοριών
+        category_column, category_value = [], []
+        for col_idx, categories in enumerate(encoder.categories_ if encoder is not None else []):
+            category_column.extend([col_idx] * len(categories))
+            category_value.extend(str(value) for value in categories)
+
+        np.savez(
+            path,
+            columns=np.array(self.X.columns, dtype=str),
+            numeric_columns=np.array(numeric_cols, dtype=str),
+            means=np.asarray(scaler.mean_ if scaler is not None else [], dtype=np.float64),
+            scales=np.asarray(scaler.scale_ if scaler is not None else [], dtype=np.float64),
+            categorical_columns=np.array(categorical_cols, dtype=str),
+            category_column=np.array(category_column, dtype=np.int64),
+            category_value=np.array(category_value, dtype=str),
+            reference=self.X_reference,
+            labels=np.searchsorted(classifier.classes_, np.asarray(self.y, dtype=str)),
+            classes=np.array(classifier.classes_, dtype=str),
+            n_neighbors=np.array(self.best_n_neighbors),
+            weights=np.array(classifier.weights),
+            p=np.array(classifier.p, dtype=np.float64),
+        )
+
+    @governed
+    def gen_metrics(self, n_resamples=BOOTSTRAP_RESAMPLES):
         """
         Δημιουργεί και αποθηκεύει τις μετρικές επικύρωσης του μοντέλου KNN.
 
+        Για κάθε μετρική υπολογίζεται και διάστημα εμπιστοσύνης bootstrap από τις προβλέψεις του συνόλου επικύρωσης
+        (βλ. bootstrap_intervals()), χωρίς νέα εκπαίδευση.
+
+        Parameters:
+            n_resamples (int): Το πλήθος των επαναδειγματοληψιών bootstrap.
+
         Raises:
             ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί.
         """
@@ -238,16 +1494,20 @@ class KNN:
         if self.final_model is None:
             raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
 
-        # Εκπαίδευση του τελικού μοντέλου με τα δεδομένα εκπαίδευσης
-        self.final_model.fit(self.X_train, self.y_train)
+        # Εκπαίδευση ενός αντιγράφου του τελικού μοντέλου με τα δεδομένα εκπαίδευσης, ώστε το τελικό
+        # μοντέλο (και το ευρετήριο γειτόνων του) να παραμένει εκπαιδευμένο με τα πλήρη δεδομένα
+        validation_model = clone(self.final_model).fit(self.X_train, self.y_train)
+        self.validation_metrics_str = ""
 
         # Προβλέπει τις τιμές για το σύνολο επικύρωσης
-        y_pred = self.final_model.predict(self.X_valid)
+        y_pred = validation_model.predict(self.X_valid)
         # Υπολογίζει τις μετρικές επικύρωσης
         report = classification_report(self.y_valid, y_pred, output_dict=True)
 
         # Υπολογίζει τον πίνακα σύγχυσης οπου θα χρησιμοποιηθεί για τον υπολογισμό του class_specific_accuracy (δεν είναι διαθέσιμο στο classification_report)
-        cm = confusion_matrix(self.y_valid, y_pred)
+        # Οι γραμμές/στήλες με σειρά yes, no (χωρίς labels το sklearn τις ταξινομεί αλφαβητικά: no, yes)
+        labels = [POSITIVE_LABEL, "no"]
+        cm = confusion_matrix(self.y_valid, y_pred, labels=labels)
 
         # Υπολογίζει το accuracy για κάθε κλάση (yes, no)
         class_specific_accuracy = {
@@ -266,11 +1526,37 @@ class KNN:
             "confusion_matrix": cm, # type: ignore
         }
 
+        # Για προσεγγιστικό ευρετήριο: σύγκριση με το αντίστοιχο μοντέλο ακριβούς αναζήτησης
+        if self.index != "exact":
+            exact_model = Pipeline(
+                [
+                    ("preprocessor", clone(self.preprocessor)),
+                    ("classifier", KNeighborsClassifier(n_neighbors=self.best_n_neighbors)),
+                ]
+            ).fit(self.X_train, self.y_train)
+            y_pred_exact = exact_model.predict(self.X_valid)
+            self.validation_metrics["Index Recall"] = validation_model.named_steps["classifier"].recall_
+            self.validation_metrics["Label Agreement"] = float(np.mean(y_pred == y_pred_exact))
+            self.validation_metrics["Exact Accuracy"] = accuracy_score(self.y_valid, y_pred_exact)
+
+        # Διαστήματα εμπιστοσύνης από τις ίδιες προβλέψεις (για προσεγγιστικό ευρετήριο και για τη σύγκριση με το ακριβές μοντέλο)
+        indicators = {}
+        if self.index != "exact":
+            indicators = {
+                "Label Agreement": y_pred == y_pred_exact,
+                "Exact Accuracy": np.asarray(self.y_valid, dtype=str) == np.asarray(y_pred_exact, dtype=str),
+            }
+        self.validation_intervals = bootstrap_intervals(
+            self.y_valid, y_pred, labels, indicators=indicators, n_resamples=n_resamples,
+            confidence=self.confidence_level, random_state=self.random_state,
+        )
+        ci = self._format_interval
+
         if len(self.results) > 0:
             # Αποθηκεύσει των λεπτομερών μετρικών επικύρωσης σε dict
             self.cv_validation_metrics = {
                 "best_neighbors_per_fold": pd.DataFrame(self.results),
-                "all_neighbors_per_fold": pd.DataFrame(self.detailed_results),
+                "all_neighbors_per_fold": self.cv_results_table,
             }
 
             # Αποθήκευση των συνολικών μετρικών επικύρωσης σε dict
@@ -278,20 +1564,39 @@ class KNN:
                 "cv_validation_metrics": self.cv_validation_metrics,
                 "validation_metrics": self.validation_metrics,
                 "best_neighbors": self.best_n_neighbors,
+                "best_weights": self.best_weights,
+                "best_p": self.best_p,
             }
 
             # Δημιουργία του Plotter για την απεικόνιση των μετρικών
-            self.plotter = Plotter(self.overall_validation_metrics)
-            self.plotter.plot_neighbors_vs_metric_per_fold(self.metric, "../plots/neighbors_vs_metric_per_fold.png")
-            self.plotter.plot_mean_metric_per_fold(self.metric, "../plots/mean_metric_per_fold.png")
+            if self.plots_dir is not None:
+                self.plotter = Plotter(self.overall_validation_metrics)
+                self.plotter.plot_neighbors_vs_metric_per_fold(self.metric, f"{self.plots_dir}/neighbors_vs_metric_per_fold.png")
+                self.plotter.plot_mean_metric_per_fold(self.metric, f"{self.plots_dir}/mean_metric_per_fold.png")
+                if self.plotter.n_configs > 1:
+                    self.plotter.plot_neighbors_vs_metric_per_config(self.metric, f"{self.plots_dir}/neighbors_vs_metric_per_config.png")
 
         # Δημιουργία του string με τις μετρικές επικύρωσης για αναφορά
         self.validation_metrics_str += "\nFinal Validation Metrics:\n"
-        self.validation_metrics_str += (f"  • Validation Accuracy: {self.validation_metrics['Accuracy']:.4f}\n")
-        self.validation_metrics_str += f"  • Validation Precision (macro): {self.validation_metrics['Precision']:.4f}\n"
+        self.validation_metrics_str += f"  • Neighbors: {self.best_n_neighbors} (weights={self.best_weights}, p={self.best_p})\n"
+        self.validation_metrics_str += f"  • Confidence Intervals: {self.confidence_level:.0%} bootstrap, {n_resamples} resamples\n"
+        self.validation_metrics_str += (f"  • Validation Accuracy: {self.validation_metrics['Accuracy']:.4f} {ci('Accuracy')}\n")
+        self.validation_metrics_str += f"  • Validation Precision (macro): {self.validation_metrics['Precision']:.4f} {ci('Precision')}\n"
         self.validation_metrics_str += "\n  • Class-specific Accuracy Scores:\n"
-        self.validation_metrics_str += (f"    - Yes Accuracy: {self.validation_metrics['Yes Accuracy']:.4f}\n")
-        self.validation_metrics_str += (f"    - No Accuracy: {self.validation_metrics['No Accuracy']:.4f}\n\n")
+        self.validation_metrics_str += (f"    - Yes Accuracy: {self.validation_metrics['Yes Accuracy']:.4f} {ci('Yes Accuracy')}\n")
+        self.validation_metrics_str += (f"    - No Accuracy: {self.validation_metrics['No Accuracy']:.4f} {ci('No Accuracy')}\n\n")
         self.validation_metrics_str += "\n  • Class-specific Precision Scores:\n"
-        self.validation_metrics_str += f"     - Yes Precision (macro): {self.validation_metrics['Yes Precision']:.4f}\n"
-        self.validation_metrics_str += f"     - No Precision (macro): {self.validation_metrics['No Precision']:.4f}\n"
+        self.validation_metrics_str += f"     - Yes Precision (macro): {self.validation_metrics['Yes Precision']:.4f} {ci('Yes Precision')}\n"
+        self.validation_metrics_str += f"     - No Precision (macro): {self.validation_metrics['No Precision']:.4f} {ci('No Precision')}\n"
+        if self.index != "exact":
+            self.validation_metrics_str += f"\n  • Approximate Index ({self.index}):\n"
+            self.validation_metrics_str += f"     - Neighbour Recall: {self.validation_metrics['Index Recall']:.4f}\n"
+            self.validation_metrics_str += f"     - Label Agreement with Exact Model: {self.validation_metrics['Label Agreement']:.4f} {ci('Label Agreement')}\n"
+            self.validation_metrics_str += f"     - Validation Accuracy (approximate / exact): {self.validation_metrics['Accuracy']:.4f} / {self.validation_metrics['Exact Accuracy']:.4f} {ci('Exact Accuracy')}\n"
+
+    def _format_interval(self, name):
+        """
+        Το διάστημα εμπιστοσύνης μιας μετρικής επικύρωσης ως κείμενο, π.χ. "[95% CI: 0.9350-0.9800]".
+        """
+        low, high = self.validation_intervals[name]
+        return f"[{self.confidence_level:.0%} CI: {low:.4f}-{high:.4f}]"
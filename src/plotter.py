@@ -14,21 +14,35 @@ class Plotter:
             metrics["cv_validation_metrics"]["all_neighbors_per_fold"]
         )
         self.best_neighbors = metrics["best_neighbors"]
-        
+        self.best_weights = metrics.get("best_weights", "uniform")
+        self.best_p = metrics.get("best_p", 2)
+        # Το πλήθος των συνδυασμών (στάθμιση, p) της αναζήτησης
+        self.n_configs = len(self.cv_metrics[1][["weights", "p"]].drop_duplicates()) if "weights" in self.cv_metrics[1] else 1
+
+    def _best_config_results(self):
+        """
+        Αντίγραφο του πίνακα αποτελεσμάτων μόνο με τις γραμμές της επιλεγμένης στάθμισης και του επιλεγμένου p.
+        """
+        df = self.cv_metrics[1]
+        if "weights" in df:
+            df = df[(df["weights"] == self.best_weights) & (df["p"] == self.best_p)]
+        return df.copy()
 
     def plot_neighbors_vs_metric_per_fold(self, metric, output_path=None):
         """
-        Δημιουργεί ένα graph που απεικονίζει τη σχέση μεταξύ του αριθμού των γειτόνων και της μετρικής για κάθε fold.
+        Δημιουργεί ένα graph που απεικονίζει τη σχέση μεταξύ του αριθμού των γειτόνων και της μετρικής για κάθε fold
+        (για την επιλεγμένη στάθμιση και το επιλεγμένο p).
 
         :Parameters 
             metric (string) : Η μετρική που θα απεικονιστεί (π.χ. "accuracy", "precision").
             output_path (string): Το path για αποθήκευση του graph. Αν είναι None, το γράφημα θα εμφανιστεί στην οθόνη.
         """
         metric = "cv_" + metric
-        title = metric[3].upper() + metric[3:]
+        title = metric[3:].capitalize()
 
-        df = self.cv_metrics[1]
-        df["cv"] = df["cv"].astype(str) # παραλείπονται κάποια folds χωρίς αυτό, δεν είμαι σίγουρος γιατί
+        # Αντίγραφο, ώστε ο αποθηκευμένος πίνακας αποτελεσμάτων του μοντέλου να μην τροποποιείται
+        df = self._best_config_results()
+        df["cv"] = df["cv"].astype(str) # Το seaborn θεωρεί τα αριθμητικά hue συνεχή και παραλείπει κάποια folds
 
         sns.lineplot(data=df, x="neighbors", y=metric, hue="cv", marker="o")
 
@@ -50,10 +64,11 @@ class Plotter:
             output_path (string): Το path για αποθήκευση του graph. Αν είναι None, το γράφημα θα εμφανιστεί στην οθόνη.
         """
         metric = "cv_" + metric
-        title = metric[3].upper() + metric[3:]
+        title = metric[3:].capitalize()
 
-        df = self.cv_metrics[1]
-        df["cv"] = df["cv"].astype(str) # παραλείπονται κάποια folds χωρίς αυτό, δεν είμαι σίγουρος γιατί
+        # Αντίγραφο, ώστε ο αποθηκευμένος πίνακας αποτελεσμάτων του μοντέλου να μην τροποποιείται
+        df = self._best_config_results()
+        df["cv"] = df["cv"].astype(str) # Το seaborn θεωρεί τα αριθμητικά hue συνεχή και παραλείπει κάποια folds
 
         sns.barplot(data=df, x="cv", y=metric, hue="cv")
 
@@ -66,3 +81,30 @@ class Plotter:
 
         plt.savefig(output_path) if output_path else plt.show()
         plt.clf()
+
+    def plot_neighbors_vs_metric_per_config(self, metric, output_path=None):
+        """
+        Δημιουργεί ένα graph που απεικονίζει τη μέση τιμή της μετρικής (σε όλα τα folds) ανά αριθμό γειτόνων για κάθε
+        συνδυασμό στάθμισης και p της εκτεταμένης αναζήτησης.
+
+        :Parameters 
+            metric (string): Η μετρική που θα απεικονιστεί (π.χ. "accuracy", "precision").
+            output_path (string): Το path για αποθήκευση του graph. Αν είναι None, το γράφημα θα εμφανιστεί στην οθόνη.
+        """
+        metric = "cv_" + metric
+        title = metric[3:].capitalize()
+
+        df = self.cv_metrics[1].groupby(["weights", "p", "neighbors"], as_index=False)[metric].mean()
+        df["p"] = df["p"].astype(str) # Διακριτές τιμές για το style του seaborn
+
+        sns.lineplot(data=df, x="neighbors", y=metric, hue="weights", style="p", marker="o")
+
+        plt.axvline(self.best_neighbors, color="red", linestyle="--", linewidth=1)
+
+        plt.xlabel("Number of Neighbors")
+        plt.ylabel(f"{title}")
+        plt.title(f"Mean {title} vs Number of Neighbors (best: {self.best_weights}, p={self.best_p})")
+        plt.grid(True)
+        plt.legend(loc='upper right', fontsize='small', labelspacing=0.3)
+        plt.savefig(output_path) if output_path else plt.show()
+        plt.clf()
@@ -0,0 +1,171 @@
+"""
+Prediction Cache Module
+
+Μόνιμη cache προβλέψεων ανά γραμμή (SQLite), κοινή για όλες τις εκτελέσεις:
+    - Κλειδί κάθε εγγραφής είναι το hash του προεπεξεργασμένου διανύσματος
+      χαρακτηριστικών του πελάτη μαζί με το αποτύπωμα (fingerprint) του
+      μοντέλου, οπότε ένα νέο ή επανεκπαιδευμένο μοντέλο δεν βρίσκει ποτέ τις
+      προβλέψεις του προηγούμενου.
+    - Η αναζήτηση γίνεται μαζικά για όλες τις γραμμές πριν από την πρόβλεψη
+      και μόνο οι γραμμές που λείπουν περνούν από την αναζήτηση γειτόνων.
+    - Το μέγεθος είναι περιορισμένο: όταν ξεπεραστεί το max_entries
+      διαγράφονται οι εγγραφές που χρησιμοποιήθηκαν λιγότερο πρόσφατα (LRU),
+      οπότε και οι εγγραφές παλιών μοντέλων απομακρύνονται σταδιακά.
+    Η σύνδεση με τη βάση ανοίγει σε κάθε κλήση, ώστε η cache να μπορεί να
+    αποθηκεύεται μαζί με το μοντέλο (pickle/joblib).
+
+Usage:
+    from prediction_cache import PredictionCache
+    knn_model = KNN(prediction_cache=PredictionCache("../cache/predictions.sqlite"))
+    knn_model.fit()
+    knn_model.predict(new_data)
+    print(knn_model.cache_stats)  # {"hits": ..., "misses": ...}
+"""
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+
+PREDICTION_CACHE_FILE = "../cache/predictions.sqlite"  # Το αρχείο της cache προβλέψεων
+PREDICTION_CACHE_SIZE = 1_000_000  # Μέγιστο πλήθος εγγραφών πριν από την εκκαθάριση LRU
+HASH_BYTES = 16  # Μέγεθος (bytes) του hash κάθε γραμμής
+
+
+def row_hashes(X):
+    """
+    Το hash (blake2b) κάθε γραμμής ενός πίνακα χαρακτηριστικών.
+
+    Parameters:
+        X (np.ndarray): Τα προεπεξεργασμένα χαρακτηριστικά (γραμμές x στήλες).
+
+    Returns:
+        list: Ένα hash (bytes) ανά γραμμή.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64) + 0.0  # Το + 0.0 ενοποιεί το -0.0 με το 0.0
+    return [hashlib.blake2b(row, digest_size=HASH_BYTES).digest() for row in X]
+
+
+def array_fingerprint(*parts):
+    """
+    Το αποτύπωμα (hex) ενός συνόλου πινάκων NumPy και απλών τιμών.
+
+    Parameters:
+        *parts: Πίνακες NumPy ή τιμές με σταθερό repr() (αριθμοί, strings, tuples).
+
+    Returns:
+        str: Το hash όλων των τιμών.
+    """
+    digest = hashlib.blake2b(digest_size=HASH_BYTES)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str((part.dtype, part.shape)).encode())
+            digest.update(np.ascontiguousarray(part).tobytes() if part.dtype != object else repr(part.tolist()).encode())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache προβλέψεων (κλάση και σκορ θετικής ανταπόκρισης) ανά γραμμή και μοντέλο.
+
+    Attributes:
+        path (Path): Το αρχείο SQLite.
+        max_entries (int): Μέγιστο πλήθος εγγραφών (LRU).
+        hits (int): Οι επιτυχημένες αναζητήσεις από τη δημιουργία της cache.
+        misses (int): Οι αποτυχημένες αναζητήσεις από τη δημιουργία της cache.
+    """
+
+    def __init__(self, path=PREDICTION_CACHE_FILE, max_entries=PREDICTION_CACHE_SIZE):
+        if max_entries < 1:
+            raise ValueError("Το μέγεθος της cache πρέπει να είναι θετικό.")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        """
+        Ανοίγει τη βάση και δημιουργεί τον πίνακα αν δεν υπάρχει.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        # Η στήλη label δεν έχει τύπο, ώστε οι κλάσεις να επιστρέφονται με τον αρχικό τους τύπο (str/int)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "fingerprint TEXT NOT NULL, row_hash BLOB NOT NULL, label, score REAL NOT NULL, "
+            "last_used REAL NOT NULL, PRIMARY KEY (fingerprint, row_hash)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)")
+        return conn
+
+    def lookup(self, fingerprint, hashes):
+        """
+        Μαζική αναζήτηση των προβλέψεων ενός μοντέλου.
+
+        Οι εγγραφές που βρέθηκαν σημειώνονται ως πρόσφατα χρησιμοποιημένες.
+
+        Parameters:
+            fingerprint (str): Το αποτύπωμα του μοντέλου.
+            hashes (list): Τα hashes των γραμμών (βλ. row_hashes()).
+
+        Returns:
+            dict: hash -> (κλάση, σκορ) για τις γραμμές που βρέθηκαν.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TEMP TABLE lookup (row_hash BLOB PRIMARY KEY) WITHOUT ROWID")
+            conn.executemany("INSERT OR IGNORE INTO lookup VALUES (?)", ((h,) for h in hashes))
+            rows = conn.execute(
+                "SELECT p.row_hash, p.label, p.score FROM predictions p JOIN lookup l ON p.row_hash = l.row_hash "
+                "WHERE p.fingerprint = ?",
+                (fingerprint,),
+            ).fetchall()
+            conn.execute(
+                "UPDATE predictions SET last_used = ? WHERE fingerprint = ? AND row_hash IN (SELECT row_hash FROM lookup)",
+                (time.time(), fingerprint),
+            )
+            conn.execute("DROP TABLE lookup")
+        found = {row_hash: (label, score) for row_hash, label, score in rows}
+        hits = sum(h in found for h in hashes)
+        self.hits += hits
+        self.misses += len(hashes) - hits
+        return found
+
+    def store(self, fingerprint, hashes, labels, scores):
+        """
+        Αποθηκεύει νέες προβλέψεις και εφαρμόζει το όριο μεγέθους (LRU).
+
+        Parameters:
+            fingerprint (str): Το αποτύπωμα του μοντέλου.
+            hashes (list): Τα hashes των γραμμών.
+            labels (iterable): Η προβλεπόμενη κλάση κάθε γραμμής.
+            scores (iterable): Το σκορ θετικής ανταπόκρισης κάθε γραμμής.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                ((fingerprint, h, label.item() if isinstance(label, np.generic) else label, float(score), now)
+                 for h, label, score in zip(hashes, labels, scores)),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM predictions WHERE (fingerprint, row_hash) IN "
+                    "(SELECT fingerprint, row_hash FROM predictions ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def clear(self):
+        """
+        Διαγράφει όλες τις εγγραφές.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM predictions")
@@ -0,0 +1,177 @@
+"""
+Resources Module
+
+Ρύθμιση των υπολογιστικών πόρων του μοντέλου K-NN:
+    - Πλήθος διεργασιών (joblib) του grid search.
+    - Νήματα BLAS/OpenMP ανά διεργασία: οι υπολογισμοί αποστάσεων του
+      sklearn και του numpy χρησιμοποιούν από προεπιλογή όλους τους πυρήνες,
+      οπότε με N διεργασίες τρέχουν N x πυρήνες νήματα. Το όριο εφαρμόζεται
+      τόσο στην κύρια διεργασία όσο και στις διεργασίες του joblib.
+    - Όριο μνήμης (working memory, MiB) των τμηματικών υπολογισμών του
+      sklearn (π.χ. πίνακες αποστάσεων κατά την πρόβλεψη).
+    Η ίδια ρύθμιση εφαρμόζεται στην αναζήτηση, την εκπαίδευση και την
+    πρόβλεψη. Η benchmark_resources() μετρά τους χρόνους για διάφορους
+    συνδυασμούς στο τρέχον μηχάνημα.
+
+Usage:
+    from resources import ResourceConfig, benchmark_resources
+    knn_model = KNN(resources=ResourceConfig(n_jobs=4, threads=2, working_memory=256))
+    table = benchmark_resources(past_data)
+    best = ResourceConfig.from_row(table.iloc[0])
+"""
+import functools
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import sklearn
+from joblib import cpu_count, effective_n_jobs, parallel_config
+from threadpoolctl import threadpool_limits
+
+BENCHMARK_K_RANGE = range(2, 16)  # Οι τιμές του K της αναζήτησης που μετράται
+BENCHMARK_FOLDS = (5,)  # Οι αριθμοί folds της αναζήτησης που μετράται
+
+
+class ResourceConfig:
+    """
+    Οι υπολογιστικοί πόροι του μοντέλου.
+
+    Attributes:
+        n_jobs (int): Ο αριθμός των διεργασιών του grid search (-1 για όλους τους πυρήνες).
+        threads (int | None): Τα νήματα BLAS/OpenMP ανά διεργασία (None: οι πυρήνες μοιρασμένοι στις διεργασίες).
+        working_memory (int | None): Το όριο μνήμης (MiB) των τμηματικών υπολογισμών του sklearn (None: η προεπιλογή του sklearn).
+    """
+
+    def __init__(self, n_jobs=-1, threads=None, working_memory=None):
+        if n_jobs == 0:
+            raise ValueError("Ο αριθμός διεργασιών δεν μπορεί να είναι 0.")
+        if threads is not None and threads < 1:
+            raise ValueError("Τα νήματα ανά διεργασία πρέπει να είναι τουλάχιστον 1.")
+        if working_memory is not None and working_memory <= 0:
+            raise ValueError("Το όριο μνήμης πρέπει να είναι θετικό.")
+        self.n_jobs = n_jobs
+        self.threads = threads
+        self.working_memory = working_memory
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Δημιουργεί τη ρύθμιση από μια γραμμή του πίνακα της benchmark_resources().
+        """
+        working_memory = row["working_memory"]
+        return cls(
+            n_jobs=int(row["n_jobs"]),
+            threads=int(row["threads"]),
+            working_memory=None if pd.isna(working_memory) else int(working_memory),
+        )
+
+    def effective_threads(self):
+        """
+        Τα νήματα ανά διεργασία: τα ρητά ορισμένα ή οι διαθέσιμοι πυρήνες μοιρασμένοι στις διεργασίες.
+        """
+        if self.threads is not None:
+            return self.threads
+        return max(1, cpu_count() // effective_n_jobs(self.n_jobs))
+
+    @contextmanager
+    def limits(self):
+        """
+        Εφαρμόζει τη ρύθμιση για όσο διαρκεί το block.
+
+        Τα νήματα περιορίζονται στην τρέχουσα διεργασία (threadpoolctl) και στις διεργασίες που
+        ξεκινά το joblib (inner_max_num_threads). Οι κλήσεις μπορούν να είναι εμφωλευμένες.
+        """
+        threads = self.effective_threads()
+        with threadpool_limits(limits=threads), \
+                sklearn.config_context(working_memory=self.working_memory), \
+                parallel_config(backend="loky", n_jobs=self.n_jobs, inner_max_num_threads=threads):
+            yield
+
+    def __repr__(self):
+        return f"ResourceConfig(n_jobs={self.n_jobs}, threads={self.threads}, working_memory={self.working_memory})"
+
+
+def governed(method):
+    """
+    Decorator: η μέθοδος του μοντέλου εκτελείται με τη ρύθμιση πόρων του (self.resources).
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        resources = getattr(self, "resources", None) or ResourceConfig()  # Μοντέλα αποθηκευμένα πριν από τη ρύθμιση πόρων
+        with resources.limits():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def candidate_configs(working_memory=None):
+    """
+    Οι συνδυασμοί διεργασιών και νημάτων που εξετάζει η benchmark_resources() στο τρέχον μηχάνημα.
+
+    Οι διεργασίες είναι δυνάμεις του 2 έως τους πυρήνες και για καθεμία εξετάζονται ένα νήμα
+    και οι πυρήνες μοιρασμένοι στις διεργασίες.
+
+    Parameters:
+        working_memory (int, optional): Το όριο μνήμης όλων των συνδυασμών.
+
+    Returns:
+        list: Οι ρυθμίσεις (ResourceConfig).
+    """
+    cores = cpu_count()
+    job_counts = sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+    configs = []
+    for n_jobs in job_counts:
+        for threads in sorted({1, max(1, cores // n_jobs)}):
+            configs.append(ResourceConfig(n_jobs=n_jobs, threads=threads, working_memory=working_memory))
+    return configs
+
+
+def benchmark_resources(train_data, configs=None, k_range=BENCHMARK_K_RANGE, fold_range=BENCHMARK_FOLDS, repeats=1,
+                        test_size=0.2, random_state=42):
+    """
+    Μετρά τον χρόνο αναζήτησης, εκπαίδευσης και πρόβλεψης για κάθε ρύθμιση πόρων.
+
+    Για κάθε ρύθμιση εκπαιδεύεται νέο μοντέλο με τα ίδια δεδομένα και προβλέπονται όλες οι γραμμές
+    τους. Κρατείται ο μικρότερος χρόνος των επαναλήψεων.
+
+    Parameters:
+        train_data (pd.DataFrame): Τα ιστορικά δεδομένα (με τη στήλη της ανταπόκρισης).
+        configs (list, optional): Οι ρυθμίσεις (ResourceConfig). Αν δεν δοθούν, η candidate_configs().
+        k_range (range): Οι τιμές του K της αναζήτησης.
+        fold_range (iterable): Οι αριθμοί folds της αναζήτησης.
+        repeats (int): Οι επαναλήψεις κάθε μέτρησης.
+        test_size (float): Το ποσοστό των δεδομένων επικύρωσης.
+        random_state (int): Το seed.
+
+    Returns:
+        pd.DataFrame: Μία γραμμή ανά ρύθμιση (n_jobs, threads, working_memory, search_s, fit_s, predict_s,
+        total_s), ταξινομημένες από τη γρηγορότερη.
+    """
+    from model import KNN  # Το model εισάγει το resources
+
+    configs = configs or candidate_configs()
+    rows = []
+    for config in configs:
+        timings = {"search_s": [], "fit_s": [], "predict_s": []}
+        for _ in range(repeats):
+            knn = KNN(test_size=test_size, random_state=random_state, plots_dir=None, resources=config)
+            knn.feed_data(train_data)
+            start = time.perf_counter()
+            knn.find_best_neighbors(k_range=k_range, fold_range=fold_range)
+            timings["search_s"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            knn.fit()
+            timings["fit_s"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            knn.predict_proba(knn.X)
+            timings["predict_s"].append(time.perf_counter() - start)
+        row = {
+            "n_jobs": effective_n_jobs(config.n_jobs),
+            "threads": config.effective_threads(),
+            "working_memory": config.working_memory,
+        }
+        row.update({stage: min(values) for stage, values in timings.items()})
+        row["total_s"] = row["search_s"] + row["fit_s"] + row["predict_s"]
+        rows.append(row)
+    return pd.DataFrame(rows).sort_values("total_s", ignore_index=True)
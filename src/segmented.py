@@ -0,0 +1,274 @@
+"""
+Segmented Model Module
+
+Ένα μοντέλο KNN ανά τμήμα πελατών (π.χ. ανά 'Περιοχή' ή 'Φύλο'):
+    - Κάθε τμήμα εκπαιδεύεται σε ξεχωριστή διεργασία, με τη δική του
+      αναζήτηση του βέλτιστου αριθμού γειτόνων.
+    - Τα εκπαιδευμένα μοντέλα αποθηκεύονται ως αρχεία (joblib) και στη μνήμη
+      κρατιούνται το πολύ cache_size μοντέλα (LRU), ώστε η μνήμη να μένει
+      φραγμένη όταν τα τμήματα είναι πολλά.
+    - Κάθε νέος πελάτης δρομολογείται στο μοντέλο του τμήματός του. Τμήματα με
+      λίγα ιστορικά δεδομένα ή άγνωστες τιμές εξυπηρετούνται από ένα γενικό
+      μοντέλο με όλα τα δεδομένα, όπως και οι πελάτες με κατηγορίες (π.χ.
+      'premium') που δεν εμφανίζονται στα δεδομένα του τμήματός τους.
+
+Usage:
+    from segmented import SegmentedKNN
+    model = SegmentedKNN("Περιοχή")
+    model.fit(past_data, k_range=range(2, 16), fold_range=range(2, 8))
+    result_df = model.predict(new_data)
+"""
+import multiprocessing as mp
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from exporter import export_predictions
+from model import CONFIDENCE_LEVEL, KNN, fitted_group, rank_by_scores, segment_counts
+from resources import ResourceConfig
+
+SEGMENT_COLUMNS = ("Φύλο", "Περιοχή")  # Οι στήλες που μπορούν να χρησιμοποιηθούν για τμηματοποίηση
+GLOBAL_SEGMENT = "__all__"  # Το κλειδί του γενικού μοντέλου
+
+
+def _known_categories(knn):
+    """
+    Οι κατηγορίες κάθε κατηγορικού χαρακτηριστικού που είδε ο encoder του εκπαιδευμένου μοντέλου.
+
+    Returns:
+        dict: Στήλη -> λίστα κατηγοριών (κενό αν το μοντέλο δεν έχει κατηγορικά χαρακτηριστικά).
+    """
+    encoder, columns = fitted_group(knn.final_model.named_steps["preprocessor"], "cat")
+    if encoder is None:
+        return {}
+    return {column: categories.tolist() for column, categories in zip(columns, encoder.categories_)}
+
+
+def _train_segment(key, data, k_range, fold_range, test_size, random_state, resources, artifact_path):
+    """
+    Εκπαιδεύει το μοντέλο ενός τμήματος και το αποθηκεύει στο artifact_path (εκτελείται σε διεργασία του pool).
+
+    Returns:
+        dict: Σύνοψη του μοντέλου (τμήμα, γραμμές, αριθμός γειτόνων, ακρίβεια επικύρωσης και διάστημα εμπιστοσύνης,
+        γνωστές κατηγορίες, path).
+    """
+    # Ο παραλληλισμός γίνεται ανά τμήμα, οπότε το grid search κάθε τμήματος εκτελείται σειριακά
+    knn = KNN(test_size=test_size, random_state=random_state, plots_dir=None, resources=resources)
+    knn.feed_data(data)
+    knn.find_best_neighbors(k_range=k_range, fold_range=fold_range)
+    knn.fit()
+    knn.gen_metrics()
+    joblib.dump(knn, artifact_path)
+    return {
+        "segment": key,
+        "rows": len(data),
+        "neighbors": knn.best_n_neighbors,
+        "accuracy": knn.validation_metrics["Accuracy"],
+        "accuracy_ci": knn.validation_intervals["Accuracy"],
+        "categories": _known_categories(knn),
+        "path": str(artifact_path),
+    }
+
+
+class ModelCache:
+    """
+    LRU cache εκπαιδευμένων μοντέλων, με φόρτωση από τα αρχεία τους όταν δεν βρίσκονται στη μνήμη.
+
+    Attributes:
+        capacity (int): Ο μέγιστος αριθμός μοντέλων στη μνήμη.
+        paths (dict): Το αρχείο του μοντέλου κάθε κλειδιού.
+        hits (int): Πόσες φορές το μοντέλο βρέθηκε στη μνήμη.
+        misses (int): Πόσες φορές το μοντέλο φορτώθηκε από το αρχείο του.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(1, capacity)
+        self.paths = {}
+        self.hits = 0
+        self.misses = 0
+        self._models = OrderedDict()
+
+    def get(self, key):
+        """
+        Επιστρέφει το μοντέλο του key, φορτώνοντάς το από το αρχείο του αν χρειάζεται.
+        """
+        if key in self._models:
+            self.hits += 1
+            self._models.move_to_end(key)
+            return self._models[key]
+        self.misses += 1
+        model = joblib.load(self.paths[key])
+        self._models[key] = model
+        if len(self._models) > self.capacity:
+            self._models.popitem(last=False)  # Απομάκρυνση του λιγότερο πρόσφατα χρησιμοποιημένου
+        return model
+
+    def clear(self):
+        """
+        Αδειάζει τη μνήμη (τα αρχεία παραμένουν).
+        """
+        self._models.clear()
+
+
+class SegmentedKNN:
+    """
+    Ένα μοντέλο KNN ανά τιμή της στήλης τμηματοποίησης, με δρομολόγηση των νέων πελατών στο μοντέλο του τμήματός τους.
+
+    Attributes:
+        segment_column (str): Η στήλη τμηματοποίησης.
+        segments (list): Η σύνοψη κάθε εκπαιδευμένου μοντέλου (βλ. _train_segment).
+        cache (ModelCache): Τα μοντέλα στη μνήμη.
+        validation_metrics_str (str): Αναφορά με τον αριθμό γειτόνων και την ακρίβεια επικύρωσης κάθε τμήματος.
+    """
+
+    def __init__(self, segment_column, test_size=0.2, random_state=42, max_workers=None, cache_size=4,
+                 artifact_dir=None, min_segment_rows=50, resources=None):
+        """
+        Parameters:
+            segment_column (str): Η στήλη τμηματοποίησης (βλ. SEGMENT_COLUMNS).
+            test_size (float): Το ποσοστό των δεδομένων κάθε τμήματος για επικύρωση.
+            random_state (int): Το seed για αναπαραγωγιμότητα.
+            max_workers (int, optional): Ο αριθμός των διεργασιών εκπαίδευσης. Αν δεν δοθεί, ίσος με τους πυρήνες.
+            cache_size (int): Ο μέγιστος αριθμός μοντέλων στη μνήμη.
+            artifact_dir (str, optional): Ο φάκελος αποθήκευσης των μοντέλων. Αν δεν δοθεί, προσωρινός φάκελος.
+            min_segment_rows (int): Τμήματα με λιγότερες γραμμές εξυπηρετούνται από το γενικό μοντέλο.
+            resources (ResourceConfig, optional): Οι πόροι της εκπαίδευσης: n_jobs διεργασίες (αν δεν δοθεί
+                max_workers) και τα νήματα/όριο μνήμης κάθε τμήματος. Αν δεν δοθεί, ένα νήμα ανά τμήμα.
+        """
+        self.segment_column = segment_column
+        self.response_column = "Ανταπόκριση"
+        self.test_size = test_size
+        self.random_state = random_state
+        self.max_workers = max_workers
+        self.artifact_dir = Path(artifact_dir or tempfile.mkdtemp(prefix="knn_segments_"))
+        self.min_segment_rows = min_segment_rows
+        self.resources = resources
+        self.cache = ModelCache(cache_size)
+        self.segments = []
+        self.validation_metrics_str = ""
+        self.cv_results_table = None  # Δεν υποστηρίζεται επαναεπιλογή του k ανά τμήμα
+        self.classes_ = None  # Οι κλάσεις της ανταπόκρισης
+        self.segment_counts = None  # Το πλήθος των προβλέψεων ανά τμήμα πελατών (μετά την predict())
+
+    def fit(self, train_data, k_range, fold_range):
+        """
+        Εκπαιδεύει παράλληλα ένα μοντέλο για κάθε τμήμα και ένα γενικό μοντέλο για όλα τα δεδομένα.
+
+        Parameters:
+            train_data (pd.DataFrame): Τα ιστορικά δεδομένα.
+            k_range (range): Το εύρος των τιμών για τον αριθμό των γειτόνων.
+            fold_range (range): Το εύρος των τιμών για τον αριθμό των folds.
+
+        Raises:
+            ValueError: Αν η στήλη τμηματοποίησης δεν υπάρχει στα δεδομένα.
+        """
+        if self.segment_column not in train_data.columns:
+            raise ValueError(f"Η στήλη τμηματοποίησης '{self.segment_column}' δεν υπάρχει στα δεδομένα.")
+
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self.classes_ = np.unique(train_data[self.response_column].dropna().to_numpy())
+        jobs = [(GLOBAL_SEGMENT, train_data)]
+        for value, segment_data in train_data.groupby(self.segment_column, observed=True):
+            if len(segment_data) >= self.min_segment_rows and segment_data[self.response_column].nunique() > 1:
+                jobs.append((str(value), segment_data))
+
+        max_workers = self.max_workers
+        segment_resources = ResourceConfig(n_jobs=1, threads=1)
+        if self.resources is not None:
+            if max_workers is None and self.resources.n_jobs > 0:
+                max_workers = self.resources.n_jobs
+            segment_resources = ResourceConfig(
+                n_jobs=1, threads=self.resources.threads or 1, working_memory=self.resources.working_memory
+            )
+
+        # Το spawn αποφεύγει την αντιγραφή της κατάστασης του γραφικού περιβάλλοντος στις διεργασίες
+        context = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    _train_segment, key, data, k_range, fold_range, self.test_size, self.random_state,
+                    segment_resources, self.artifact_dir / f"segment_{i}.joblib",
+                )
+                for i, (key, data) in enumerate(jobs)
+            ]
+            self.segments = [future.result() for future in futures]
+
+        self.cache.clear()
+        self.cache.paths = {summary["segment"]: summary["path"] for summary in self.segments}
+
+        self.validation_metrics_str = f"\nSegment Models ({self.segment_column}):\n"
+        for summary in self.segments:
+            name = "Όλοι (γενικό μοντέλο)" if summary["segment"] == GLOBAL_SEGMENT else summary["segment"]
+            self.validation_metrics_str += (
+                f"  • {name}: {summary['rows']} γραμμές, k = {summary['neighbors']}, "
+                f"Validation Accuracy: {summary['accuracy']:.4f} "
+                f"[{CONFIDENCE_LEVEL:.0%} CI: {summary['accuracy_ci'][0]:.4f}-{summary['accuracy_ci'][1]:.4f}]\n"
+            )
+
+    def _route(self, new_data):
+        """
+        Επιστρέφει για κάθε μοντέλο τις θέσεις των νέων πελατών που δρομολογούνται σε αυτό.
+
+        Πελάτες με κατηγορία που δεν υπάρχει στα δεδομένα του τμήματός τους δρομολογούνται στο γενικό μοντέλο,
+        αφού ο encoder του τμήματος δεν μπορεί να τους μετασχηματίσει.
+        """
+        if not self.segments:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+        values = new_data[self.segment_column].astype(str).to_numpy()
+        keys = np.where(np.isin(values, list(self.cache.paths)), values, GLOBAL_SEGMENT).astype(object)
+        for summary in self.segments:
+            if summary["segment"] == GLOBAL_SEGMENT:
+                continue
+            in_segment = keys == summary["segment"]
+            for column, categories in summary.get("categories", {}).items():
+                keys[in_segment & ~new_data[column].isin(categories).to_numpy()] = GLOBAL_SEGMENT
+        for key in np.unique(keys):
+            yield key, np.flatnonzero(keys == key)
+
+    def predict(self, new_data, output_path=None):
+        """
+        Κάνει προβλέψεις δρομολογώντας κάθε πελάτη στο μοντέλο του τμήματός του.
+
+        Parameters:
+            new_data (pd.DataFrame): Τα νέα δεδομένα.
+            output_path (str, optional): Το path για την αποθήκευση των αποτελεσμάτων (.xlsx, .csv ή .parquet).
+
+        Returns:
+            pd.DataFrame: Τα νέα δεδομένα με τις προβλέψεις στη στήλη της ανταπόκρισης.
+        """
+        predictions = np.empty(len(new_data), dtype=object)
+        for key, rows in self._route(new_data):
+            model = self.cache.get(key)
+            predictions[rows] = model.final_model.predict(new_data.iloc[rows])
+
+        self.segment_counts = segment_counts(new_data, predictions, self.classes_)
+
+        result_df = new_data.copy()
+        result_df[self.response_column] = predictions
+        if output_path:
+            export_predictions(result_df, output_path, index=False)
+        return result_df
+
+    def predict_proba(self, new_data):
+        """
+        Το ποσοστό των γειτόνων κάθε πελάτη με θετική ανταπόκριση, από το μοντέλο του τμήματός του.
+        """
+        scores = np.zeros(len(new_data))
+        for key, rows in self._route(new_data):
+            scores[rows] = self.cache.get(key).predict_proba(new_data.iloc[rows])
+        return scores
+
+    def rank_customers(self, new_data, top_n=None, top_percent=None, output_path=None):
+        """
+        Δημιουργεί τη λίστα στόχευσης με τα σκορ των μοντέλων των τμημάτων (βλ. KNN.rank_customers()).
+        """
+        ranked_df = rank_by_scores(
+            new_data, self.predict_proba(new_data), self.response_column, top_n=top_n, top_percent=top_percent
+        )
+        if output_path:
+            export_predictions(ranked_df, output_path, index=True)
+        return ranked_df
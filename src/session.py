@@ -0,0 +1,210 @@
+"""
+Session Snapshot Module
+
+Αποθήκευση και επαναφορά της κατάστασης εργασίας της εφαρμογής:
+    - Κάθε DataFrame αποθηκεύεται ανά στήλη σε αρχεία .npy (οι κατηγορικές
+      στήλες ως κωδικοί, με τις κατηγορίες στο manifest), ώστε κατά την
+      επαναφορά οι στήλες να αντιστοιχίζονται στη μνήμη (memory-mapped) και
+      να διαβάζονται από τον δίσκο μόνο όταν χρησιμοποιηθούν.
+    - Το εκπαιδευμένο μοντέλο αποθηκεύεται με joblib χωρίς συμπίεση, ώστε και
+      οι πίνακές του να φορτώνονται ως memory-mapped.
+    - Τα flags κατάστασης αποθηκεύονται στο manifest.json.
+    - Το snapshot γράφεται σε προσωρινό φάκελο και αντικαθιστά το προηγούμενο
+      μόνο όταν ολοκληρωθεί, ώστε μια διακοπή να μην αφήνει μισό snapshot.
+
+Usage:
+    from session import save_session, load_session
+    save_session({"past_campaign_data": df}, knn_model, {"model_trained": True})
+    state = load_session()
+    state["frames"]["past_campaign_data"], state["model"], state["flags"]
+"""
+import json
+import shutil
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+SESSION_DIR = "../cache/session"  # Ο φάκελος του snapshot της τελευταίας συνεδρίας
+SESSION_VERSION = 1  # Η έκδοση της μορφής του snapshot (διαφορετική έκδοση δεν επαναφέρεται)
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.joblib"
+MMAP_MODE = "c"  # Copy-on-write: οι αλλαγές μένουν στη μνήμη και δεν γράφονται στο snapshot
+
+
+def has_session(path=SESSION_DIR):
+    """
+    Ελέγχει αν υπάρχει ολοκληρωμένο snapshot στον φάκελο.
+
+    Parameters:
+        path (str): Ο φάκελος του snapshot.
+
+    Returns:
+        bool: True αν υπάρχει manifest.
+    """
+    return (Path(path) / MANIFEST_FILE).is_file()
+
+
+def _save_values(values, file):
+    """
+    Αποθηκεύει μια στήλη ή ένα index και επιστρέφει την περιγραφή του για το manifest.
+
+    Οι αριθμητικές τιμές γράφονται ως έχουν. Οι κατηγορικές γράφονται ως
+    κωδικοί με τις κατηγορίες στο manifest, και οι τιμές τύπου object
+    (π.χ. κείμενο) μετατρέπονται πρώτα σε κωδικούς και κατηγορίες.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        np.save(file, np.asarray(values.codes if isinstance(values, pd.Categorical) else values.cat.codes))
+        return {"kind": "category", "categories": dtype.categories.tolist(), "ordered": bool(dtype.ordered)}
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufmM":
+        np.save(file, np.asarray(values))
+        return {"kind": "array"}
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=True)
+    np.save(file, codes.astype(np.int32))
+    return {"kind": "object", "categories": uniques.tolist()}
+
+
+def _load_values(spec, file):
+    """
+    Επαναφέρει μια στήλη ή ένα index από την περιγραφή του manifest.
+
+    Οι αριθμητικές στήλες και οι κωδικοί των κατηγορικών επιστρέφονται
+    memory-mapped. Μόνο οι στήλες τύπου object δημιουργούνται στη μνήμη.
+    """
+    values = np.load(file, mmap_mode=MMAP_MODE)
+    if spec["kind"] == "array":
+        return values
+    if spec["kind"] == "category":
+        return pd.Categorical.from_codes(values, categories=spec["categories"], ordered=spec["ordered"])
+    uniques = np.array(spec["categories"] + [None], dtype=object)
+    return uniques[values]  # Ο κωδικός -1 (κενή τιμή) αντιστοιχεί στο τελευταίο στοιχείο (None)
+
+
+def save_frame(df, path):
+    """
+    Αποθηκεύει ένα DataFrame ανά στήλη σε φάκελο.
+
+    Parameters:
+        df (pd.DataFrame): Τα δεδομένα.
+        path (str | Path): Ο φάκελος (δημιουργείται αν δεν υπάρχει).
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    columns = []
+    for i, (name, column) in enumerate(df.items()):
+        spec = _save_values(column, path / f"column_{i}.npy")
+        spec["name"] = name
+        columns.append(spec)
+    if isinstance(df.index, pd.RangeIndex):
+        index = {"kind": "range", "start": df.index.start, "stop": df.index.stop, "step": df.index.step}
+    else:
+        index = _save_values(df.index, path / "index.npy")
+    index["name"] = df.index.name
+    with open(path / "frame.json", "w", encoding="utf-8") as f:
+        json.dump({"columns": columns, "index": index}, f, ensure_ascii=False)
+
+
+def load_frame(path):
+    """
+    Φορτώνει ένα DataFrame που αποθηκεύτηκε με την save_frame().
+
+    Οι αριθμητικές στήλες δεν αντιγράφονται: το DataFrame χρησιμοποιεί
+    απευθείας τα memory-mapped αρχεία.
+
+    Parameters:
+        path (str | Path): Ο φάκελος του DataFrame.
+
+    Returns:
+        pd.DataFrame: Τα δεδομένα.
+    """
+    path = Path(path)
+    with open(path / "frame.json", encoding="utf-8") as f:
+        layout = json.load(f)
+    index_spec = layout["index"]
+    if index_spec["kind"] == "range":
+        index = pd.RangeIndex(index_spec["start"], index_spec["stop"], index_spec["step"], name=index_spec["name"])
+    else:
+        index = pd.Index(_load_values(index_spec, path / "index.npy"), name=index_spec["name"])
+    data = {spec["name"]: _load_values(spec, path / f"column_{i}.npy") for i, spec in enumerate(layout["columns"])}
+    return pd.DataFrame(data, index=index, columns=[spec["name"] for spec in layout["columns"]], copy=False)
+
+
+def save_session(frames, model=None, flags=None, path=SESSION_DIR):
+    """
+    Αποθηκεύει την κατάσταση εργασίας (snapshot).
+
+    Parameters:
+        frames (dict): Όνομα -> DataFrame (οι τιμές None παραλείπονται).
+        model (object, optional): Το εκπαιδευμένο μοντέλο.
+        flags (dict, optional): Τα flags κατάστασης (όνομα -> bool).
+        path (str): Ο φάκελος του snapshot (αντικαθίσταται).
+
+    Returns:
+        Path: Ο φάκελος του snapshot.
+    """
+    path = Path(path)
+    staging = path.with_name(path.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    saved_frames = []
+    for name, df in frames.items():
+        if df is not None:
+            save_frame(df, staging / name)
+            saved_frames.append(name)
+    if model is not None:
+        joblib.dump(model, staging / MODEL_FILE)
+    manifest = {
+        "version": SESSION_VERSION,
+        "created": time.time(),
+        "frames": saved_frames,
+        "model": model is not None,
+        "flags": {name: bool(value) for name, value in (flags or {}).items()},
+    }
+    with open(staging / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    staging.rename(path)
+    return path
+
+
+def load_session(path=SESSION_DIR):
+    """
+    Επαναφέρει την κατάσταση εργασίας από το snapshot.
+
+    Parameters:
+        path (str): Ο φάκελος του snapshot.
+
+    Returns:
+        dict: "frames" (όνομα -> DataFrame), "model" (ή None), "flags" και "created" (timestamp).
+
+    Raises:
+        ValueError: Αν δεν υπάρχει snapshot ή είναι διαφορετικής έκδοσης.
+    """
+    path = Path(path)
+    if not has_session(path):
+        raise ValueError(f"Δεν βρέθηκε αποθηκευμένη συνεδρία στο '{path}'.")
+    with open(path / MANIFEST_FILE, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SESSION_VERSION:
+        raise ValueError(
+            f"Η αποθηκευμένη συνεδρία είναι έκδοσης {manifest.get('version')}, αναμενόταν {SESSION_VERSION}."
+        )
+    return {
+        "frames": {name: load_frame(path / name) for name in manifest["frames"]},
+        "model": joblib.load(path / MODEL_FILE, mmap_mode=MMAP_MODE) if manifest["model"] else None,
+        "flags": manifest["flags"],
+        "created": manifest["created"],
+    }
+
+
+def clear_session(path=SESSION_DIR):
+    """
+    Διαγράφει το snapshot (π.χ. όταν ο χρήστης δεν θέλει επαναφορά).
+
+    Parameters:
+        path (str): Ο φάκελος του snapshot.
+    """
+    shutil.rmtree(path, ignore_errors=True)
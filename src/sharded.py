@@ -0,0 +1,294 @@
+"""
+Sharded Prediction Module
+
+Παράλληλη πρόβλεψη με διαμοιρασμό (sharding) του συνόλου αναφοράς ενός
+εκπαιδευμένου μοντέλου KNN σε πολλές διεργασίες:
+    - Το προεπεξεργασμένο σύνολο αναφοράς χωρίζεται σε συνεχόμενα τμήματα
+      (shards) γραμμών. Τοπικά, οι διεργασίες διαβάζουν το τμήμα τους απευθείας
+      από κοινόχρηστη μνήμη, χωρίς αντίγραφα.
+    - Κάθε παρτίδα ερωτημάτων στέλνεται σε όλα τα shards, κάθε shard επιστρέφει
+      τους k τοπικά πλησιέστερους γείτονες και ο συντονιστής τους συγχωνεύει
+      στους k συνολικά πλησιέστερους πριν την ψηφοφορία.
+    - Το ίδιο πρωτόκολλο μηνυμάτων λειτουργεί και πάνω από sockets, ώστε τα
+      shards να εκτελούνται σε άλλους υπολογιστές.
+
+Usage:
+    from sharded import ShardedPredictor
+    with ShardedPredictor(knn_model, n_shards=4) as predictor:
+        result_df = predictor.predict(new_data)
+
+    # Shard σε άλλο υπολογιστή:
+    python sharded.py --address 0.0.0.0:6000 --authkey secret
+"""
+import argparse
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+from model import neighbor_votes, stable_kneighbors
+
+BATCH_SIZE = 10_000  # Πλήθος ερωτημάτων που στέλνονται σε κάθε γύρο προς τα shards
+
+
+def _attach_shared(name, shape, dtype):
+    """
+    Συνδέεται σε υπάρχουσα κοινόχρηστη μνήμη και επιστρέφει (μνήμη, πίνακα πάνω σε αυτή).
+    """
+    # Οι τοπικές διεργασίες μοιράζονται τον resource tracker του συντονιστή, ο οποίος αποδεσμεύει τη μνήμη στη close()
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def serve_shard(conn):
+    """
+    Εξυπηρετεί τα μηνύματα του συντονιστή για ένα shard μέχρι να λάβει "close".
+
+    Μηνύματα (tuples):
+        ("load", X_part, offset, params): το τμήμα του συνόλου αναφοράς στέλνεται αυτούσιο (απομακρυσμένα shards).
+        ("load_shared", name, shape, dtype, start, stop, params): το τμήμα διαβάζεται από κοινόχρηστη μνήμη.
+        ("query", X_query, k): απάντηση ("result", distances, global_indices) με τους k τοπικά πλησιέστερους
+            κατά (απόσταση, δείκτη) (βλ. stable_kneighbors()).
+        ("close",): τερματισμός.
+
+    Parameters:
+        conn (multiprocessing.connection.Connection): Η σύνδεση με τον συντονιστή (Pipe ή socket).
+    """
+    shm, index, offset = None, None, 0
+    try:
+        while True:
+            message = conn.recv()
+            kind = message[0]
+            if kind == "load":
+                _, X_part, offset, params = message
+                index = NearestNeighbors(**params).fit(X_part)
+                conn.send(("ok", len(X_part)))
+            elif kind == "load_shared":
+                _, name, shape, dtype, start, stop, params = message
+                shm, X_shared = _attach_shared(name, shape, dtype)
+                offset = start
+                index = NearestNeighbors(**params).fit(X_shared[start:stop])
+                conn.send(("ok", stop - start))
+            elif kind == "query":
+                _, X_query, k = message
+                distances, indices = stable_kneighbors(index.kneighbors, X_query, k, index.n_samples_fit_)
+                conn.send(("result", distances, indices + offset))
+            elif kind == "close":
+                break
+    except EOFError:
+        pass
+    finally:
+        index = None
+        if shm is not None:
+            shm.close()
+        conn.close()
+
+
+def run_shard_server(address, authkey):
+    """
+    Εκκινεί shard σε αυτόν τον υπολογιστή και εξυπηρετεί συνδέσεις συντονιστών τη μία μετά την άλλη.
+
+    Parameters:
+        address (tuple): Η διεύθυνση (host, port) στην οποία ακούει το shard.
+        authkey (bytes): Το κοινό κλειδί πιστοποίησης με τον συντονιστή.
+    """
+    with Listener(address, authkey=authkey) as listener:
+        while True:
+            serve_shard(listener.accept())
+
+
+def merge_top_k(distances, indices, k):
+    """
+    Συγχωνεύει τους τοπικούς k πλησιέστερους γείτονες των shards στους k συνολικά πλησιέστερους.
+
+    Σε ίσες αποστάσεις προηγείται ο γείτονας με τον μικρότερο δείκτη στο σύνολο αναφοράς, ώστε το αποτέλεσμα
+    να μην εξαρτάται από τον αριθμό ή τη σειρά των shards. Κάθε shard επιλέγει τους τοπικούς γείτονες με τον ίδιο
+    κανόνα, όπως και ο classifier του μη διαμοιρασμένου μοντέλου (StableKNeighborsClassifier), οπότε οι
+    προβλέψεις ταυτίζονται.
+
+    Parameters:
+        distances (list): Για κάθε shard, πίνακας (ερωτήματα x k_shard) με τις αποστάσεις.
+        indices (list): Για κάθε shard, πίνακας (ερωτήματα x k_shard) με τους συνολικούς δείκτες των γειτόνων.
+        k (int): Ο αριθμός των γειτόνων που θα κρατηθούν.
+
+    Returns:
+        tuple: (αποστάσεις, δείκτες), πίνακες (ερωτήματα x k) ταξινομημένοι κατά απόσταση.
+    """
+    all_distances = np.hstack(distances)
+    all_indices = np.hstack(indices)
+    # Ταξινόμηση κατά δείκτη και μετά σταθερή ταξινόμηση κατά απόσταση: (απόσταση, δείκτης) λεξικογραφικά
+    by_index = np.argsort(all_indices, axis=1, kind="stable")
+    all_distances = np.take_along_axis(all_distances, by_index, axis=1)
+    all_indices = np.take_along_axis(all_indices, by_index, axis=1)
+    order = np.argsort(all_distances, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(all_distances, order, axis=1), np.take_along_axis(all_indices, order, axis=1)
+
+
+class ShardedPredictor:
+    """
+    Πρόβλεψη με το σύνολο αναφοράς ενός εκπαιδευμένου KNN διαμοιρασμένο σε πολλές διεργασίες.
+
+    Attributes:
+        knn_model (KNN): Το εκπαιδευμένο μοντέλο.
+        n_shards (int): Ο αριθμός των τοπικών shards (αγνοείται αν δοθούν addresses).
+        addresses (list): Διευθύνσεις (host, port) απομακρυσμένων shards. Αν δοθούν, δεν ξεκινούν τοπικές διεργασίες.
+        authkey (bytes): Το κλειδί πιστοποίησης των απομακρυσμένων shards.
+        batch_size (int): Πλήθος ερωτημάτων ανά γύρο.
+    """
+
+    def __init__(self, knn_model, n_shards=None, addresses=None, authkey=None, batch_size=BATCH_SIZE):
+        """
+        Parameters:
+            knn_model (KNN): Το εκπαιδευμένο μοντέλο (μετά τη fit()).
+            n_shards (int, optional): Ο αριθμός των τοπικών shards. Αν δεν δοθεί, ίσος με τον αριθμό των πυρήνων.
+            addresses (list, optional): Διευθύνσεις (host, port) απομακρυσμένων shards.
+            authkey (bytes, optional): Το κλειδί πιστοποίησης των απομακρυσμένων shards.
+            batch_size (int): Πλήθος ερωτημάτων ανά γύρο.
+
+        Raises:
+            ValueError: Αν το μοντέλο δεν έχει εκπαιδευτεί.
+        """
+        if knn_model.final_model is None:
+            raise ValueError("Το μοντέλο δεν έχει εκπαιδευτεί. Καλέστε πρώτα τη μέθοδο fit().")
+        if knn_model.index != "exact":
+            raise ValueError("Η διαμοιρασμένη πρόβλεψη υποστηρίζεται μόνο με ακριβές ευρετήριο γειτόνων.")
+        self.knn_model = knn_model
+        self.addresses = addresses
+        self.authkey = authkey
+        self.n_shards = len(addresses) if addresses else (n_shards or mp.cpu_count())
+        self.batch_size = batch_size
+        self._connections = []
+        self._processes = []
+        self._shm = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _index_params(self):
+        """
+        Οι παράμετροι του ευρετηρίου κάθε shard, ίδιες με του classifier του μοντέλου.
+        """
+        classifier = self.knn_model.final_model.named_steps["classifier"]
+        return {
+            "algorithm": classifier.algorithm,
+            "leaf_size": classifier.leaf_size,
+            "metric": classifier.metric,
+            "p": classifier.p,
+            "metric_params": classifier.metric_params,
+        }
+
+    def start(self):
+        """
+        Ξεκινά (ή συνδέεται σε) τα shards και τους αναθέτει τα τμήματα του συνόλου αναφοράς.
+        """
+        X_reference = np.ascontiguousarray(self.knn_model.X_reference, dtype=np.float64)
+        bounds = np.linspace(0, len(X_reference), self.n_shards + 1).astype(int)
+        params = self._index_params()
+
+        if self.addresses:
+            for address, start, stop in zip(self.addresses, bounds[:-1], bounds[1:]):
+                conn = Client(address, authkey=self.authkey)
+                conn.send(("load", X_reference[start:stop], int(start), params))
+                self._connections.append(conn)
+        else:
+            # Ένα αντίγραφο στην κοινόχρηστη μνήμη, από το οποίο διαβάζουν όλα τα τοπικά shards
+            self._shm = shared_memory.SharedMemory(create=True, size=max(X_reference.nbytes, 1))
+            np.ndarray(X_reference.shape, dtype=X_reference.dtype, buffer=self._shm.buf)[:] = X_reference
+            context = mp.get_context("spawn")
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                parent_conn, child_conn = context.Pipe()
+                process = context.Process(target=serve_shard, args=(child_conn,), daemon=True)
+                process.start()
+                child_conn.close()
+                parent_conn.send((
+                    "load_shared", self._shm.name, X_reference.shape, X_reference.dtype.str,
+                    int(start), int(stop), params,
+                ))
+                self._connections.append(parent_conn)
+                self._processes.append(process)
+
+        for conn in self._connections:
+            conn.recv()
+
+    def kneighbors(self, X_query, k):
+        """
+        Οι k συνολικά πλησιέστεροι γείτονες για προεπεξεργασμένα ερωτήματα.
+
+        Parameters:
+            X_query (np.ndarray): Τα προεπεξεργασμένα χαρακτηριστικά των ερωτημάτων.
+            k (int): Ο αριθμός των γειτόνων.
+
+        Returns:
+            tuple: (αποστάσεις, δείκτες) στο σύνολο αναφοράς, πίνακες (ερωτήματα x k).
+        """
+        for conn in self._connections:
+            conn.send(("query", X_query, k))
+        distances, indices = [], []
+        for conn in self._connections:
+            _, shard_distances, shard_indices = conn.recv()
+            distances.append(shard_distances)
+            indices.append(shard_indices)
+        return merge_top_k(distances, indices, k)
+
+    def predict(self, new_data):
+        """
+        Κάνει προβλέψεις για νέα δεδομένα, όπως η KNN.predict(), με ψηφοφορία στους συγχωνευμένους γείτονες.
+
+        Parameters:
+            new_data (pd.DataFrame): Τα νέα δεδομένα για τα οποία θα γίνουν προβλέψεις.
+
+        Returns:
+            pd.DataFrame: Τα νέα δεδομένα με τις προβλέψεις στη στήλη της ανταπόκρισης.
+        """
+        if not self._connections:
+            raise ValueError("Τα shards δεν έχουν ξεκινήσει. Καλέστε πρώτα τη μέθοδο start().")
+
+        knn_model = self.knn_model
+        X_query = np.asarray(knn_model.final_model[:-1].transform(new_data), dtype=np.float64)
+        classes, y_codes = np.unique(np.asarray(knn_model.y).astype(str), return_inverse=True)
+        k = min(knn_model.best_n_neighbors, len(y_codes))
+        weighted = knn_model.final_model.named_steps["classifier"].weights == "distance"
+
+        predictions = np.empty(len(X_query), dtype=np.int64)
+        for start in range(0, len(X_query), self.batch_size):
+            distances, indices = self.kneighbors(X_query[start:start + self.batch_size], k)
+            predictions[start:start + self.batch_size] = neighbor_votes(
+                y_codes[indices], k, len(classes), distances if weighted else None
+            )
+
+        result_df = new_data.copy()
+        result_df[knn_model.response_column] = classes[predictions]
+        return result_df
+
+    def close(self):
+        """
+        Τερματίζει τα shards και αποδεσμεύει την κοινόχρηστη μνήμη.
+        """
+        for conn in self._connections:
+            try:
+                conn.send(("close",))
+            except (OSError, EOFError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections, self._processes = [], []
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Εκκίνηση shard για παράλληλη πρόβλεψη K-NN.")
+    parser.add_argument("--address", required=True, help="Διεύθυνση host:port στην οποία θα ακούει το shard.")
+    parser.add_argument("--authkey", required=True, help="Κοινό κλειδί πιστοποίησης με τον συντονιστή.")
+    args = parser.parse_args()
+    host, port = args.address.rsplit(":", 1)
+    run_shard_server((host, int(port)), args.authkey.encode())
@@ -0,0 +1,268 @@
+"""
+Table View Module
+
+Εικονικός (virtualised) πίνακας προβλέψεων για το γραφικό περιβάλλον:
+    - Το Treeview έχει πάντα μόνο τις γραμμές που χωράνε στην οθόνη. Η
+      κύλιση αλλάζει τη θέση του 'παραθύρου' στα δεδομένα και οι γραμμές
+      ξαναγεμίζουν από το DataFrame.
+    - Η ταξινόμηση και το φιλτράρισμα γίνονται με διανυσματικές πράξεις
+      pandas/NumPy πάνω στα δεδομένα και διατηρούνται ως πίνακας θέσεων
+      γραμμών, χωρίς αντιγραφή του DataFrame.
+
+Usage:
+    from table_view import PredictionTable
+    table = PredictionTable(parent)
+    table.pack(fill=tk.BOTH, expand=True)
+    table.set_data(predictions_df)
+"""
+import re
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+INDEX_COLUMN = "Πελάτης"  # Η επικεφαλίδα της στήλης του index
+PAGE_SIZE = 30  # Πλήθος γραμμών που εμφανίζονται ταυτόχρονα στο Treeview
+FILTER_PATTERN = re.compile(r"^\s*(<=|>=|!=|==|<|>|=)?\s*(.*?)\s*$")
+
+
+def filter_positions(df, positions, column, expression):
+    """
+    Κρατά τις θέσεις των γραμμών που ικανοποιούν ένα φίλτρο σε μια στήλη.
+
+    Το φίλτρο μπορεί να ξεκινά με τελεστή σύγκρισης (<, <=, >, >=, =, ==, !=).
+    Σε αριθμητικές στήλες η σύγκριση γίνεται αριθμητικά. Χωρίς τελεστή, κρατούνται οι
+    γραμμές όπου η τιμή περιέχει το κείμενο (χωρίς διάκριση πεζών-κεφαλαίων).
+
+    Parameters:
+        df (pd.DataFrame): Τα δεδομένα του πίνακα.
+        positions (np.ndarray): Οι θέσεις των γραμμών προς φιλτράρισμα.
+        column (str): Η στήλη του φίλτρου (INDEX_COLUMN για το index).
+        expression (str): Το φίλτρο.
+
+    Returns:
+        np.ndarray: Οι θέσεις που ικανοποιούν το φίλτρο, στην ίδια σειρά.
+
+    Raises:
+        ValueError: Αν ο τελεστής σύγκρισης εφαρμόζεται σε αριθμητική στήλη με μη αριθμητική τιμή.
+    """
+    operator, value = FILTER_PATTERN.match(expression).groups()
+    if not value:
+        return positions
+    values = pd.Series(df.index if column == INDEX_COLUMN else df[column]).iloc[positions]
+
+    if operator and pd.api.types.is_numeric_dtype(values):
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"Η στήλη '{column}' είναι αριθμητική: η τιμή '{value}' δεν είναι αριθμός.")
+        mask = {
+            "<": values < number, "<=": values <= number, ">": values > number, ">=": values >= number,
+            "=": values == number, "==": values == number, "!=": values != number,
+        }[operator]
+    else:
+        text = values.astype(str).str.lower()
+        value = value.lower()
+        if operator in ("=", "=="):
+            mask = text == value
+        elif operator == "!=":
+            mask = text != value
+        elif operator:
+            mask = {"<": text < value, "<=": text <= value, ">": text > value, ">=": text >= value}[operator]
+        else:
+            mask = text.str.contains(value, regex=False)
+    return positions[mask.to_numpy(dtype=bool)]
+
+
+def sort_positions(df, positions, column, ascending=True):
+    """
+    Ταξινομεί τις θέσεις των γραμμών με βάση τις τιμές μιας στήλης (σταθερή ταξινόμηση, κενές τιμές στο τέλος).
+
+    Η στήλη INDEX_COLUMN ταξινομεί με την αρχική σειρά των γραμμών.
+
+    Parameters:
+        df (pd.DataFrame): Τα δεδομένα του πίνακα.
+        positions (np.ndarray): Οι θέσεις των γραμμών προς ταξινόμηση.
+        column (str): Η στήλη ταξινόμησης.
+        ascending (bool): Αύξουσα ή φθίνουσα σειρά.
+
+    Returns:
+        np.ndarray: Οι ταξινομημένες θέσεις.
+    """
+    if column == INDEX_COLUMN:
+        keys = positions.astype(np.int64)
+        missing = np.zeros(len(positions), dtype=bool)
+    else:
+        # Οι κωδικοί του factorize (sort=True) διατηρούν τη σειρά των τιμών, με -1 για τις κενές
+        codes, _ = pd.factorize(df[column].iloc[positions], sort=True)
+        keys = codes.astype(np.int64)
+        missing = codes < 0
+    if not ascending:
+        keys = -keys
+    keys = np.where(missing, np.iinfo(np.int64).max, keys)
+    return positions[np.argsort(keys, kind="stable")]
+
+
+class PredictionTable(ttk.Frame):
+    """
+    Πίνακας προβλέψεων που δημιουργεί γραμμές Treeview μόνο για τις ορατές γραμμές των δεδομένων.
+
+    Attributes:
+        df (pd.DataFrame | None): Τα δεδομένα του πίνακα.
+        view (np.ndarray): Οι θέσεις των γραμμών του df μετά το φιλτράρισμα και την ταξινόμηση.
+        offset (int): Η θέση στο view της πρώτης ορατής γραμμής.
+    """
+
+    def __init__(self, master, page_size=PAGE_SIZE):
+        super().__init__(master)
+        self.page_size = page_size
+        self.df = None
+        self.view = np.empty(0, dtype=np.int64)
+        self.offset = 0
+        self._sort_column = None
+        self._sort_ascending = True
+
+        # Γραμμή φίλτρου
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(filter_frame, text="Φίλτρο:").pack(side=tk.LEFT, padx=5)
+        self.filter_column_var = tk.StringVar()
+        self.cmb_filter_column = ttk.Combobox(
+            filter_frame, textvariable=self.filter_column_var, state='readonly', width=30
+            )
+        self.cmb_filter_column.pack(side=tk.LEFT, padx=5)
+        self.filter_var = tk.StringVar()
+        entry = ttk.Entry(filter_frame, textvariable=self.filter_var, width=25)
+        entry.pack(side=tk.LEFT, padx=5)
+        entry.bind("<Return>", lambda event: self.apply_filter())
+        ttk.Button(filter_frame, text="Εφαρμογή", command=self.apply_filter).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Καθαρισμός", command=self.clear_filter).pack(side=tk.LEFT, padx=5)
+        self.status_var = tk.StringVar()
+        ttk.Label(filter_frame, textvariable=self.status_var).pack(side=tk.RIGHT, padx=5)
+
+        # Treeview με σταθερό πλήθος γραμμών και δική του μπάρα κύλισης πάνω στο view
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.tree = ttk.Treeview(table_frame, show="headings", height=page_size, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_scroll)
+        x_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=x_scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_mousewheel)
+        self._render()
+
+    def set_data(self, df):
+        """
+        Ορίζει τα δεδομένα του πίνακα (None για άδειο πίνακα) και καθαρίζει φίλτρο και ταξινόμηση.
+        """
+        self.df = df
+        self._sort_column = None
+        self._sort_ascending = True
+        self.filter_var.set("")
+        columns = [] if df is None else [INDEX_COLUMN, *map(str, df.columns)]
+        self.tree.configure(columns=columns)
+        for column in columns:
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=120, minwidth=60, stretch=False)
+        self.cmb_filter_column.configure(values=columns)
+        self.filter_column_var.set(columns[-1] if columns else "")
+        self.view = np.arange(0 if df is None else len(df), dtype=np.int64)
+        self.offset = 0
+        self._render()
+
+    def apply_filter(self):
+        """
+        Εφαρμόζει το φίλτρο πάνω σε όλα τα δεδομένα και διατηρεί την τρέχουσα ταξινόμηση.
+        """
+        if self.df is None:
+            return
+        positions = np.arange(len(self.df), dtype=np.int64)
+        try:
+            positions = filter_positions(
+                self.df, positions, self.filter_column_var.get(), self.filter_var.get()
+                )
+        except ValueError as ve:
+            self.status_var.set(str(ve))
+            return
+        if self._sort_column is not None:
+            positions = sort_positions(self.df, positions, self._sort_column, self._sort_ascending)
+        self.view = positions
+        self.offset = 0
+        self._render()
+
+    def clear_filter(self):
+        """
+        Καταργεί το φίλτρο.
+        """
+        self.filter_var.set("")
+        self.apply_filter()
+
+    def sort_by(self, column):
+        """
+        Ταξινομεί το view με βάση μια στήλη. Δεύτερο κλικ στην ίδια στήλη αντιστρέφει τη σειρά.
+        """
+        if self.df is None:
+            return
+        self._sort_ascending = not self._sort_ascending if column == self._sort_column else True
+        self._sort_column = column
+        self.view = sort_positions(self.df, self.view, column, self._sort_ascending)
+        self.offset = 0
+        self._render()
+
+    def selected_position(self):
+        """
+        Η θέση στο df της επιλεγμένης γραμμής (None αν δεν έχει επιλεγεί γραμμή).
+        """
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def _scroll_to(self, offset):
+        max_offset = max(0, len(self.view) - self.page_size)
+        offset = min(max(0, int(offset)), max_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * len(self.view))
+        elif action == "scroll":
+            step = self.page_size if unit == "pages" else 1
+            self._scroll_to(self.offset + int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self.offset - 3)
+        else:
+            self._scroll_to(self.offset + 3)
+        return "break"
+
+    def _render(self):
+        """
+        Ξαναγεμίζει τις γραμμές του Treeview με τη σελίδα του view που ξεκινά στο offset.
+        """
+        self.tree.delete(*self.tree.get_children())
+        total = 0 if self.df is None else len(self.df)
+        if self.df is not None and len(self.view):
+            page = self.view[self.offset:self.offset + self.page_size]
+            rows = self.df.iloc[page]
+            for position, label, values in zip(page, rows.index, rows.itertuples(index=False, name=None)):
+                self.tree.insert(
+                    "", tk.END, iid=str(position), values=[label, *("" if pd.isna(v) else v for v in values)]
+                    )
+        shown = len(self.view)
+        if shown:
+            first = self.offset / shown
+            last = min(1.0, (self.offset + self.page_size) / shown)
+            self.scrollbar.set(first, last)
+            self.status_var.set(
+                f"Γραμμές {self.offset + 1}-{min(self.offset + self.page_size, shown)} από {shown} (σύνολο {total})"
+                )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status_var.set(f"Καμία γραμμή (σύνολο {total})")
@@ -0,0 +1,27 @@
+"""
+Κοινά fixtures των tests: τα αρχεία καμπανιών του φακέλου data/.
+
+Τα modules της εφαρμογής βρίσκονται στον φάκελο src/ (χωρίς πακέτο), οπότε
+προστίθεται στο sys.path πριν από τα imports των tests.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from data_loader import load_campaign_file  # noqa: E402
+
+DATA_DIR = ROOT / "data"
+
+
+@pytest.fixture(scope="session")
+def past_data():
+    return load_campaign_file(DATA_DIR / "Project40PastCampaignData.xlsx")
+
+
+@pytest.fixture(scope="session")
+def new_data():
+    return load_campaign_file(DATA_DIR / "Project40NewCampaignData.xlsx")
@@ -0,0 +1,47 @@
+import shutil
+
+import pytest
+
+from conftest import DATA_DIR
+from data_loader import CAMPAIGN_COLUMN, SchemaError, load_campaign_file, load_campaign_files, read_campaign_workbook
+
+PAST_FILE = DATA_DIR / "Project40PastCampaignData.xlsx"
+
+
+def _write_with_value(data, path, row, value):
+    frame = data.reset_index(drop=True).astype({"Σύνολο Αγορών": "float64"})
+    frame.loc[row, "Σύνολο Αγορών"] = value
+    frame.to_excel(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("row", [5, 700])  # Μέσα και έξω από το δείγμα της επικύρωσης
+def test_fractional_value_in_integer_column_is_rejected(past_data, tmp_path, row):
+    path = _write_with_value(past_data, tmp_path / "fractional.xlsx", row, 0.7)
+    with pytest.raises(SchemaError, match="Σύνολο Αγορών"):
+        load_campaign_file(path)
+
+
+def test_integral_float_values_are_read_as_integers(past_data, tmp_path):
+    path = _write_with_value(past_data, tmp_path / "integral.xlsx", 700, 12.0)
+    df = read_campaign_workbook(path)
+    assert df["Σύνολο Αγορών"].dtype == "int64"
+    assert df.loc[700, "Σύνολο Αγορών"] == 12
+
+
+def test_files_with_the_same_name_in_different_folders_are_rejected(tmp_path):
+    for folder in ("2023", "2024"):
+        (tmp_path / folder).mkdir()
+        shutil.copy(PAST_FILE, tmp_path / folder / "campaign.xlsx")
+    with pytest.raises(SchemaError, match="campaign"):
+        load_campaign_files([tmp_path / "2023", tmp_path / "2024"], max_workers=1, cache_dir=None)
+
+
+def test_cache_keeps_only_the_latest_file_set(tmp_path):
+    first, second = shutil.copy(PAST_FILE, tmp_path / "first.xlsx"), shutil.copy(PAST_FILE, tmp_path / "second.xlsx")
+    cache_dir = tmp_path / "cache"
+    load_campaign_files([first], max_workers=1, cache_dir=cache_dir)
+    df = load_campaign_files([first, second], max_workers=1, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("campaigns_*.pkl"))) == 1
+    assert list(df[CAMPAIGN_COLUMN].cat.categories) == ["first", "second"]
+    assert load_campaign_files([first, second], max_workers=1, cache_dir=cache_dir).equals(df)
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+import cli
+from distributed import DistributedSearch
+from model import KNN
+
+K_RANGE = range(2, 10)
+FOLD_RANGE = range(3, 5)
+CV_COLUMNS = ["cv", "neighbors", "cv_accuracy", "cv_precision", "std_accuracy", "std_precision"]
+
+
+class KillFirstWorker:
+    """
+    Executor που τερματίζει έναν τοπικό worker μόλις επιστρέψει το πρώτο αποτέλεσμα.
+    """
+
+    def __init__(self, search):
+        self.search = search
+
+    def cross_validate(self, *args):
+        for i, result in enumerate(self.search.cross_validate(*args)):
+            if i == 0:
+                process = self.search._processes[0]
+                process.kill()
+                process.join()
+            yield result
+
+
+def _search(past_data, executor=None):
+    knn = KNN(plots_dir=None)
+    knn.feed_data(past_data)
+    knn.find_best_neighbors(k_range=K_RANGE, fold_range=FOLD_RANGE, executor=executor)
+    return knn
+
+
+@pytest.fixture(scope="module")
+def local_search(past_data):
+    return _search(past_data)
+
+
+def test_distributed_search_matches_local_search(past_data, local_search):
+    with DistributedSearch(n_workers=2) as search:
+        knn = _search(past_data, executor=search)
+    assert search.lost_workers == 0
+    assert knn.best_n_neighbors == local_search.best_n_neighbors
+    pd.testing.assert_frame_equal(knn.cv_results_table[CV_COLUMNS], local_search.cv_results_table[CV_COLUMNS])
+
+
+def test_killed_worker_jobs_are_requeued(past_data, local_search):
+    with DistributedSearch(n_workers=2) as search:
+        knn = _search(past_data, executor=KillFirstWorker(search))
+    assert search.lost_workers == 1
+    assert search.requeued_jobs == 1
+    assert knn.best_n_neighbors == local_search.best_n_neighbors
+    pd.testing.assert_frame_equal(knn.cv_results_table[CV_COLUMNS], local_search.cv_results_table[CV_COLUMNS])
+
+
+def test_no_worker_raises(past_data):
+    with DistributedSearch(n_workers=0, worker_timeout=0.5) as search:
+        with pytest.raises(ValueError):
+            _search(past_data, executor=search)
+
+
+def test_cli_rejects_time_budget_with_distributed_search():
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["--past", "past.xlsx", "--new", "new.xlsx", "--output", "out.csv",
+                  "--time-budget", "5", "--search-workers", "2"])
+    assert exit_info.value.code == 2
+
+
+def test_cli_rejects_search_address_without_authkey():
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["--past", "past.xlsx", "--new", "new.xlsx", "--output", "out.csv",
+                  "--search-address", "0.0.0.0:6100"])
+    assert exit_info.value.code == 2
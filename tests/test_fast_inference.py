@@ -0,0 +1,15 @@
+from fast_inference import CompiledKNN
+from model import KNN
+
+
+def test_compiled_model_matches_pipeline(past_data, new_data, tmp_path):
+    knn = KNN(neighbors=7, plots_dir=None)
+    knn.feed_data(past_data)
+    knn.fit()
+    knn.export_inference(tmp_path / "model.npz")
+    compiled = CompiledKNN.load(tmp_path / "model.npz")
+
+    X_new = new_data[knn.X.columns]
+    expected = knn.final_model.predict(X_new)
+    assert [compiled.predict_one(record) for record in X_new.to_dict("records")] == list(expected)
+    assert compiled.predict(X_new.itertuples(index=False)) == list(expected)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model import KNN
+
+NUMERIC_FEATURES = ["Logins τις τελευταίες 4 εβδομάδες", "Σύνολο Αγορών"]
+CATEGORICAL_FEATURES = ["Email", "Χρήση Κινητού"]
+
+
+@pytest.mark.parametrize("features", [NUMERIC_FEATURES, CATEGORICAL_FEATURES])
+def test_single_type_feature_subset(past_data, features, tmp_path):
+    knn = KNN(neighbors=7, plots_dir=None)
+    knn.feed_data(past_data)
+    knn.selected_features = features
+    knn.preprocessor = knn._make_preprocessor(features)
+    knn.fit()
+
+    assert [name for name, _, _ in knn.preprocessor.transformers if name != "remainder"] == (
+        ["num"] if features is NUMERIC_FEATURES else ["cat"]
+    )
+    assert knn.observation_drift(past_data[knn.X.columns]) < knn.drift_threshold
+    knn.export_inference(tmp_path / "model.npz")
+    assert knn.add_observations(past_data.iloc[:50]) is False
+
+
+def test_added_observations_get_unique_labels(past_data, new_data):
+    knn = KNN(neighbors=7, plots_dir=None)
+    knn.feed_data(past_data)
+    knn.fit()
+    outcomes = past_data.iloc[:50]  # Ετικέτες 'Πελάτης 1'-'Πελάτης 50', όπως κάθε αρχείο καμπάνιας
+    knn.add_observations(outcomes)
+    knn.add_observations(outcomes)
+
+    assert knn.X.index.is_unique
+    assert knn.X_train.index.is_unique
+    assert list(knn.X.index[-50:]) == [f"Πελάτης {i}" for i in range(1051, 1101)]
+    assert (knn.y.index == knn.X.index).all()
+    nearest = knn.cache_neighbors(new_data, 10).nearest(0)
+    assert nearest.index.isin(knn.X.index).all()
+
+
+def test_model_fingerprint_follows_reference_set(past_data, new_data):
+    def trained():
+        knn = KNN(neighbors=7, plots_dir=None)
+        knn.feed_data(past_data)
+        knn.fit()
+        return knn
+
+    knn = trained()
+    fingerprint = knn.model_fingerprint()
+    assert trained().model_fingerprint() == fingerprint
+    cache = knn.cache_neighbors(new_data, 10)
+    assert (cache.reference_labels == knn.y.to_numpy()).all()
+    knn.add_observations(past_data.iloc[:20])
+    assert knn.model_fingerprint() != fingerprint
+
+
+def test_high_cardinality_categorical_column(past_data, new_data):
+    # Με 40 τιμές το one-hot encoding ξεπερνά το όριο αραιού πίνακα του ColumnTransformer
+    rng = np.random.default_rng(0)
+    past, new = past_data.copy(), new_data.copy()
+    for df in (past, new):
+        df["Περιοχή"] = pd.Categorical([f"Περιοχή {i}" for i in rng.integers(0, 40, len(df))])
+    knn = KNN(neighbors=7, plots_dir=None)
+    knn.feed_data(past)
+    knn.fit()
+
+    assert isinstance(knn.X_reference, np.ndarray) and len(knn.X_reference) == len(past)
+    assert knn.predict(new)[knn.response_column].notna().all()
+    assert len(knn.predict_proba(new)) == len(new)
+    knn.add_observations(past.iloc[:20])
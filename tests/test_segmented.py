@@ -0,0 +1,30 @@
+from resources import ResourceConfig
+from segmented import GLOBAL_SEGMENT, SegmentedKNN
+
+
+def test_unseen_segment_category_routes_to_global_model(past_data, new_data, tmp_path):
+    # Το τμήμα 'rural' εκπαιδεύεται χωρίς πελάτες 'premium'
+    train = past_data[~((past_data["Περιοχή"] == "rural") & (past_data["Email"] == "premium"))]
+    model = SegmentedKNN("Περιοχή", max_workers=1, artifact_dir=tmp_path)
+    model.fit(train, k_range=range(3, 6), fold_range=range(3, 4))
+
+    rural = new_data[new_data["Περιοχή"] == "rural"]
+    routes = {key: rows for key, rows in model._route(rural)}
+    premium = (rural["Email"] == "premium").to_numpy()
+    assert premium.any()
+    assert set(routes["rural"]).isdisjoint(premium.nonzero()[0])
+    assert set(premium.nonzero()[0]) <= set(routes[GLOBAL_SEGMENT])
+
+    result = model.predict(rural)
+    assert result["Ανταπόκριση"].notna().all()
+    assert len(model.predict_proba(rural)) == len(rural)
+
+
+def test_segment_models_use_the_configured_resources(past_data, tmp_path):
+    resources = ResourceConfig(n_jobs=1, threads=2, working_memory=64)
+    model = SegmentedKNN("Φύλο", artifact_dir=tmp_path, resources=resources)
+    model.fit(past_data, k_range=range(3, 5), fold_range=range(3, 4))
+
+    for summary in model.segments:
+        segment_resources = model.cache.get(summary["segment"]).resources
+        assert (segment_resources.n_jobs, segment_resources.threads, segment_resources.working_memory) == (1, 2, 64)
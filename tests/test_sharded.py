@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from model import KNN
+from sharded import ShardedPredictor, merge_top_k
+
+NUMERIC_FEATURES = ["Logins τις τελευταίες 4 εβδομάδες", "Σύνολο Αγορών"]
+
+
+def test_merge_top_k_breaks_ties_by_reference_index():
+    distances = [np.array([[1.0, 2.0]]), np.array([[1.0, 2.0]])]
+    indices = [np.array([[7, 8]]), np.array([[3, 4]])]
+    merged_distances, merged_indices = merge_top_k(distances, indices, 3)
+    assert merged_indices.tolist() == [[3, 7, 4]]
+    assert merged_distances.tolist() == [[1.0, 1.0, 2.0]]
+
+
+# Με δύο ακέραια χαρακτηριστικά πολλοί γείτονες ισαπέχουν, οπότε ελέγχεται ο κανόνας των ισοπαλιών
+@pytest.mark.parametrize("neighbors, features", [(5, None), (7, NUMERIC_FEATURES)])
+def test_sharded_labels_match_unsharded_model(past_data, new_data, neighbors, features):
+    knn = KNN(neighbors=neighbors, plots_dir=None)
+    knn.feed_data(past_data)
+    if features:
+        knn.selected_features = features
+        knn.preprocessor = knn._make_preprocessor(features)
+    knn.fit()
+    expected = knn.predict(new_data)[knn.response_column].to_numpy()
+
+    for n_shards in (1, 3):
+        with ShardedPredictor(knn, n_shards=n_shards) as predictor:
+            labels = predictor.predict(new_data)[knn.response_column].to_numpy()
+        assert (labels == expected).all(), f"{n_shards} shards"